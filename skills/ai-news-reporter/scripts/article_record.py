@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+AI News Article Record
+Compact, read-only article records with interned repeated strings, for
+holding large batches in memory
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from news_io import iter_articles
+
+# Field order of the JSON schema, raw (source..description) and processed
+# (source, title, link, pubDate, summary, keywords, timestamp, duplicates);
+# archived raw articles also carry published, their pubDate as epoch seconds
+FIELDS = ('source', 'title', 'link', 'pubDate', 'published', 'description',
+          'summary', 'keywords', 'timestamp', 'duplicates')
+
+# Fields whose values repeat across articles and are interned (summaries are
+# composed from rule phrases, so few of them are distinct)
+INTERNED_FIELDS = ('source', 'pubDate', 'summary', 'timestamp')
+
+# Identical keyword lists share one tuple
+_keyword_sets: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+def intern_keywords(keywords: Iterable[str]) -> Tuple[str, ...]:
+    """Return a shared tuple of interned keywords"""
+    key = tuple(sys.intern(keyword) for keyword in keywords)
+    return _keyword_sets.setdefault(key, key)
+
+class Article(Mapping):
+    """
+    One article in a fixed set of slots
+
+    Behaves like a read-only dict of the article's JSON fields, so stages
+    that read articles with [] or get() accept it unchanged. Source names,
+    dates, summaries, timestamps and keywords are interned and keyword
+    lists are stored as shared tuples; absent fields take no space beyond
+    their slot. Fields outside the schema are kept in a small side dict.
+    """
+
+    __slots__ = FIELDS + ('_extra',)
+
+    def __init__(self, **fields):
+        for name in FIELDS:
+            value = fields.pop(name, None)
+            if value is not None:
+                if name in INTERNED_FIELDS and isinstance(value, str):
+                    value = sys.intern(value)
+                elif name == 'keywords':
+                    value = intern_keywords(value)
+                elif name == 'duplicates':
+                    value = tuple(value)
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, '_extra', fields or None)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Article':
+        """Build a record from an article dict in the JSON schema"""
+        return cls(**data)
+
+    def to_dict(self) -> Dict:
+        """Return the article as a plain dict in the JSON schema"""
+        data = {}
+        for name in FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = list(value) if isinstance(value, tuple) else value
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __getitem__(self, name: str):
+        value = getattr(self, name, None) if name in FIELDS else None
+        if value is None:
+            if self._extra and name in self._extra:
+                return self._extra[name]
+            raise KeyError(name)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for name in FIELDS:
+            if getattr(self, name) is not None:
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Article records are read-only")
+
+    def __reduce__(self):
+        # Pickle as keyword fields so worker results stay compact in transit
+        return (_rebuild, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"Article({self.to_dict()!r})"
+
+def _rebuild(data: Dict) -> Article:
+    return Article(**data)
+
+def compact(articles: Iterable[Dict]) -> Iterator[Article]:
+    """Convert article dicts (or records) to compact records"""
+    for article in articles:
+        yield article if isinstance(article, Article) else Article(**article)
+
+def iter_records(path: str) -> Iterator[Article]:
+    """Stream compact records from a JSON array or NDJSON file"""
+    return compact(iter_articles(path))
+
+def load_records(path: str) -> List[Article]:
+    """Load every article of a file as compact records"""
+    return list(iter_records(path))
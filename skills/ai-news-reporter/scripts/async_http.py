@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+AI News Async HTTP Client
+Minimal asyncio HTTP/1.1 client with per-host keep-alive pooling and
+per-host concurrency limits (standard library only)
+"""
+
+import asyncio
+import ssl
+import zlib
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+USER_AGENT = "Mozilla/5.0 (compatible; AI-News-Reporter/1.0)"
+MAX_REDIRECTS = 5
+READ_SIZE = 64 * 1024
+
+HostKey = Tuple[str, str, int]
+
+class HTTPError(Exception):
+    """Raised when a response cannot be read or redirects loop"""
+
+def _host_key(url: str) -> Tuple[HostKey, str]:
+    """Split a URL into its (scheme, host, port) key and request target"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https'):
+        raise HTTPError(f"Unsupported URL scheme: {url}")
+    port = parts.port or (443 if scheme == 'https' else 80)
+    target = parts.path or '/'
+    if parts.query:
+        target += '?' + parts.query
+    return (scheme, parts.hostname or '', port), target
+
+class Response:
+    """An HTTP response whose body is read lazily from a pooled connection"""
+
+    def __init__(self, pool: 'ConnectionPool', key: HostKey, url: str, status: int,
+                 headers: Dict[str, str], reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self._pool = pool
+        self._key = key
+        self._reader = reader
+        self._writer = writer
+        self._done = False
+
+    def _raw_chunks(self) -> AsyncIterator[bytes]:
+        if self.headers.get('transfer-encoding', '').lower() == 'chunked':
+            return self._read_chunked()
+        if 'content-length' in self.headers:
+            length = self.headers['content-length']
+            if not length.isdigit():
+                raise HTTPError(f"Malformed Content-Length: {length!r}")
+            return self._read_length(int(length))
+        return self._read_to_eof()
+
+    async def _read_chunked(self) -> AsyncIterator[bytes]:
+        while True:
+            size_line = await self._reader.readline()
+            if not size_line:
+                raise HTTPError("Connection closed inside chunked body")
+            try:
+                size = int(size_line.split(b';', 1)[0].strip() or b'0', 16)
+            except ValueError:
+                raise HTTPError(f"Malformed chunk size: {size_line!r}") from None
+            if size == 0:
+                # Trailer headers end with a blank line
+                while (await self._reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return
+            try:
+                chunk = await self._reader.readexactly(size)
+            except asyncio.IncompleteReadError:
+                raise HTTPError("Connection closed inside chunked body") from None
+            yield chunk
+            await self._reader.readline()
+
+    async def _read_length(self, remaining: int) -> AsyncIterator[bytes]:
+        while remaining > 0:
+            data = await self._reader.read(min(READ_SIZE, remaining))
+            if not data:
+                raise HTTPError("Connection closed before end of body")
+            remaining -= len(data)
+            yield data
+
+    async def _read_to_eof(self) -> AsyncIterator[bytes]:
+        self.headers['connection'] = 'close'
+        while True:
+            data = await self._reader.read(READ_SIZE)
+            if not data:
+                return
+            yield data
+
+    async def iter_body(self) -> AsyncIterator[bytes]:
+        """Yield the (decompressed) body in chunks as it arrives"""
+        encoding = self.headers.get('content-encoding', '').lower()
+        decoder = None
+        if encoding in ('gzip', 'x-gzip'):
+            decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == 'deflate':
+            decoder = zlib.decompressobj()
+        try:
+            async for chunk in self._raw_chunks():
+                if decoder is not None:
+                    chunk = decoder.decompress(chunk)
+                if chunk:
+                    yield chunk
+            if decoder is not None:
+                tail = decoder.flush()
+                if tail:
+                    yield tail
+            self._done = True
+        finally:
+            self.release()
+
+    async def read(self) -> bytes:
+        """Read the whole body"""
+        return b''.join([chunk async for chunk in self.iter_body()])
+
+    def release(self):
+        """Return the connection to the pool, or close it if the body was not consumed"""
+        if self._writer is None:
+            return
+        reusable = self._done and self.headers.get('connection', '').lower() != 'close'
+        self._pool._release(self._key, self._reader, self._writer, reusable)
+        self._writer = None
+
+class ConnectionPool:
+    """
+    Keep-alive connections grouped by (scheme, host, port)
+
+    At most per_host requests run against the same host at once; idle
+    connections are reused by the next request to that host.
+    """
+
+    def __init__(self, per_host: int = 2, user_agent: str = USER_AGENT):
+        self.per_host = per_host
+        self.user_agent = user_agent
+        self._idle: Dict[HostKey, List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._limits: Dict[HostKey, asyncio.Semaphore] = {}
+        self._ssl = ssl.create_default_context()
+        self.connections_opened = 0
+
+    def _limit(self, key: HostKey) -> asyncio.Semaphore:
+        if key not in self._limits:
+            self._limits[key] = asyncio.Semaphore(self.per_host)
+        return self._limits[key]
+
+    async def _connect(self, key: HostKey):
+        scheme, host, port = key
+        self.connections_opened += 1
+        return await asyncio.open_connection(
+            host, port, ssl=self._ssl if scheme == 'https' else None)
+
+    def _release(self, key: HostKey, reader, writer, reusable: bool):
+        if reusable and not writer.is_closing():
+            self._idle.setdefault(key, []).append((reader, writer))
+        else:
+            writer.close()
+        self._limit(key).release()
+
+    async def _send(self, key: HostKey, target: str, method: str,
+                    headers: Dict[str, str], body: Optional[bytes]):
+        """Send one request, retrying once on a fresh connection if a pooled one went stale"""
+        scheme, host, port = key
+        if port != (443 if scheme == 'https' else 80):
+            host = f"{host}:{port}"
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host}",
+                 f"User-Agent: {self.user_agent}", "Accept-Encoding: gzip, deflate",
+                 "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        payload = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b'')
+
+        idle = self._idle.get(key)
+        if idle:
+            reader, writer = idle.pop()
+            try:
+                return reader, writer, await self._exchange(reader, writer, payload)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Stale keep-alive connection; fall through to a fresh one
+                writer.close()
+            except BaseException:
+                writer.close()
+                raise
+
+        reader, writer = await self._connect(key)
+        try:
+            return reader, writer, await self._exchange(reader, writer, payload)
+        except BaseException:
+            writer.close()
+            raise
+
+    @staticmethod
+    async def _exchange(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                        payload: bytes) -> bytes:
+        writer.write(payload)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed before response")
+        return status_line
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      body: Optional[bytes] = None, follow_redirects: bool = True) -> Response:
+        """
+        Send a request and return the response with its body unread
+
+        The caller must consume the body (read/iter_body) or call release().
+
+        Args:
+            method: HTTP method
+            url: Absolute http(s) URL
+            headers: Extra request headers
+            body: Optional request body
+            follow_redirects: Follow 3xx Location headers (like curl -L)
+
+        Returns:
+            Response object
+        """
+        headers = headers or {}
+        for _ in range(MAX_REDIRECTS + 1):
+            key, target = _host_key(url)
+            await self._limit(key).acquire()
+            writer = None
+            try:
+                reader, writer, status_line = await self._send(key, target, method, headers, body)
+                parts = status_line.decode('latin-1').split(None, 2)
+                if len(parts) < 2 or not parts[1].isdigit():
+                    raise HTTPError(f"Malformed status line: {status_line!r}")
+                status = int(parts[1])
+                response_headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    response_headers[name.strip().lower()] = value.strip()
+            except BaseException:
+                if writer is not None:
+                    writer.close()
+                self._limit(key).release()
+                raise
+
+            response = Response(self, key, url, status, response_headers, reader, writer)
+            if status in (204, 304) or method == 'HEAD':
+                response._done = True
+                response.release()
+                return response
+            if follow_redirects and status in (301, 302, 303, 307, 308) \
+                    and 'location' in response_headers:
+                await response.read()
+                url = urljoin(url, response_headers['location'])
+                if status == 303:
+                    method, body = 'GET', None
+                continue
+            return response
+        raise HTTPError(f"Too many redirects: {url}")
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        """Send a GET request"""
+        return await self.request('GET', url, headers)
+
+    def close(self):
+        """Close every idle connection"""
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+AI News Batch Tagger
+Tags a whole batch of articles at once from a sparse term-document matrix:
+topic, subject, action and keywords are assigned column by column instead
+of article by article
+"""
+
+import argparse
+import re
+import sys
+import threading
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from term_matcher import Lexicon, get_lexicon
+
+# A term made only of ASCII letters and digits can only occur inside one
+# maximal run of them, so it is found by looking at the distinct words of a
+# batch rather than at every character. Words are split from the UTF-8
+# bytes after blanking every other byte
+_WORD_TERM_RE = re.compile(r'[a-z0-9]+\Z')
+_WORD_BYTES = bytes(ch if chr(ch).isascii() and chr(ch).isalnum() else 0x20
+                    for ch in range(256))
+
+# Words remembered with the terms they contain; cleared when exceeded
+VOCABULARY_LIMIT = 200000
+
+# Subjects named in a summary, in priority order (the rest fall back to the
+# title's first word)
+SUMMARY_SUBJECTS = ('OpenAI', 'Anthropic', '谷歌', '微软')
+
+# Rule tables assigned to the BatchTags field of the same name
+RULE_FIELDS = ('topic', 'subject', 'action', 'domain', 'significance')
+
+class TermDocumentMatrix:
+    """
+    Sparse term-document matrix of one batch, stored by column
+
+    Column t lists, in ascending order, the documents whose lowercased text
+    contains term t as a substring, the same test TermMatcher.scan applies.
+    """
+
+    def __init__(self, n_docs: int, columns: Dict[str, List[int]]):
+        self.n_docs = n_docs
+        self.columns = columns
+
+    def column(self, term: str) -> List[int]:
+        """Documents containing term (lowercase)"""
+        return self.columns.get(term, [])
+
+    def docs_with_any(self, terms: Iterable[str]) -> List[int]:
+        """Documents containing at least one of the terms, ascending"""
+        docs = set()
+        for term in terms:
+            docs.update(self.columns.get(term, ()))
+        return sorted(docs)
+
+    def document_frequencies(self) -> Dict[str, int]:
+        """Number of documents containing each term that occurs in the batch"""
+        return {term: len(docs) for term, docs in self.columns.items()}
+
+class BatchTags:
+    """Per-document tags of one batch, one list per field"""
+
+    def __init__(self, n_docs: int):
+        self.topic: List[Optional[str]] = [None] * n_docs
+        self.subject: List[Optional[str]] = [None] * n_docs
+        self.action: List[Optional[str]] = [None] * n_docs
+        self.domain: List[Optional[str]] = [None] * n_docs
+        self.significance: List[Optional[str]] = [None] * n_docs
+        self.keywords: List[List[str]] = [[] for _ in range(n_docs)]
+
+    def keyword_frequencies(self) -> Counter:
+        """Report-level keyword counts: number of documents tagged with each keyword"""
+        return Counter(chain.from_iterable(self.keywords))
+
+class BatchTagger:
+    """
+    Builds term-document matrices and assigns tags from the term tables
+
+    The results are identical to extract_keywords() and the rule lookups of
+    generate_chinese_summary() applied to each document separately. Each
+    term knows the rules and keywords it triggers, so tagging a batch only
+    visits the terms found in it, whatever the size of the lexicon.
+    """
+
+    def __init__(self, lexicon: Optional[Lexicon] = None):
+        self.lexicon = lexicon = lexicon or get_lexicon()
+        terms = {term.lower() for _, term in lexicon.entries()}
+        self.terms = terms
+        self.word_terms = sorted(t for t in terms if _WORD_TERM_RE.match(t))
+        # Phrases span spaces, punctuation or non-ASCII text. Each is only
+        # checked in documents containing its longest ASCII word (its
+        # anchor), which is matched like any other word term. Terms without
+        # one, such as '大模型' or '++', are checked in every document
+        self.phrase_terms: Dict[str, str] = {}
+        self.fallback_terms: List[str] = []
+        for phrase in sorted(terms - set(self.word_terms)):
+            words = phrase.encode('utf-8').translate(_WORD_BYTES).split()
+            if words:
+                self.phrase_terms[phrase] = max(words, key=len).decode('ascii')
+            else:
+                self.fallback_terms.append(phrase)
+        searched = set(self.word_terms) | set(self.phrase_terms.values())
+        self._encoded_terms = {term.encode('utf-8'): term for term in searched}
+        self._term_lengths = sorted({len(term) for term in searched})
+        # Every word seen so far, and the searched terms of those containing any
+        self._vocabulary: Set[bytes] = set()
+        self._term_words: Dict[bytes, Tuple[str, ...]] = {}
+        # The shared tagger serves concurrent requests in the summary stub
+        # server; learning and the lookups that follow must not interleave
+        self._lock = threading.Lock()
+
+        # term -> (field, rank, label) of every rule it triggers
+        self._rule_actions: Dict[str, List[Tuple[str, int, str]]] = {}
+        for field in RULE_FIELDS:
+            for rank, (label, rule_terms) in enumerate(lexicon.rules[field]):
+                if field == 'subject' and label not in SUMMARY_SUBJECTS:
+                    continue
+                for term in set(map(str.lower, rule_terms)):
+                    self._rule_actions.setdefault(term, []).append((field, rank, label))
+        # term -> (rank, keyword, skip if already present) of every keyword it
+        # adds: patterns, then companies, then tag rule labels
+        self._keyword_actions: Dict[str, List[Tuple[int, str, bool]]] = {}
+        ordered = [(pattern.lower(), pattern if pattern in lexicon.company_set
+                    else pattern.lower(), True) for pattern in lexicon.keywords]
+        ordered += [(company.lower(), company, True) for company in lexicon.companies]
+        for rank, (term, keyword, unique) in enumerate(ordered):
+            self._keyword_actions.setdefault(term, []).append((rank, keyword, unique))
+        for rank, (label, rule_terms) in enumerate(lexicon.rules['tag'], len(ordered)):
+            for term in set(map(str.lower, rule_terms)):
+                self._keyword_actions.setdefault(term, []).append((rank, label, False))
+
+    def _learn(self, words: Set[bytes]):
+        """Record which terms occur in the words of a batch not seen before"""
+        new_words = words - self._vocabulary
+        if len(self._vocabulary) + len(new_words) > VOCABULARY_LIMIT:
+            # Start over with the whole batch, so none of its words is forgotten
+            self._vocabulary.clear()
+            self._term_words.clear()
+            new_words = words
+        encoded_terms = self._encoded_terms
+        lengths = self._term_lengths
+        for word in new_words:
+            # Look up the word's substrings of every term length, so the cost
+            # depends on the word rather than on the number of terms
+            size = len(word)
+            found = {word[start:start + length]
+                     for length in lengths if length <= size
+                     for start in range(size - length + 1)}
+            terms = tuple(sorted(encoded_terms[part] for part in found
+                                 if part in encoded_terms))
+            if terms:
+                self._term_words[word] = terms
+        self._vocabulary |= new_words
+
+    def matrix(self, texts: List[str]) -> TermDocumentMatrix:
+        """
+        Build the term-document matrix of a batch of texts
+
+        Args:
+            texts: Document texts (lowercased internally)
+
+        Returns:
+            Matrix with one column per term found in the batch
+        """
+        lowered = [text.lower() for text in texts]
+        doc_words = [text.encode('utf-8').translate(_WORD_BYTES).split() for text in lowered]
+        found: Dict[str, List[int]] = {}
+        with self._lock:
+            self._learn(set(chain.from_iterable(doc_words)))
+            term_words = self._term_words.keys()
+            lookup = self._term_words.__getitem__
+            for doc, words in enumerate(doc_words):
+                hits = term_words & words
+                if hits:
+                    for term in set(chain.from_iterable(map(lookup, hits))):
+                        found.setdefault(term, []).append(doc)
+
+        columns = {term: docs for term, docs in found.items() if term in self.terms}
+        for phrase, anchor in self.phrase_terms.items():
+            docs = [doc for doc in found.get(anchor, ()) if phrase in lowered[doc]]
+            if docs:
+                columns[phrase] = docs
+        for term in self.fallback_terms:
+            docs = [doc for doc, text in enumerate(lowered) if term in text]
+            if docs:
+                columns[term] = docs
+        return TermDocumentMatrix(len(texts), columns)
+
+    def tag(self, texts: List[str], max_keywords: int = 5) -> Tuple[BatchTags, TermDocumentMatrix]:
+        """
+        Tag a batch of texts
+
+        Args:
+            texts: Document texts, e.g. "title description"
+            max_keywords: Keywords kept per document
+
+        Returns:
+            (tags, matrix) tuple; rule fields are None where no rule matched
+        """
+        matrix = self.matrix(texts)
+        n_docs = len(texts)
+        tags = BatchTags(n_docs)
+
+        # Per field, the (rank, label) of the first rule each document matched
+        best: Dict[str, List[Optional[Tuple[int, str]]]] = {
+            field: [None] * n_docs for field in RULE_FIELDS}
+        # Per document, the keywords its terms add, by rank
+        added: List[Optional[Dict[int, Tuple[str, bool]]]] = [None] * n_docs
+        for term, docs in matrix.columns.items():
+            for field, rank, label in self._rule_actions.get(term, ()):
+                column = best[field]
+                for doc in docs:
+                    current = column[doc]
+                    if current is None or rank < current[0]:
+                        column[doc] = (rank, label)
+            for rank, keyword, unique in self._keyword_actions.get(term, ()):
+                for doc in docs:
+                    if added[doc] is None:
+                        added[doc] = {}
+                    added[doc][rank] = (keyword, unique)
+
+        for field, column in best.items():
+            setattr(tags, field, [found[1] if found else None for found in column])
+        for doc, by_rank in enumerate(added):
+            if by_rank is None:
+                continue
+            found: List[str] = []
+            for rank in sorted(by_rank):
+                keyword, unique = by_rank[rank]
+                if not unique or keyword not in found:
+                    found.append(keyword)
+            tags.keywords[doc] = found[:max_keywords]
+        return tags, matrix
+
+_tagger: Optional[BatchTagger] = None
+
+def get_tagger() -> BatchTagger:
+    """Return the process-wide batch tagger, rebuilt whenever the lexicon is reloaded"""
+    global _tagger
+    lexicon = get_lexicon()
+    if _tagger is None or _tagger.lexicon is not lexicon:
+        _tagger = BatchTagger(lexicon)
+    return _tagger
+
+def main():
+    from article_record import iter_records
+    from process_news import article_description
+
+    parser = argparse.ArgumentParser(
+        description="Report keyword frequencies of a raw news file in one batch pass")
+    parser.add_argument('input_file', help="Raw news JSON or NDJSON file")
+    parser.add_argument('--top', type=int, default=20,
+                        help="Number of keywords to list (default: 20)")
+    args = parser.parse_args()
+
+    try:
+        texts = [f"{article['title']} {article_description(article)}"
+                 for article in iter_records(args.input_file)]
+    except FileNotFoundError:
+        print(f"Error: Raw data file not found: {args.input_file}")
+        sys.exit(1)
+
+    tags, _ = get_tagger().tag(texts)
+    print(f"Tagged {len(texts)} articles")
+    for keyword, count in tags.keyword_frequencies().most_common(args.top):
+        print(f"{count:>8}  {keyword}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+AI News Benchmark
+Times each pipeline stage over synthetic corpora of increasing size and
+reports throughput and peak RSS as JSON
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from dedup import deduplicate
+from feed_parser import parse_feed
+from filter_news import filter_news
+from generate_html import render_report
+from process_news import (
+    article_description, extract_keywords, generate_chinese_summary, process_stream,
+    summarize_batch
+)
+from summary_backend import HTTPBackend
+from summary_stub_server import serve_summaries
+from synthetic_corpus import (
+    SKILL_DIR, Seeds, iter_synthetic_articles, load_seeds, render_feeds
+)
+
+DEFAULT_SIZES = [100, 1000, 10000]
+STAGES = ['generate', 'parse', 'filter', 'dedup', 'summarize', 'keywords', 'tag', 'process',
+          'backend', 'render']
+
+# A stage this much slower than the baseline is reported as a regression
+REGRESSION_THRESHOLD = 0.10
+
+def _proc_status_mb(field: str) -> Optional[float]:
+    """Read a memory field (VmRSS, VmHWM) of this process from /proc, in MiB"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            match = re.search(rf'^{field}:\s+(\d+) kB', f.read(), re.M)
+    except OSError:
+        return None
+    return int(match.group(1)) / 1024 if match else None
+
+def reset_peak_rss():
+    """Reset the kernel's peak RSS counter for this process (Linux only)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+def current_rss_mb() -> float:
+    return _proc_status_mb('VmRSS') or peak_rss_mb()
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    peak = _proc_status_mb('VmHWM')
+    if peak is not None:
+        return peak
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+def sample_processed_fields() -> List[Dict]:
+    """Summaries and keywords from the sample data, used to build render input"""
+    with open(os.path.join(SKILL_DIR, 'examples', 'sample_news_data.json'),
+              'r', encoding='utf-8') as f:
+        return [{'summary': article['summary'], 'keywords': article['keywords']}
+                for article in json.load(f)]
+
+class Corpus:
+    """Stage inputs for one corpus size, built lazily and shared with stage processes"""
+
+    # Seed pools, loaded once per benchmark run
+    seeds: Optional[Seeds] = None
+
+    def __init__(self, size: int, seed: int):
+        self.size = size
+        self.seed = seed
+        self.now = datetime.now().astimezone()
+        self._articles: Optional[List[Dict]] = None
+        self._feeds: Optional[Dict[str, bytes]] = None
+
+    def generate(self) -> List[Dict]:
+        return list(iter_synthetic_articles(self.size, self.seed, self.seeds, now=self.now))
+
+    @property
+    def articles(self) -> List[Dict]:
+        if self._articles is None:
+            self._articles = self.generate()
+        return self._articles
+
+    @property
+    def feeds(self) -> Dict[str, bytes]:
+        if self._feeds is None:
+            self._feeds = render_feeds(self.articles)
+        return self._feeds
+
+    def processed(self) -> List[Dict]:
+        """
+        Render-stage input: the corpus with summaries and keywords attached
+
+        Summaries and keywords are taken round-robin from the sample data
+        rather than computed, so the render stage does not pay for (or
+        depend on) the process stage.
+        """
+        fields = sample_processed_fields()
+        return [dict(article, **fields[i % len(fields)])
+                for i, article in enumerate(self.articles)]
+
+def _process_with_stub(articles: List[Dict]) -> int:
+    """Process articles through the summary backend against an in-process stub server"""
+    server = serve_summaries()
+    backend = HTTPBackend(f"http://127.0.0.1:{server.server_address[1]}/summarize")
+    try:
+        return sum(1 for _ in process_stream(articles, datetime.now().isoformat(),
+                                             backend=backend))
+    finally:
+        backend.close()
+        server.shutdown()
+
+def _stage_runner(stage: str, corpus: Corpus, workdir: str) -> Callable[[], int]:
+    """
+    Prepare a stage: build its input and return a callable that runs it
+
+    The callable returns the number of items it handled.
+    """
+    if stage == 'generate':
+        return lambda: len(corpus.generate())
+    if stage == 'parse':
+        feeds = corpus.feeds
+        return lambda: sum(len(parse_feed(name, data)) for name, data in feeds.items())
+
+    articles = corpus.articles
+    if stage == 'filter':
+        return lambda: (filter_news(articles, hours=48, limit=len(articles)), len(articles))[1]
+    if stage == 'dedup':
+        return lambda: (deduplicate(articles), len(articles))[1]
+
+    texts = [(article['title'], article_description(article)) for article in articles]
+    if stage == 'summarize':
+        return lambda: sum(1 for title, description in texts
+                           if generate_chinese_summary(title, description) is not None)
+    if stage == 'keywords':
+        return lambda: sum(1 for title, description in texts
+                           if extract_keywords(title, description) is not None)
+    if stage == 'tag':
+        return lambda: len(summarize_batch(texts))
+    if stage == 'process':
+        return lambda: sum(1 for _ in process_stream(articles, datetime.now().isoformat()))
+    if stage == 'backend':
+        return lambda: _process_with_stub(articles)
+    if stage == 'render':
+        processed = corpus.processed()
+        output_file = os.path.join(workdir, f"report_{corpus.size}.html")
+        return lambda: render_report(processed, output_file).total_articles
+    raise ValueError(f"Unknown stage: {stage}")
+
+def measure_stage(stage: str, corpus: Corpus, workdir: str, repeat: int = 1) -> Dict:
+    """
+    Time one stage and record its peak memory
+
+    Input preparation is not timed. The best of repeat runs is reported.
+
+    Returns:
+        Result record for the stage
+    """
+    run = _stage_runner(stage, corpus, workdir)
+    baseline = current_rss_mb()
+    reset_peak_rss()
+
+    best = None
+    items = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        # Stages print progress; keep the benchmark output readable
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                items = run()
+            finally:
+                sys.stdout = stdout
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak = peak_rss_mb()
+    return {
+        'stage': stage,
+        'size': corpus.size,
+        'items': items,
+        'seconds': round(best, 6),
+        'items_per_sec': round(items / best, 1) if best > 0 else None,
+        'peak_rss_mb': round(peak, 1),
+        'rss_growth_mb': round(max(peak - baseline, 0.0), 1),
+    }
+
+def _isolated_stage(queue, stage: str, corpus: Corpus, workdir: str, repeat: int):
+    try:
+        queue.put(measure_stage(stage, corpus, workdir, repeat))
+    except Exception as e:
+        queue.put({'stage': stage, 'size': corpus.size, 'error': repr(e)})
+
+def run_stage(stage: str, corpus: Corpus, workdir: str, repeat: int = 1,
+              isolate: bool = True) -> Dict:
+    """
+    Measure a stage, in a forked process when possible
+
+    A fresh process per stage keeps one stage's allocations from inflating
+    the next stage's peak RSS; the corpus is inherited copy-on-write.
+    """
+    if not isolate or 'fork' not in multiprocessing.get_all_start_methods():
+        return measure_stage(stage, corpus, workdir, repeat)
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    process = context.Process(target=_isolated_stage,
+                              args=(queue, stage, corpus, workdir, repeat))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def git_commit() -> Optional[str]:
+    """Commit hash of the working tree, if it is a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SKILL_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(sizes: List[int], stages: List[str], seed: int = 0, repeat: int = 1,
+                   isolate: bool = True) -> Dict:
+    """
+    Run every stage over a corpus of every size
+
+    Args:
+        sizes: Corpus sizes (articles)
+        stages: Stage names, see STAGES
+        seed: Corpus random seed
+        repeat: Runs per measurement (the fastest is kept)
+        isolate: Run each stage in its own forked process
+
+    Returns:
+        Benchmark report with run metadata and one record per (size, stage)
+    """
+    Corpus.seeds = load_seeds()
+    results = []
+    with tempfile.TemporaryDirectory(prefix='ai-news-bench-') as workdir:
+        for size in sizes:
+            corpus = Corpus(size, seed)
+            # Build shared inputs once in the parent so stage processes inherit them
+            if any(stage != 'generate' for stage in stages):
+                _ = corpus.articles
+            if 'parse' in stages:
+                _ = corpus.feeds
+            for stage in stages:
+                result = run_stage(stage, corpus, workdir, repeat, isolate)
+                results.append(result)
+                print_result(result)
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+def print_result(result: Dict):
+    if 'error' in result:
+        print(f"{result['size']:>9} {result['stage']:<10} ERROR {result['error']}")
+        return
+    print(f"{result['size']:>9} {result['stage']:<10} {result['seconds']:>10.4f}s "
+          f"{result['items_per_sec'] or 0:>12.0f}/s {result['peak_rss_mb']:>8.1f} MiB peak "
+          f"(+{result['rss_growth_mb']:.1f})")
+
+def compare(current: Dict, baseline: Dict, threshold: float = REGRESSION_THRESHOLD) -> int:
+    """
+    Print per-stage time ratios against a baseline report
+
+    Returns:
+        Number of stages that regressed by more than threshold
+    """
+    before = {(r['size'], r['stage']): r for r in baseline['results'] if 'seconds' in r}
+    print(f"\nCompared with {baseline['meta'].get('commit') or 'baseline'} "
+          f"({baseline['meta'].get('timestamp')}):")
+    regressions = 0
+    for result in current['results']:
+        old = before.get((result['size'], result['stage']))
+        if old is None or 'seconds' not in result or not old['seconds']:
+            continue
+        ratio = result['seconds'] / old['seconds']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f"{result['size']:>9} {result['stage']:<10} {old['seconds']:>10.4f}s -> "
+              f"{result['seconds']:.4f}s  x{ratio:.2f}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark pipeline stages over synthetic corpora")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated corpus sizes, 100 to 1000000 "
+                             "(default: 100,1000,10000)")
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f"Comma-separated stages (default: {','.join(STAGES)})")
+    parser.add_argument('--seed', type=int, default=0, help="Corpus random seed (default: 0)")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="Runs per measurement, fastest kept (default: 1)")
+    parser.add_argument('--no-isolate', action='store_true',
+                        help="Run stages in this process instead of one forked process each")
+    parser.add_argument('--output', '-o', metavar='FILE', help="Write results as JSON")
+    parser.add_argument('--compare', metavar='FILE',
+                        help="Baseline results JSON; exit 1 if a stage regressed")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    stages = [stage for stage in args.stages.split(',') if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        print(f"Error: Unknown stages: {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
+    print(f"{'size':>9} {'stage':<10} {'time':>11} {'throughput':>14} {'memory':>13}")
+    report = run_benchmarks(sizes, stages, args.seed, args.repeat, not args.no_isolate)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report, baseline):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
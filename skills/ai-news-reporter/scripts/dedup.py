@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+AI News Near-Duplicate Detection
+Clusters reworded copies of the same story with MinHash signatures and
+locality-sensitive hashing, in close to linear time
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Sequence
+
+NUM_HASHES = 64
+BANDS = 16
+ROWS = NUM_HASHES // BANDS
+SIMILARITY_THRESHOLD = 0.5
+DESCRIPTION_WORDS = 40
+
+_MASK64 = (1 << 64) - 1
+_WORD_RE = re.compile(r'\w+')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def normalized_title(article: Dict) -> str:
+    """Lowercased title without punctuation, used to merge identical headlines"""
+    return _PUNCT_RE.sub('', article.get('title', '').lower())
+
+def shingles(article: Dict, k: int = 2) -> set:
+    """
+    Word k-shingles of the title plus the start of the description
+
+    Args:
+        article: Article with 'title' and optional 'description'
+        k: Words per shingle
+
+    Returns:
+        Set of shingle strings
+    """
+    words = _WORD_RE.findall(article.get('title', '').lower())
+    words += _WORD_RE.findall(article.get('description', '').lower())[:DESCRIPTION_WORDS]
+    if len(words) < k:
+        return {' '.join(words)}
+    return {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+def minhash(features: set, num_hashes: int = NUM_HASHES) -> List[int]:
+    """
+    One-permutation MinHash signature
+
+    Every feature is hashed once and assigned to one of num_hashes bins by
+    its low bits; each bin keeps its minimum. Empty bins borrow from the
+    next non-empty bin (rotation densification), so the cost is one hash
+    per feature rather than num_hashes.
+
+    Args:
+        features: Shingle set
+        num_hashes: Signature length
+
+    Returns:
+        Signature as a list of ints
+    """
+    bins = [None] * num_hashes
+    for feature in features:
+        h = _hash64(feature)
+        index = h % num_hashes
+        value = h // num_hashes
+        if bins[index] is None or value < bins[index]:
+            bins[index] = value
+
+    if all(value is None for value in bins):
+        return [0] * num_hashes
+
+    # Walk the ring right-to-left twice so each empty bin sees its nearest
+    # filled neighbour to the right
+    signature = list(bins)
+    nearest = None
+    for step in range(2 * num_hashes - 1, -1, -1):
+        i = step % num_hashes
+        if bins[i] is not None:
+            nearest = i
+        elif step < num_hashes:
+            distance = (nearest - i) % num_hashes
+            signature[i] = (bins[nearest] + distance * 0x9E3779B97F4A7C15) & _MASK64
+    return signature
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimate Jaccard similarity from two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+def cluster(articles: List[Dict], threshold: float = SIMILARITY_THRESHOLD) -> List[List[int]]:
+    """
+    Group near-duplicate articles
+
+    Articles with the same normalized title are merged outright, whatever
+    their descriptions. Signatures are then split into bands; articles
+    sharing any band are compared against that band's first member only,
+    which keeps the work linear even when a story is syndicated many times.
+
+    Args:
+        articles: Articles to cluster
+        threshold: Minimum estimated Jaccard similarity to merge
+
+    Returns:
+        Clusters as lists of indices, each in input order, ordered by first member
+    """
+    parent = list(range(len(articles)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(a: int, b: int):
+        a, b = find(a), find(b)
+        if a != b:
+            # Keep the earliest article as root so it stays the representative
+            parent[max(a, b)] = min(a, b)
+
+    first_by_title: Dict[str, int] = {}
+    for i, article in enumerate(articles):
+        title = normalized_title(article)
+        if title:
+            union(first_by_title.setdefault(title, i), i)
+
+    signatures = [minhash(shingles(article)) for article in articles]
+    buckets: Dict[tuple, int] = {}
+    for i, signature in enumerate(signatures):
+        for band in range(BANDS):
+            key = (band, *signature[band * ROWS:(band + 1) * ROWS])
+            first = buckets.setdefault(key, i)
+            if first == i:
+                continue
+            if find(first) != find(i) and similarity(signatures[first], signature) >= threshold:
+                union(first, i)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(articles)):
+        clusters.setdefault(find(i), []).append(i)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+def deduplicate(articles: List[Dict], threshold: float = SIMILARITY_THRESHOLD) -> List[Dict]:
+    """
+    Keep one representative per near-duplicate cluster
+
+    The first article of each cluster is kept; the links of the others are
+    recorded on it under 'duplicates'.
+
+    Args:
+        articles: Articles in priority order
+        threshold: Minimum estimated Jaccard similarity to merge
+
+    Returns:
+        Representatives in input order
+    """
+    unique = []
+    for members in cluster(articles, threshold):
+        representative = articles[members[0]]
+        if len(members) > 1:
+            representative = dict(representative)
+            representative['duplicates'] = [articles[i].get('link', '') for i in members[1:]]
+        unique.append(representative)
+    return unique
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+AI News Feed Cache
+Persistent SQLite cache of feed responses and their validators, for
+conditional requests and skipping unchanged feeds
+"""
+
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# A feed fetched less than this many seconds ago is reused without a request
+DEFAULT_TTL = 120.0
+
+# Outcomes recorded per URL
+FRESH = 'fresh'
+NOT_MODIFIED = 'not modified'
+FETCHED = 'fetched'
+
+class CachedFeed:
+    """A stored response: its validators, fetch time and parsed articles"""
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str],
+                 fetched_at: float, articles: List[Dict]):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.articles = articles
+
+    def is_fresh(self, ttl: float, now: Optional[float] = None) -> bool:
+        """Check whether the response is young enough to reuse without asking"""
+        now = time.time() if now is None else now
+        return now - self.fetched_at < ttl
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating the response"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class FeedCache:
+    """
+    SQLite-backed cache of feed responses keyed by URL
+
+    Each entry keeps the response's ETag and Last-Modified, the compressed
+    body and the articles parsed from it, so a 304 Not Modified (or a
+    response still within the TTL) yields the articles without parsing.
+    The least recently used entries are evicted once the stored payload
+    exceeds max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, ttl: float = DEFAULT_TTL):
+        """
+        Open (or create) the cache
+
+        Args:
+            path: SQLite database file
+            max_bytes: Payload size above which old entries are evicted
+            ttl: Seconds during which a response is reused without a request
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # url -> outcome of its last fetch (FRESH, NOT_MODIFIED or FETCHED)
+        self.outcomes: Dict[str, str] = {}
+
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS feeds (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                body BLOB NOT NULL,
+                articles TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS feeds_last_used ON feeds (last_used);
+        """)
+
+    def get(self, url: str) -> Optional[CachedFeed]:
+        """Look up the stored response for a URL"""
+        row = self._conn.execute(
+            "SELECT etag, last_modified, fetched_at, articles FROM feeds WHERE url = ?",
+            (url,)).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, fetched_at, articles = row
+        return CachedFeed(etag, last_modified, fetched_at, json.loads(articles))
+
+    def body(self, url: str) -> Optional[bytes]:
+        """The stored (decompressed) response body of a URL"""
+        row = self._conn.execute("SELECT body FROM feeds WHERE url = ?", (url,)).fetchone()
+        return zlib.decompress(row[0]) if row else None
+
+    def put(self, url: str, headers: Dict[str, str], body: bytes, articles: List[Dict]):
+        """
+        Store a full response
+
+        Args:
+            url: Feed URL
+            headers: Response headers (lowercase names)
+            body: Decompressed response body
+            articles: Articles parsed from the body
+        """
+        now = time.time()
+        compressed = zlib.compress(body)
+        articles_json = json.dumps(articles, ensure_ascii=False)
+        size = len(url) + len(compressed) + len(articles_json.encode('utf-8'))
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feeds VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, headers.get('etag'), headers.get('last-modified'), now,
+                 compressed, articles_json, size, now))
+        self.outcomes[url] = FETCHED
+
+    def revalidated(self, url: str, headers: Dict[str, str]):
+        """Record a 304 Not Modified: the stored response is current again"""
+        now = time.time()
+        with self._conn:
+            # A 304 may carry updated validators
+            self._conn.execute(
+                "UPDATE feeds SET fetched_at = ?, last_used = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+                "WHERE url = ?",
+                (now, now, headers.get('etag'), headers.get('last-modified'), url))
+        self.outcomes[url] = NOT_MODIFIED
+
+    def reused(self, url: str):
+        """Record that a stored response was used within its TTL"""
+        with self._conn:
+            self._conn.execute("UPDATE feeds SET last_used = ? WHERE url = ?",
+                               (time.time(), url))
+        self.outcomes[url] = FRESH
+
+    def total_bytes(self) -> int:
+        """Return the payload size currently stored"""
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM feeds").fetchone()
+        return row[0]
+
+    def evict(self) -> int:
+        """
+        Drop least recently used entries until the cache fits in max_bytes
+
+        Returns:
+            Number of entries removed
+        """
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return 0
+
+        # Trim to 90% of the budget so eviction does not run on every write
+        excess += self.max_bytes // 10
+        doomed = []
+        for url, size in self._conn.execute("SELECT url, size FROM feeds ORDER BY last_used"):
+            doomed.append((url,))
+            excess -= size
+            if excess <= 0:
+                break
+        with self._conn:
+            self._conn.executemany("DELETE FROM feeds WHERE url = ?", doomed)
+        return len(doomed)
+
+    def summary(self) -> str:
+        """One line counting this session's outcomes"""
+        counts = Counter(self.outcomes.values())
+        return ", ".join(f"{counts[outcome]} {outcome}"
+                         for outcome in (FRESH, NOT_MODIFIED, FETCHED))
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
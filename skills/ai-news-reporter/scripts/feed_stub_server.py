@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+AI News Feed Stub Server
+Local HTTP stand-in that serves recorded feeds for testing and benchmarking
+the fetcher without touching the network
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+class FeedHandler(SimpleHTTPRequestHandler):
+    """
+    Serve files from the feed directory over keep-alive HTTP/1.1
+
+    Responses carry Last-Modified and an ETag derived from the file's size
+    and mtime; conditional requests get 304 Not Modified.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    delay = 0.0
+
+    def _etag(self) -> str:
+        try:
+            info = os.stat(self.translate_path(self.path))
+        except OSError:
+            return ''
+        return f'"{info.st_size:x}-{info.st_mtime_ns:x}"'
+
+    def do_GET(self):
+        if self.delay:
+            time.sleep(self.delay)
+        etag = self._etag()
+        if etag and etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.end_headers()
+            return
+        super().do_GET()
+
+    def end_headers(self):
+        etag = self._etag()
+        if etag:
+            self.send_header('ETag', etag)
+        super().end_headers()
+
+    def guess_type(self, path):
+        if path.endswith(('.xml', '.rss', '.atom')):
+            return 'application/xml'
+        return super().guess_type(path)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_feeds(directory: str, port: int = 0, delay: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Start the stub server on a background thread
+
+    Args:
+        directory: Directory of recorded feed files
+        port: Port to bind on localhost (0 picks a free port)
+        delay: Seconds to wait before answering each request
+
+    Returns:
+        The running server; call shutdown() to stop it
+    """
+    handler = type('BoundFeedHandler', (FeedHandler,), {'delay': delay})
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', port),
+        lambda *args, **kwargs: handler(*args, directory=directory, **kwargs))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def stub_sources(directory: str, port: int) -> List[Tuple[str, str]]:
+    """Build (name, url) sources pointing at every feed file in directory"""
+    sources = []
+    for filename in sorted(os.listdir(directory)):
+        name, ext = os.path.splitext(filename)
+        if ext in ('.xml', '.rss', '.atom'):
+            sources.append((name, f"http://127.0.0.1:{port}/{filename}"))
+    return sources
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded feeds on localhost")
+    parser.add_argument('directory', help="Directory of recorded feed files")
+    parser.add_argument('--port', type=int, default=8765, help="Port (default: 8765)")
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help="Seconds to wait before each response (default: 0)")
+    parser.add_argument('--write-sources', metavar='FILE',
+                        help="Write a sources JSON file for fetch_news.py --sources")
+    args = parser.parse_args()
+
+    server = serve_feeds(args.directory, args.port, args.delay)
+    port = server.server_address[1]
+    if args.write_sources:
+        with open(args.write_sources, 'w', encoding='utf-8') as f:
+            json.dump([{'name': name, 'url': url}
+                       for name, url in stub_sources(args.directory, port)], f, indent=2)
+
+    print(f"Serving {args.directory} on http://127.0.0.1:{port}/ (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
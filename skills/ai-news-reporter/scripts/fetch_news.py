@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+AI News Fetcher
+Fetches every configured feed concurrently over pooled keep-alive connections
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from xml.etree.ElementTree import ParseError
+
+from async_http import ConnectionPool, HTTPError
+from feed_cache import DEFAULT_MAX_BYTES as FEED_CACHE_MAX_BYTES
+from feed_cache import DEFAULT_TTL, FETCHED, FeedCache
+from feed_parser import FeedParser
+from metrics import Metrics, stage
+from news_io import write_articles
+from news_archive import NewsArchive
+
+# News sources (RSS feeds)
+SOURCES = [
+    ("TechCrunch", "https://techcrunch.com/category/artificial-intelligence/feed/"),
+    ("VentureBeat", "https://venturebeat.com/category/ai/feed/"),
+    ("MIT_Tech_Review", "https://www.technologyreview.com/topic/artificial-intelligence/feed/"),
+    ("The_Verge", "https://www.theverge.com/ai-artificial-intelligence/rss/index.xml"),
+    ("Ars_Technica", "https://feeds.arstechnica.com/arstechnica/technology-lab"),
+    ("Wired", "https://www.wired.com/feed/tag/ai/latest/rss"),
+    ("OpenAI_Blog", "https://openai.com/blog/rss/"),
+    ("DeepMind_Blog", "https://deepmind.com/blog/feed/basic/"),
+    ("AI_News", "https://artificialintelligence-news.com/feed/"),
+    ("AI_Research", "https://www.ailab.cn/rss"),
+]
+
+def load_sources(path: str) -> List[Tuple[str, str]]:
+    """Load sources from a JSON list of {"name": ..., "url": ...} objects"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [(source['name'], source['url']) for source in json.load(f)]
+
+async def fetch_source(pool: ConnectionPool, name: str, url: str,
+                       parser: Optional[FeedParser] = None,
+                       cache: Optional[FeedCache] = None) -> List[Dict]:
+    """
+    Fetch and parse one feed
+
+    The body is fed to the streaming parser chunk by chunk as it arrives,
+    so parsing overlaps with the download and the feed is never buffered.
+    With a cache, a response fetched within the cache TTL is reused without
+    a request, and otherwise the stored ETag/Last-Modified are sent; on a
+    304 Not Modified the stored articles are returned without parsing.
+
+    Args:
+        pool: Shared connection pool
+        name: Source name
+        url: Feed URL
+        parser: Parser to feed (a new one is created otherwise); its
+            parse_seconds tells parsing time apart from network time
+        cache: Optional feed response cache
+
+    Returns:
+        Raw article records
+    """
+    cached = cache.get(url) if cache is not None else None
+    if cached is not None and cached.is_fresh(cache.ttl):
+        cache.reused(url)
+        return cached.articles
+
+    response = await pool.get(url, cached.validators() if cached is not None else None)
+    if response.status == 304 and cached is not None:
+        cache.revalidated(url, response.headers)
+        return cached.articles
+
+    articles = []
+    body = []
+    try:
+        if response.status != 200:
+            raise HTTPError(f"HTTP {response.status}")
+        parser = parser or FeedParser(name)
+        async for chunk in response.iter_body():
+            articles.extend(parser.feed(chunk))
+            if cache is not None:
+                body.append(chunk)
+        articles.extend(parser.close())
+    finally:
+        response.release()
+    if cache is not None:
+        cache.put(url, response.headers, b''.join(body), articles)
+    return articles
+
+async def fetch_logged(pool: ConnectionPool, name: str, url: str, timeout: float,
+                       metrics: Optional[Metrics] = None,
+                       cache: Optional[FeedCache] = None) -> Optional[List[Dict]]:
+    """
+    Fetch one source with a timeout, logging and recording the outcome
+
+    Returns:
+        Raw article records, or None if the source failed
+    """
+    started = time.perf_counter()
+    parser = FeedParser(name)
+    try:
+        articles = await asyncio.wait_for(fetch_source(pool, name, url, parser, cache), timeout)
+    except asyncio.TimeoutError:
+        print(f"Warning: Timed out fetching from {name} after {timeout:g}s")
+    except (OSError, EOFError, HTTPError, ParseError, ValueError) as e:
+        print(f"Warning: Failed to fetch from {name}: {e}")
+    else:
+        outcome = cache.outcomes.get(url, FETCHED) if cache is not None else FETCHED
+        detail = f"parsing {parser.parse_seconds:.2f}s" if outcome == FETCHED else outcome
+        print(f"Fetched {len(articles)} articles from {name} "
+              f"in {time.perf_counter() - started:.2f}s ({detail})")
+        if metrics is not None:
+            metrics.observe_source(name, time.perf_counter() - started, len(articles),
+                                   True, parser.parse_seconds, cached=outcome != FETCHED)
+        return articles
+    if metrics is not None:
+        metrics.observe_source(name, time.perf_counter() - started, 0, False,
+                               parser.parse_seconds)
+    return None
+
+async def fetch_all(sources: List[Tuple[str, str]], per_host: int = 2,
+                    timeout: float = 30.0, pool: Optional[ConnectionPool] = None,
+                    metrics: Optional[Metrics] = None,
+                    cache: Optional[FeedCache] = None) -> List[Dict]:
+    """
+    Fetch all sources concurrently
+
+    A slow or failing source only costs its own timeout; the rest of the
+    run proceeds. Results are returned in source order.
+
+    Args:
+        sources: (name, url) pairs
+        per_host: Maximum concurrent requests per host
+        timeout: Per-source timeout in seconds
+        pool: Optional connection pool to reuse (one is created otherwise)
+        metrics: Optional metrics receiving per-source latency and counts
+        cache: Optional feed response cache for conditional requests
+
+    Returns:
+        Raw article records from every source that succeeded
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = ConnectionPool(per_host=per_host)
+
+    try:
+        results = await asyncio.gather(*(fetch_logged(pool, name, url, timeout, metrics, cache)
+                                         for name, url in sources))
+    finally:
+        if own_pool:
+            pool.close()
+    return [article for articles in results if articles for article in articles]
+
+def open_feed_cache(args) -> Optional[FeedCache]:
+    """Open the feed cache configured by --feed-cache/--feed-ttl/--feed-cache-max-mb"""
+    if not args.feed_cache:
+        return None
+    return FeedCache(args.feed_cache, args.feed_cache_max_mb * 1024 * 1024, args.feed_ttl)
+
+def close_feed_cache(cache: Optional[FeedCache]):
+    """Evict down to the size limit, report outcomes and close the cache"""
+    if cache is None:
+        return
+    evicted = cache.evict()
+    print(f"Feed cache: {cache.summary()}, {evicted} evicted")
+    cache.close()
+
+def add_feed_cache_arguments(parser: argparse.ArgumentParser):
+    """Add the feed cache options shared by the fetching scripts"""
+    parser.add_argument('--feed-cache', metavar='PATH',
+                        help="SQLite cache of feed responses; send conditional requests "
+                             "and skip unchanged feeds")
+    parser.add_argument('--feed-ttl', type=float, default=DEFAULT_TTL,
+                        help="Seconds to reuse a cached feed without any request "
+                             f"(default: {DEFAULT_TTL:g})")
+    parser.add_argument('--feed-cache-max-mb', type=int,
+                        default=FEED_CACHE_MAX_BYTES // (1024 * 1024),
+                        help="Evict least recently used feeds above this size "
+                             f"(default: {FEED_CACHE_MAX_BYTES // (1024 * 1024)})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch AI news feeds concurrently")
+    parser.add_argument('output_file', help="Raw news JSON or NDJSON file to write")
+    parser.add_argument('--sources', metavar='FILE',
+                        help="JSON list of {\"name\", \"url\"} sources (default: built-in list)")
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help="Per-source timeout in seconds (default: 30)")
+    parser.add_argument('--per-host', type=int, default=2,
+                        help="Maximum concurrent connections per host (default: 2)")
+    parser.add_argument('--archive', metavar='DIR',
+                        help="Also add the fetched articles to this news archive")
+    add_feed_cache_arguments(parser)
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="Write Prometheus text-format metrics to FILE")
+    parser.add_argument('--profile', metavar='DIR',
+                        help="Dump cProfile stats of the fetch stage to DIR")
+    args = parser.parse_args()
+
+    sources = load_sources(args.sources) if args.sources else SOURCES
+    print(f"Fetching AI news from {len(sources)} sources...")
+
+    metrics = Metrics(args.profile)
+    cache = open_feed_cache(args)
+    try:
+        with stage(metrics, 'fetch'):
+            articles = asyncio.run(fetch_all(sources, per_host=args.per_host,
+                                             timeout=args.timeout, metrics=metrics, cache=cache))
+    finally:
+        close_feed_cache(cache)
+    count = write_articles(args.output_file, articles)
+    metrics.count('fetched', count)
+    if args.archive:
+        with stage(metrics, 'archive'):
+            added = NewsArchive(args.archive).ingest(articles)
+        print(f"Archived {added} new articles in {args.archive}")
+    if args.metrics:
+        metrics.write_prometheus(args.metrics)
+
+    print(f"Fetched {count} articles")
+    if count == 0:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+AI News Filter Script
+Filters raw news data to the most relevant recent, AI-related,
+de-duplicated articles
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from dedup import deduplicate
+from news_archive import article_epoch
+from news_io import load_articles, write_articles
+from ranking import top_k
+from term_matcher import get_matcher
+
+# Ranked candidates kept per reported article, so that collapsing
+# duplicates among them still leaves enough distinct stories
+CANDIDATE_HEADROOM = 4
+
+def is_ai_related(article: Dict) -> bool:
+    """Check whether the article title or description mentions an AI keyword"""
+    # NUL never occurs in a term, so no match can span title and description
+    text = f"{article['title']}\0{article['description']}"
+    return 'ai_filter' in get_matcher().scan(text)
+
+def is_recent(article: Dict, cutoff_time: datetime) -> bool:
+    """Check whether the article was published after cutoff_time (best effort)"""
+    # Archived articles carry their parsed date; others are parsed here
+    epoch = article_epoch(article)
+    # If there is no date or it cannot be parsed, include the article
+    return epoch is None or epoch >= cutoff_time.timestamp()
+
+def filter_news(news_data: Iterable[Dict], hours: int = 24, limit: int = 20,
+                weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+    """
+    Select the most relevant recent AI-related articles, without duplicates
+
+    Articles are filtered and ranked as they stream past (see ranking.py);
+    only the best limit * CANDIDATE_HEADROOM are held. Near-duplicates are
+    then collapsed among those candidates in rank order, so each story is
+    represented by its best-scoring copy.
+
+    Args:
+        news_data: Raw articles, in any order
+        hours: Only keep articles published within this many hours
+        limit: Maximum number of articles to keep
+        weights: Per-source score weights (default: ranking.SOURCE_WEIGHTS)
+
+    Returns:
+        Filtered articles, best first
+    """
+    cutoff_time = datetime.now() - timedelta(hours=hours)
+    filtered_news = (article for article in news_data
+                     if is_ai_related(article) and is_recent(article, cutoff_time))
+
+    candidates = top_k(filtered_news, limit * CANDIDATE_HEADROOM, weights=weights)
+
+    # Collapse near-duplicate (syndicated / reworded) stories
+    unique_news = deduplicate([article for _, article in candidates])
+
+    return unique_news[:limit]
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 filter_news.py <raw_data_file>  (JSON, NDJSON or .capture)")
+        sys.exit(1)
+
+    raw_data_file = sys.argv[1]
+
+    if not os.path.exists(raw_data_file):
+        print(f"Error: Raw data file not found: {raw_data_file}")
+        sys.exit(1)
+
+    # Read raw data in full: the filtered articles replace the file
+    news_data = load_articles(raw_data_file)
+
+    final_news = filter_news(news_data)
+
+    print(f"Filtered to {len(final_news)} unique AI-related articles")
+
+    # Save filtered data, in the input's format
+    write_articles(raw_data_file, final_news)
+
+if __name__ == "__main__":
+    main()
@@ -4,246 +4,313 @@ AI News HTML Generator
 Generates a visual HTML report from processed news data
 """
 
+import argparse
+import glob
+import html
 import json
+import shutil
 import sys
 import os
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict
+from email.utils import parsedate_to_datetime
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Optional, TextIO, Union
+
+from html_template import compile_template, escape_batch, write_asset
+from metrics import Metrics, stage
+from news_io import CHUNK_SIZE, iter_articles
+from pipeline_state import PipelineState
+
+# Rendered cards stay in memory up to this size, then spill to disk
+SPOOL_SIZE = 8 * 1024 * 1024
+
+# Directory, next to the report, holding shared content-hashed assets
+ASSETS_DIR = 'assets'
+
+# Report stylesheet, shared by every report as a content-hashed asset
+REPORT_CSS = """* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', 'Helvetica', 'Arial', sans-serif;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    min-height: 100vh;
+    padding: 20px;
+}
+
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+    background: white;
+    border-radius: 20px;
+    box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
+    overflow: hidden;
+}
+
+.header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 40px;
+    text-align: center;
+}
+
+.header h1 {
+    font-size: 2.5em;
+    margin-bottom: 10px;
+    font-weight: 700;
+}
+
+.header .timestamp {
+    font-size: 1em;
+    opacity: 0.9;
+    margin-top: 10px;
+}
+
+.stats {
+    background: #f8f9fa;
+    padding: 20px 40px;
+    border-bottom: 1px solid #e9ecef;
+    display: flex;
+    justify-content: space-around;
+    text-align: center;
+}
+
+.stat-item {
+    flex: 1;
+}
+
+.stat-value {
+    font-size: 2em;
+    font-weight: 700;
+    color: #667eea;
+}
+
+.stat-label {
+    font-size: 0.9em;
+    color: #6c757d;
+    margin-top: 5px;
+}
+
+.news-list {
+    padding: 40px;
+}
+
+.news-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
+    gap: 25px;
+}
+
+.news-card {
+    background: white;
+    border-radius: 15px;
+    border: 1px solid #e9ecef;
+    overflow: hidden;
+    transition: transform 0.3s, box-shadow 0.3s;
+    display: flex;
+    flex-direction: column;
+}
+
+.news-card:hover {
+    transform: translateY(-5px);
+    box-shadow: 0 10px 30px rgba(102, 126, 234, 0.3);
+}
+
+.card-header {
+    background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%);
+    padding: 15px 20px;
+    border-bottom: 1px solid #e9ecef;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
+
+.source-badge {
+    background: #667eea;
+    color: white;
+    padding: 5px 12px;
+    border-radius: 20px;
+    font-size: 0.85em;
+    font-weight: 600;
+}
+
+.card-body {
+    padding: 20px;
+    flex: 1;
+    display: flex;
+    flex-direction: column;
+}
+
+.news-title {
+    font-size: 1.1em;
+    font-weight: 600;
+    color: #212529;
+    margin-bottom: 15px;
+    line-height: 1.5;
+    display: -webkit-box;
+    -webkit-line-clamp: 2;
+    -webkit-box-orient: vertical;
+    overflow: hidden;
+}
+
+.news-summary {
+    color: #495057;
+    line-height: 1.8;
+    margin-bottom: 15px;
+    flex: 1;
+}
+
+.keywords {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 8px;
+    margin-bottom: 15px;
+}
+
+.keyword-tag {
+    background: #f1f3f5;
+    color: #495057;
+    padding: 4px 10px;
+    border-radius: 12px;
+    font-size: 0.85em;
+    font-weight: 500;
+}
+
+.card-footer {
+    padding: 15px 20px;
+    border-top: 1px solid #e9ecef;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
+
+.pub-date {
+    color: #6c757d;
+    font-size: 0.9em;
+}
+
+.read-btn {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    border: none;
+    padding: 10px 20px;
+    border-radius: 25px;
+    font-size: 0.9em;
+    font-weight: 600;
+    cursor: pointer;
+    transition: transform 0.2s, box-shadow 0.2s;
+    text-decoration: none;
+    display: inline-block;
+}
+
+.read-btn:hover {
+    transform: scale(1.05);
+    box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
+}
+
+.read-btn.sample-link {
+    background: linear-gradient(135deg, #9ca3af 0%, #6b7280 100%);
+    cursor: help;
+}
+
+.read-btn.sample-link:hover {
+    transform: none;
+    box-shadow: 0 5px 15px rgba(156, 163, 175, 0.4);
+}
+
+.footer {
+    background: #f8f9fa;
+    padding: 30px;
+    text-align: center;
+    color: #6c757d;
+    border-top: 1px solid #e9ecef;
+}
+
+.footer a {
+    color: #667eea;
+    text-decoration: none;
+}
+
+.footer a:hover {
+    text-decoration: underline;
+}
+
+@media (max-width: 768px) {
+    .header h1 {
+        font-size: 1.8em;
+    }
+
+    .stats {
+        flex-direction: column;
+        gap: 15px;
+    }
+
+    .news-grid {
+        grid-template-columns: 1fr;
+    }
+}
+"""
+
+# Card markup; every placeholder is filled with an already-escaped value
+CARD_TEMPLATE = compile_template("""
+        <div class="news-card">
+            <div class="card-header">
+                <span class="source-badge">{source}</span>
+            </div>
+            <div class="card-body">
+                <div class="news-title">{title}</div>
+                <div class="news-summary">{summary}</div>
+                <div class="keywords">{keywords}</div>
+            </div>
+            <div class="card-footer">
+                <span class="pub-date">{pub_date}</span>
+                <a href="{link}" class="{button_class}" target="_blank" rel="noopener">{button_text}</a>
+            </div>
+        </div>
+    """)
+
+# Articles rendered per template batch
+CARD_BATCH = 256
+
+def write_stylesheet(output_file: str) -> str:
+    """
+    Write the shared stylesheet next to a report
 
-def generate_html_header(title: str, timestamp: str) -> str:
-    """Generate HTML header with CSS styles"""
+    Args:
+        output_file: Report HTML file
+
+    Returns:
+        Stylesheet URL relative to the report
+    """
+    assets_dir = os.path.join(os.path.dirname(os.path.abspath(output_file)), ASSETS_DIR)
+    return f"{ASSETS_DIR}/{write_asset(assets_dir, 'report', REPORT_CSS, 'css')}"
+
+def generate_html_header(title: str, timestamp: str, stylesheet: Optional[str] = None) -> str:
+    """
+    Generate HTML header
+
+    Args:
+        title: Page title
+        timestamp: Generation timestamp
+        stylesheet: URL of the shared stylesheet; the CSS is inlined when omitted
+    """
+    if stylesheet:
+        style = f'<link rel="stylesheet" href="{html.escape(stylesheet)}">'
+    else:
+        style = f"<style>\n{REPORT_CSS}    </style>"
+    title = html.escape(title, quote=False)
     return f"""<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{title}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', 'Helvetica', 'Arial', sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 20px;
-            box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
-            overflow: hidden;
-        }}
-
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 40px;
-            text-align: center;
-        }}
-
-        .header h1 {{
-            font-size: 2.5em;
-            margin-bottom: 10px;
-            font-weight: 700;
-        }}
-
-        .header .timestamp {{
-            font-size: 1em;
-            opacity: 0.9;
-            margin-top: 10px;
-        }}
-
-        .stats {{
-            background: #f8f9fa;
-            padding: 20px 40px;
-            border-bottom: 1px solid #e9ecef;
-            display: flex;
-            justify-content: space-around;
-            text-align: center;
-        }}
-
-        .stat-item {{
-            flex: 1;
-        }}
-
-        .stat-value {{
-            font-size: 2em;
-            font-weight: 700;
-            color: #667eea;
-        }}
-
-        .stat-label {{
-            font-size: 0.9em;
-            color: #6c757d;
-            margin-top: 5px;
-        }}
-
-        .news-list {{
-            padding: 40px;
-        }}
-
-        .news-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
-            gap: 25px;
-        }}
-
-        .news-card {{
-            background: white;
-            border-radius: 15px;
-            border: 1px solid #e9ecef;
-            overflow: hidden;
-            transition: transform 0.3s, box-shadow 0.3s;
-            display: flex;
-            flex-direction: column;
-        }}
-
-        .news-card:hover {{
-            transform: translateY(-5px);
-            box-shadow: 0 10px 30px rgba(102, 126, 234, 0.3);
-        }}
-
-        .card-header {{
-            background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%);
-            padding: 15px 20px;
-            border-bottom: 1px solid #e9ecef;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-
-        .source-badge {{
-            background: #667eea;
-            color: white;
-            padding: 5px 12px;
-            border-radius: 20px;
-            font-size: 0.85em;
-            font-weight: 600;
-        }}
-
-        .card-body {{
-            padding: 20px;
-            flex: 1;
-            display: flex;
-            flex-direction: column;
-        }}
-
-        .news-title {{
-            font-size: 1.1em;
-            font-weight: 600;
-            color: #212529;
-            margin-bottom: 15px;
-            line-height: 1.5;
-            display: -webkit-box;
-            -webkit-line-clamp: 2;
-            -webkit-box-orient: vertical;
-            overflow: hidden;
-        }}
-
-        .news-summary {{
-            color: #495057;
-            line-height: 1.8;
-            margin-bottom: 15px;
-            flex: 1;
-        }}
-
-        .keywords {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 8px;
-            margin-bottom: 15px;
-        }}
-
-        .keyword-tag {{
-            background: #f1f3f5;
-            color: #495057;
-            padding: 4px 10px;
-            border-radius: 12px;
-            font-size: 0.85em;
-            font-weight: 500;
-        }}
-
-        .card-footer {{
-            padding: 15px 20px;
-            border-top: 1px solid #e9ecef;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }}
-
-        .pub-date {{
-            color: #6c757d;
-            font-size: 0.9em;
-        }}
-
-        .read-btn {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            border: none;
-            padding: 10px 20px;
-            border-radius: 25px;
-            font-size: 0.9em;
-            font-weight: 600;
-            cursor: pointer;
-            transition: transform 0.2s, box-shadow 0.2s;
-            text-decoration: none;
-            display: inline-block;
-        }}
-
-        .read-btn:hover {{
-            transform: scale(1.05);
-            box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-        }}
-
-        .read-btn.sample-link {{
-            background: linear-gradient(135deg, #9ca3af 0%, #6b7280 100%);
-            cursor: help;
-        }}
-
-        .read-btn.sample-link:hover {{
-            transform: none;
-            box-shadow: 0 5px 15px rgba(156, 163, 175, 0.4);
-        }}
-
-        .footer {{
-            background: #f8f9fa;
-            padding: 30px;
-            text-align: center;
-            color: #6c757d;
-            border-top: 1px solid #e9ecef;
-        }}
-
-        .footer a {{
-            color: #667eea;
-            text-decoration: none;
-        }}
-
-        .footer a:hover {{
-            text-decoration: underline;
-        }}
-
-        @media (max-width: 768px) {{
-            .header h1 {{
-                font-size: 1.8em;
-            }}
-
-            .stats {{
-                flex-direction: column;
-                gap: 15px;
-            }}
-
-            .news-grid {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-    </style>
+    {style}
 </head>
 <body>
     <div class="container">
@@ -253,49 +320,61 @@ def generate_html_header(title: str, timestamp: str) -> str:
         </div>
 """
 
-def generate_news_card(article: Dict, index: int) -> str:
-    """Generate HTML for a single news card"""
-    source = article.get('source', 'Unknown')
-    title = article.get('title', 'No title')
-    summary = article.get('summary', 'No summary available')
-    keywords = article.get('keywords', [])
-    link = article.get('link', '#')
-    pub_date = article.get('pubDate', 'Unknown date')
-
-    # Format publication date
-    formatted_date = pub_date
+def format_pub_date(pub_date: str) -> str:
+    """Reformat an RSS/Atom date as YYYY-MM-DD HH:MM (unchanged if unparseable)"""
     if pub_date and pub_date != 'Unknown date':
         try:
-            # Try to parse and reformat the date
-            from email.utils import parsedate_to_datetime
-            dt = parsedate_to_datetime(pub_date)
-            formatted_date = dt.strftime('%Y-%m-%d %H:%M')
-        except:
+            return parsedate_to_datetime(pub_date).strftime('%Y-%m-%d %H:%M')
+        except (TypeError, ValueError, IndexError, OverflowError):
             pass
+    return pub_date
 
-    keywords_html = ''.join([f'<span class="keyword-tag">{k}</span>' for k in keywords])
+def generate_news_cards(articles: List[Dict]) -> List[str]:
+    """
+    Generate HTML for a batch of news cards
 
-    # Determine if link is valid (simple check for example data)
-    is_sample_data = '/category/' in link or '/topic/' in link or '/tag/' in link
-    button_text = "查看源站 →" if is_sample_data else "查看原文 →"
-    button_class = "read-btn" if not is_sample_data else "read-btn sample-link"
+    Field values are gathered into columns and each column is escaped in
+    one call before the compiled card template is applied row by row.
 
-    return f"""
-        <div class="news-card">
-            <div class="card-header">
-                <span class="source-badge">{source}</span>
-            </div>
-            <div class="card-body">
-                <div class="news-title">{title}</div>
-                <div class="news-summary">{summary}</div>
-                <div class="keywords">{keywords_html}</div>
-            </div>
-            <div class="card-footer">
-                <span class="pub-date">{formatted_date}</span>
-                <a href="{link}" class="{button_class}" target="_blank" rel="noopener">{button_text}</a>
-            </div>
-        </div>
+    Args:
+        articles: Processed articles
+
+    Returns:
+        Card HTML fragments in article order
     """
+    links = [article.get('link', '#') for article in articles]
+    keywords = [article.get('keywords', []) for article in articles]
+
+    # Keywords of the whole batch are escaped as one flat column
+    flat_keywords = escape_batch([k for words in keywords for k in words])
+    keywords_html = []
+    offset = 0
+    for words in keywords:
+        end = offset + len(words)
+        keywords_html.append(''.join(
+            f'<span class="keyword-tag">{k}</span>' for k in flat_keywords[offset:end]))
+        offset = end
+
+    # Determine if link is valid (simple check for example data)
+    is_sample = ['/category/' in link or '/topic/' in link or '/tag/' in link
+                 for link in links]
+
+    return CARD_TEMPLATE.render_columns({
+        'source': escape_batch([article.get('source', 'Unknown') for article in articles]),
+        'title': escape_batch([article.get('title', 'No title') for article in articles]),
+        'summary': escape_batch([article.get('summary', 'No summary available')
+                                 for article in articles]),
+        'keywords': keywords_html,
+        'pub_date': escape_batch([format_pub_date(article.get('pubDate', 'Unknown date'))
+                                  for article in articles]),
+        'link': escape_batch(links, quote=True),
+        'button_class': ["read-btn sample-link" if sample else "read-btn" for sample in is_sample],
+        'button_text': ["查看源站 →" if sample else "查看原文 →" for sample in is_sample],
+    })
+
+def generate_news_card(article: Dict, index: int) -> str:
+    """Generate HTML for a single news card"""
+    return generate_news_cards([article])[0]
 
 def generate_html_footer() -> str:
     """Generate HTML footer"""
@@ -312,84 +391,389 @@ def generate_html_footer() -> str:
 </html>
 """
 
-def generate_html(processed_data_file: str, output_file: str):
-    """
-    Generate HTML report from processed news data
-
-    Args:
-        processed_data_file: Path to processed news JSON file
-        output_file: Path to output HTML file
-    """
-    print(f"Generating HTML report from {processed_data_file}...")
-
-    # Read processed data
-    with open(processed_data_file, 'r', encoding='utf-8') as f:
-        news_data = json.load(f)
-
-    print(f"Generating HTML for {len(news_data)} articles...")
-
-    # Generate HTML
-    timestamp = datetime.now().strftime('%Y年%m月%d日 %H:%M')
-    title = "今日AI简报"
+class ReportStats:
+    """Report statistics accumulated in the same pass that renders the cards"""
 
-    html_content = generate_html_header(title, timestamp)
+    def __init__(self):
+        self.total_articles = 0
+        self.sources = set()
+        self.total_keywords = 0
+        # Cards rendered this run, as opposed to reused from pipeline state
+        self.rendered = 0
 
-    # Add statistics
-    total_articles = len(news_data)
-    sources = len(set(article.get('source', 'Unknown') for article in news_data))
-    total_keywords = sum(len(article.get('keywords', [])) for article in news_data)
+    def add(self, article: Dict):
+        self.total_articles += 1
+        self.sources.add(article.get('source', 'Unknown'))
+        self.total_keywords += len(article.get('keywords', []))
 
-    html_content += f"""
+def generate_stats(stats: ReportStats) -> str:
+    """Generate HTML for the statistics panel"""
+    return f"""
         <div class="stats">
             <div class="stat-item">
-                <div class="stat-value">{total_articles}</div>
+                <div class="stat-value">{stats.total_articles}</div>
                 <div class="stat-label">篇文章</div>
             </div>
             <div class="stat-item">
-                <div class="stat-value">{sources}</div>
+                <div class="stat-value">{len(stats.sources)}</div>
                 <div class="stat-label">个来源</div>
             </div>
             <div class="stat-item">
-                <div class="stat-value">{total_keywords}</div>
+                <div class="stat-value">{stats.total_keywords}</div>
                 <div class="stat-label">个关键词</div>
             </div>
         </div>
     """
 
-    # Add news list
-    html_content += '<div class="news-list">\n'
-    html_content += '<div class="news-grid">\n'
+def render_cards(articles: Iterable[Dict], stats: ReportStats,
+                 state: Optional[PipelineState] = None) -> Iterator[str]:
+    """
+    Render one card per article, updating stats as cards are produced
 
-    for article in news_data:
-        html_content += generate_news_card(article, news_data.index(article))
+    Articles are rendered in batches of CARD_BATCH so escaping and
+    templating work on whole columns.
 
-    html_content += '</div>\n'
-    html_content += '</div>\n'
+    Args:
+        articles: Processed articles, consumed lazily
+        stats: Statistics accumulator
+        state: Optional pipeline state whose cached cards are reused
 
-    # Add footer
-    html_content += generate_html_footer()
+    Yields:
+        Card HTML fragments in article order
+    """
+    version = CARD_TEMPLATE.version
+    articles = iter(articles)
+    batch = list(islice(articles, CARD_BATCH))
+    while batch:
+        cards = [None] * len(batch)
+        pending = []
+        for i, article in enumerate(batch):
+            stats.add(article)
+            if state is not None:
+                cards[i] = state.cached_card(article, version)
+            if cards[i] is None:
+                pending.append(i)
+
+        for i, card in zip(pending, generate_news_cards([batch[i] for i in pending])):
+            cards[i] = card
+        stats.rendered += len(pending)
+
+        for article, card in zip(batch, cards):
+            if state is not None:
+                state.record_card(article, card, version)
+            yield card
+        batch = list(islice(articles, CARD_BATCH))
+
+def write_report(f: TextIO, title: str, timestamp: str, stats: ReportStats,
+                 cards: Union[TextIO, Iterable[str]], after_grid: str = '',
+                 stylesheet: Optional[str] = None):
+    """
+    Write a full report page
+
+    Args:
+        f: Output stream
+        title: Page title
+        timestamp: Generation timestamp shown in the header
+        stats: Statistics for the stats panel
+        cards: Card HTML, either a readable file (copied in chunks) or strings
+        after_grid: Extra HTML placed right after the card grid
+        stylesheet: URL of the shared stylesheet; the CSS is inlined when omitted
+    """
+    f.write(generate_html_header(title, timestamp, stylesheet))
+    f.write(generate_stats(stats))
+    f.write('<div class="news-list">\n')
+    f.write('<div class="news-grid">\n')
+    if hasattr(cards, 'read'):
+        cards.seek(0)
+        shutil.copyfileobj(cards, f, CHUNK_SIZE)
+    else:
+        f.writelines(cards)
+    f.write('</div>\n')
+    f.write(after_grid)
+    f.write('</div>\n')
+    f.write(generate_html_footer())
+
+@contextmanager
+def open_replacing(path: str) -> Iterator[TextIO]:
+    """
+    Open a text file for writing that replaces path only once complete
+
+    A report that is regenerated while being viewed (watch mode) is never
+    seen half-written.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def write_shard(shard_dir: str, page: int, cards: List[str]) -> Dict:
+    """
+    Write one page of cards as a standalone shard script
+
+    Shards are JavaScript files rather than JSON so the landing page can
+    load them with a <script> tag, which also works from file:// URLs.
+
+    Args:
+        shard_dir: Directory holding the shards
+        page: 1-based page number
+        cards: Card HTML fragments of this page
 
-    # Save HTML file
-    print(f"Saving HTML report to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    Returns:
+        Manifest entry for the shard
+    """
+    filename = f"page-{page:05d}.js"
+    with open(os.path.join(shard_dir, filename), 'w', encoding='utf-8') as f:
+        f.write(f"window.loadNewsShard({page}, ")
+        f.write(json.dumps(''.join(cards), ensure_ascii=False))
+        f.write(");\n")
+    return {'page': page, 'file': filename, 'count': len(cards)}
+
+def generate_shard_loader(manifest: Dict) -> str:
+    """Generate the sentinel and script that append shards on scroll"""
+    manifest_json = json.dumps(manifest, ensure_ascii=False).replace('</', '<\\/')
+    return f"""
+        <div id="shard-sentinel" style="height: 1px;"></div>
+        <script>
+        (function () {{
+            var manifest = {manifest_json};
+            var next = 1;
+            var loading = false;
+            var grid = document.querySelector('.news-grid');
+            var sentinel = document.getElementById('shard-sentinel');
+
+            function nearBottom() {{
+                return sentinel.getBoundingClientRect().top < window.innerHeight + 800;
+            }}
+
+            function loadNext() {{
+                if (loading || next >= manifest.pages.length) {{
+                    return;
+                }}
+                loading = true;
+                var script = document.createElement('script');
+                script.src = manifest.base + manifest.pages[next++].file;
+                script.onerror = function () {{ loading = false; }};
+                document.body.appendChild(script);
+            }}
+
+            window.loadNewsShard = function (page, html) {{
+                grid.insertAdjacentHTML('beforeend', html);
+                loading = false;
+                if (nearBottom()) {{
+                    loadNext();
+                }}
+            }};
+
+            if ('IntersectionObserver' in window) {{
+                new IntersectionObserver(function (entries) {{
+                    if (entries[0].isIntersecting) {{
+                        loadNext();
+                    }}
+                }}, {{rootMargin: '800px'}}).observe(sentinel);
+            }} else {{
+                window.addEventListener('scroll', function () {{
+                    if (nearBottom()) {{
+                        loadNext();
+                    }}
+                }});
+            }}
+        }})();
+        </script>
+"""
+
+def write_paginated_report(articles: Iterable[Dict], output_file: str, page_size: int,
+                           state: Optional[PipelineState] = None,
+                           inline_css: bool = False) -> ReportStats:
+    """
+    Write a paginated HTML report
+
+    The landing page holds the header, stats and first page of cards. Every
+    further page is written to its own shard as soon as it fills up, with a
+    small manifest.json listing the shards; the landing page loads them on
+    scroll.
+
+    Args:
+        articles: Processed articles, consumed lazily
+        output_file: Path to the landing HTML file
+        page_size: Cards per page
+        state: Optional pipeline state whose cached cards are reused
+        inline_css: Embed the stylesheet instead of linking the shared asset
+
+    Returns:
+        Statistics of the report
+    """
+    timestamp = datetime.now().strftime('%Y年%m月%d日 %H:%M')
+    title = "今日AI简报"
+
+    shard_dir = os.path.splitext(output_file)[0] + '_pages'
+    os.makedirs(shard_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(shard_dir, 'page-*.js')):
+        os.remove(stale)
+
+    stats = ReportStats()
+    first_page: List[str] = []
+    page_cards: List[str] = []
+    shards: List[Dict] = []
+    for card in render_cards(articles, stats, state):
+        if len(first_page) < page_size:
+            first_page.append(card)
+            continue
+        page_cards.append(card)
+        if len(page_cards) == page_size:
+            shards.append(write_shard(shard_dir, len(shards) + 2, page_cards))
+            page_cards = []
+    if page_cards:
+        shards.append(write_shard(shard_dir, len(shards) + 2, page_cards))
+
+    manifest = {
+        'total': stats.total_articles,
+        'page_size': page_size,
+        'base': os.path.basename(shard_dir) + '/',
+        'pages': [{'page': 1, 'file': None, 'count': len(first_page)}] + shards,
+    }
+    with open(os.path.join(shard_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(f"Saving HTML report to {output_file} ({len(manifest['pages'])} pages)...")
+    with open_replacing(output_file) as f:
+        loader = generate_shard_loader(manifest) if shards else ''
+        write_report(f, title, timestamp, stats, first_page, after_grid=loader,
+                     stylesheet=None if inline_css else write_stylesheet(output_file))
+    print(f"Page shards saved to: {shard_dir}")
+    return stats
+
+def write_single_report(articles: Iterable[Dict], output_file: str,
+                        state: Optional[PipelineState] = None,
+                        inline_css: bool = False) -> ReportStats:
+    """
+    Write a single-file HTML report
+
+    Cards are spooled (in memory, spilling to a temporary file for large
+    reports) while the statistics shown above them are accumulated, then
+    header, stats, cards and footer are written to the output in chunks.
+
+    Args:
+        articles: Processed articles, consumed lazily
+        output_file: Path to output HTML file
+        state: Optional pipeline state whose cached cards are reused
+        inline_css: Embed the stylesheet instead of linking the shared asset
+
+    Returns:
+        Statistics of the report
+    """
+    timestamp = datetime.now().strftime('%Y年%m月%d日 %H:%M')
+    title = "今日AI简报"
+
+    stats = ReportStats()
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE, mode='w+',
+                                       encoding='utf-8') as cards:
+        cards.writelines(render_cards(articles, stats, state))
+
+        print(f"Generated HTML for {stats.total_articles} articles")
+
+        # Save HTML file
+        print(f"Saving HTML report to {output_file}...")
+        with open_replacing(output_file) as f:
+            write_report(f, title, timestamp, stats, cards,
+                         stylesheet=None if inline_css else write_stylesheet(output_file))
+    return stats
+
+def render_report(articles: Iterable[Dict], output_file: str,
+                  state: Optional[PipelineState] = None, page_size: int = 0,
+                  inline_css: bool = False) -> ReportStats:
+    """
+    Render processed articles into an HTML report in a single pass
+
+    Args:
+        articles: Processed articles, consumed lazily
+        output_file: Path to output HTML file
+        state: Optional pipeline state; cards of articles that are unchanged
+            since the last report are reused, and this run's cards are saved
+        page_size: Cards per page; when positive, write a paginated report
+            with lazily loaded shards instead of a single file
+        inline_css: Embed the stylesheet instead of linking the shared,
+            content-hashed assets/report-<hash>.css
+
+    Returns:
+        Statistics of the report
+    """
+    if page_size > 0:
+        stats = write_paginated_report(articles, output_file, page_size, state, inline_css)
+    else:
+        stats = write_single_report(articles, output_file, state, inline_css)
+
+    if state is not None:
+        state.save_report(output_file)
+        print(f"Incremental run: {stats.rendered} cards rendered, "
+              f"{stats.total_articles - stats.rendered} reused")
+    return stats
+
+def generate_html(processed_data_file: str, output_file: str,
+                  state_path: Optional[str] = None, page_size: int = 0,
+                  inline_css: bool = False, metrics: Optional[Metrics] = None) -> ReportStats:
+    """
+    Generate HTML report from processed news data
+
+    Articles are streamed from the input and rendered in a single pass.
+
+    Args:
+        processed_data_file: Path to processed news JSON file
+        output_file: Path to output HTML file
+        state_path: Optional pipeline state file; cards of articles that are
+            unchanged since the last report are reused instead of re-rendered
+        page_size: Cards per page; when positive, write a paginated report
+            with lazily loaded shards instead of a single file
+        inline_css: Embed the stylesheet instead of linking the shared,
+            content-hashed assets/report-<hash>.css
+        metrics: Optional metrics; the run is timed as the 'render' stage
+
+    Returns:
+        Statistics of the report
+    """
+    print(f"Generating HTML report from {processed_data_file}...")
+
+    with stage(metrics, 'render'):
+        state = PipelineState(state_path) if state_path else None
+        stats = render_report(iter_articles(processed_data_file), output_file, state,
+                              page_size, inline_css)
+    if metrics is not None:
+        metrics.count('rendered', stats.total_articles)
 
     print(f"HTML generation complete!")
     print(f"Report saved to: {output_file}")
+    return stats
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python3 generate_html.py <processed_data_file> <output_file>")
-        sys.exit(1)
-
-    processed_data_file = sys.argv[1]
-    output_file = sys.argv[2]
-
-    if not os.path.exists(processed_data_file):
-        print(f"Error: Processed data file not found: {processed_data_file}")
+    parser = argparse.ArgumentParser(
+        description="Generate a visual HTML report from processed news data")
+    parser.add_argument('processed_data_file', help="Processed news JSON or NDJSON file")
+    parser.add_argument('output_file', help="Output HTML file")
+    parser.add_argument('--state', metavar='PATH',
+                        help="Pipeline state file; reuse cards of unchanged articles")
+    parser.add_argument('--page-size', type=int, default=0,
+                        help="Cards per page; write lazily loaded page shards (default: single file)")
+    parser.add_argument('--inline-css', action='store_true',
+                        help="Embed the stylesheet for a self-contained file "
+                             "(default: link the shared assets/report-<hash>.css)")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="Write Prometheus text-format metrics to FILE")
+    parser.add_argument('--profile', metavar='DIR',
+                        help="Dump cProfile stats of the render stage to DIR")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.processed_data_file):
+        print(f"Error: Processed data file not found: {args.processed_data_file}")
         sys.exit(1)
 
-    generate_html(processed_data_file, output_file)
+    metrics = Metrics(args.profile)
+    generate_html(args.processed_data_file, args.output_file, state_path=args.state,
+                  page_size=args.page_size, inline_css=args.inline_css, metrics=metrics)
+    if args.metrics:
+        metrics.write_prometheus(args.metrics)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+AI News Grouped Reports
+Writes one report per source, topic category and company from a single
+pass over the processed data, rendering every card once
+"""
+
+import argparse
+import html
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from generate_html import (
+    CARD_BATCH, SPOOL_SIZE, ReportStats, generate_html_footer, generate_html_header,
+    open_replacing, render_cards, write_report, write_stylesheet
+)
+from metrics import Metrics, stage
+from news_io import iter_articles
+from process_news import summary_topic
+from term_matcher import get_lexicon
+
+def article_companies(article: Dict) -> List[str]:
+    """Companies an article is tagged with (from its keywords)"""
+    companies = get_lexicon().company_set
+    return [keyword for keyword in article.get('keywords') or () if keyword in companies]
+
+# Grouping name -> (label shown in titles, groups of an article)
+GROUPINGS: Dict[str, Tuple[str, Callable[[Dict], List[str]]]] = {
+    'source': ("来源", lambda article: [article.get('source', 'Unknown')]),
+    'topic': ("主题", lambda article: [summary_topic(article.get('summary', ''))]),
+    'company': ("公司", article_companies),
+}
+
+_UNSAFE_RE = re.compile(r'[^\w.-]+')
+
+def report_filename(grouping: str, group: str) -> str:
+    """File name of a group's report, e.g. source-TechCrunch.html"""
+    return f"{grouping}-{_UNSAFE_RE.sub('_', group).strip('_') or 'other'}.html"
+
+class CardStore:
+    """
+    Rendered cards spooled once and read back by any number of reports
+
+    Cards stay in memory up to SPOOL_SIZE and spill to a temporary file
+    beyond it; reports refer to them by (offset, length).
+    """
+
+    def __init__(self):
+        self._file = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        self._size = 0
+
+    def add(self, card: str) -> Tuple[int, int]:
+        data = card.encode('utf-8')
+        self._file.seek(self._size)
+        self._file.write(data)
+        ref = (self._size, len(data))
+        self._size += len(data)
+        return ref
+
+    def cards(self, refs: Iterable[Tuple[int, int]]) -> Iterator[str]:
+        for offset, length in refs:
+            self._file.seek(offset)
+            yield self._file.read(length).decode('utf-8')
+
+    def close(self):
+        self._file.close()
+
+class _Group:
+    """Cards and statistics of one grouped report"""
+
+    def __init__(self):
+        self.stats = ReportStats()
+        self.refs: List[Tuple[int, int]] = []
+
+def write_index(output_dir: str, groups: Dict[str, Dict[str, _Group]],
+                filenames: Dict[Tuple[str, str], str], timestamp: str,
+                stylesheet: Optional[str]):
+    """Write index.html linking every grouped report with its article count"""
+    sections = []
+    for grouping, by_group in groups.items():
+        label = GROUPINGS[grouping][0]
+        items = ''.join(
+            f'<span class="keyword-tag"><a href="{html.escape(filenames[grouping, group])}">'
+            f'{html.escape(group)}</a> ({group_data.stats.total_articles})</span>'
+            for group, group_data in sorted(by_group.items(),
+                                            key=lambda item: -item[1].stats.total_articles))
+        sections.append(f"""
+        <div class="news-card">
+            <div class="card-header"><span class="source-badge">按{label}</span></div>
+            <div class="card-body"><div class="keywords">{items}</div></div>
+        </div>""")
+    with open_replacing(os.path.join(output_dir, 'index.html')) as f:
+        f.write(generate_html_header("AI简报分组目录", timestamp, stylesheet))
+        f.write('<div class="news-list">\n<div class="news-grid">\n')
+        f.writelines(sections)
+        f.write('\n</div>\n</div>\n')
+        f.write(generate_html_footer())
+
+def write_grouped_reports(articles: Iterable[Dict], output_dir: str,
+                          groupings: Iterable[str] = tuple(GROUPINGS),
+                          inline_css: bool = False) -> Dict[str, int]:
+    """
+    Write one report per group of every grouping, in one pass
+
+    Each article's card is rendered once and spooled; every report it
+    belongs to copies the same fragment. The shared stylesheet is written
+    once for all reports, and index.html links them.
+
+    Args:
+        articles: Processed articles, consumed lazily
+        output_dir: Directory for the reports
+        groupings: Names from GROUPINGS
+        inline_css: Embed the stylesheet in every report instead of linking it
+
+    Returns:
+        Number of reports written per grouping
+    """
+    groupings = list(groupings)
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y年%m月%d日 %H:%M')
+    stylesheet = None if inline_css else write_stylesheet(os.path.join(output_dir, 'index.html'))
+
+    groups: Dict[str, Dict[str, _Group]] = {grouping: {} for grouping in groupings}
+    store = CardStore()
+    try:
+        total = ReportStats()
+        articles = iter(articles)
+        batch = list(islice(articles, CARD_BATCH))
+        while batch:
+            for article, card in zip(batch, render_cards(batch, total)):
+                ref = store.add(card)
+                for grouping in groupings:
+                    for group in dict.fromkeys(GROUPINGS[grouping][1](article)):
+                        entry = groups[grouping].setdefault(group, _Group())
+                        entry.stats.add(article)
+                        entry.refs.append(ref)
+            batch = list(islice(articles, CARD_BATCH))
+
+        print(f"Rendered {total.total_articles} cards")
+        filenames = {}
+        for grouping, by_group in groups.items():
+            label = GROUPINGS[grouping][0]
+            for group, entry in by_group.items():
+                filename = report_filename(grouping, group)
+                filenames[grouping, group] = filename
+                with open_replacing(os.path.join(output_dir, filename)) as f:
+                    write_report(f, f"今日AI简报 · {label}：{group}", timestamp, entry.stats,
+                                 store.cards(entry.refs), stylesheet=stylesheet)
+        write_index(output_dir, groups, filenames, timestamp, stylesheet)
+    finally:
+        store.close()
+
+    counts = {grouping: len(by_group) for grouping, by_group in groups.items()}
+    print(f"Grouped reports saved to {output_dir}: "
+          + ", ".join(f"{count} by {grouping}" for grouping, count in counts.items()))
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write one HTML report per source, topic and company in a single pass")
+    parser.add_argument('processed_data_file', help="Processed news JSON or NDJSON file")
+    parser.add_argument('output_dir', help="Directory for the grouped reports")
+    parser.add_argument('--by', nargs='+', choices=list(GROUPINGS), default=list(GROUPINGS),
+                        help="Groupings to write (default: all)")
+    parser.add_argument('--inline-css', action='store_true',
+                        help="Embed the stylesheet in every report "
+                             "(default: link the shared assets/report-<hash>.css)")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="Write Prometheus text-format metrics to FILE")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.processed_data_file):
+        print(f"Error: Processed data file not found: {args.processed_data_file}")
+        sys.exit(1)
+
+    metrics = Metrics()
+    with stage(metrics, 'render'):
+        write_grouped_reports(iter_articles(args.processed_data_file), args.output_dir,
+                              args.by, inline_css=args.inline_css)
+    if args.metrics:
+        metrics.write_prometheus(args.metrics)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+AI News Metrics
+Per-stage timing, counters, optional cProfile dumps and a Prometheus
+text-format exporter for pipeline runs
+"""
+
+import cProfile
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+METRIC_PREFIX = 'ai_news'
+
+# Functions listed per stage when a profile is taken
+PROFILE_TOP = 15
+
+def _label_value(value: str) -> str:
+    """Escape a Prometheus label value"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _sample_value(value: float) -> str:
+    """Format a sample value without losing precision (e.g. Unix timestamps)"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Metrics:
+    """
+    Measurements of one pipeline run
+
+    Stages are timed with the stage() context manager. Counters and
+    per-source fetch results are recorded by the stages themselves.
+    With a profile directory, each stage also runs under cProfile and its
+    stats are dumped to <profile_dir>/<stage>.prof.
+    """
+
+    def __init__(self, profile_dir: Optional[str] = None):
+        self.profile_dir = profile_dir
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, float] = {}
+        # source -> {'seconds', 'parse_seconds', 'articles', 'success', 'cached'}
+        self.sources: Dict[str, Dict[str, float]] = {}
+        self.started = time.time()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time (and optionally profile) the enclosed block as stage name"""
+        profiler = None
+        if self.profile_dir:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            if profiler is not None:
+                profiler.disable()
+                self._dump_profile(name, profiler)
+
+    def _dump_profile(self, name: str, profiler: cProfile.Profile):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{name}.prof")
+        profiler.dump_stats(path)
+        print(f"Profile of stage '{name}' saved to: {path}")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(PROFILE_TOP)
+
+    def count(self, point: str, articles: int):
+        """Record the number of articles at a point of the pipeline, e.g. count('processed', 20)"""
+        self.counters[point] = articles
+
+    def observe_source(self, source: str, seconds: float, articles: int, success: bool,
+                       parse_seconds: float = 0.0, cached: bool = False):
+        """Record the outcome of fetching one source"""
+        self.sources[source] = {
+            'seconds': seconds,
+            'parse_seconds': parse_seconds,
+            'articles': articles,
+            'success': 1 if success else 0,
+            'cached': 1 if cached else 0,
+        }
+
+    def summary(self) -> str:
+        """One line of stage timings, in the order the stages ran"""
+        return ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.stages.items())
+
+    def _families(self) -> Iterator[Tuple[str, str, Dict[Tuple[Tuple[str, str], ...], float]]]:
+        per_source = lambda field: {(('source', source),): values[field]
+                                    for source, values in self.sources.items()}
+        yield ('stage_duration_seconds', "Wall time of each pipeline stage",
+               {(('stage', name),): seconds for name, seconds in self.stages.items()})
+        yield ('fetch_duration_seconds', "Time to fetch and parse each source",
+               per_source('seconds'))
+        yield ('fetch_parse_seconds', "Time spent parsing each source's feed",
+               per_source('parse_seconds'))
+        yield ('fetch_articles', "Articles parsed from each source", per_source('articles'))
+        yield ('fetch_success', "Whether each source was fetched (1) or failed (0)",
+               per_source('success'))
+        yield ('fetch_cached', "Whether each source was served from the feed cache "
+               "(unchanged or within its TTL)", per_source('cached'))
+        yield ('articles', "Articles at each point of the pipeline",
+               {(('stage', name),): value for name, value in self.counters.items()})
+        yield ('last_run_timestamp_seconds', "Unix time the run started", {(): self.started})
+
+    def to_prometheus(self) -> str:
+        """Render all measurements in the Prometheus text exposition format"""
+        lines = []
+        for name, help_text, samples in self._families():
+            if not samples:
+                continue
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for labels, value in samples.items():
+                label_text = ','.join(f'{key}="{_label_value(str(val))}"' for key, val in labels)
+                value = _sample_value(value)
+                lines.append(f"{metric}{{{label_text}}} {value}" if label_text
+                             else f"{metric} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str):
+        """
+        Write the metrics file atomically
+
+        The node exporter's textfile collector may read at any moment, so the
+        file is written next to its destination and renamed into place.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+        print(f"Metrics saved to: {path}")
+
+@contextmanager
+def stage(metrics: Optional['Metrics'], name: str) -> Iterator[None]:
+    """metrics.stage(name), or a no-op when metrics is None"""
+    if metrics is None:
+        yield
+    else:
+        with metrics.stage(name):
+            yield
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+AI News Archive
+Time-partitioned on-disk store of raw articles with a sorted publication
+time index, so time-window queries only read the partitions they cover
+"""
+
+import argparse
+import json
+import os
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from article_record import Article, compact
+from news_io import iter_articles, write_articles
+
+INDEX_FILE = 'index.json'
+INDEX_VERSION = 1
+
+def parse_pub_date(pub_date: str) -> Optional[int]:
+    """
+    Parse an RSS (RFC 2822) or Atom (ISO 8601) date into epoch seconds
+
+    Dates without a zone are taken as UTC.
+
+    Returns:
+        Epoch seconds, or None if the date is missing or unparseable
+    """
+    if not pub_date:
+        return None
+    try:
+        parsed = parsedate_to_datetime(pub_date)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        try:
+            parsed = datetime.fromisoformat(pub_date.strip())
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    try:
+        return int(parsed.timestamp())
+    except (OverflowError, OSError):
+        return None
+
+def article_epoch(article: Dict) -> Optional[int]:
+    """Publication time of an article: its archived epoch, else its parsed pubDate"""
+    published = article.get('published')
+    if published is not None:
+        return published
+    return parse_pub_date(article.get('pubDate', ''))
+
+def partition_key(epoch: float) -> str:
+    """Name of the partition holding an epoch: its UTC day, YYYY-MM-DD"""
+    return time.strftime('%Y-%m-%d', time.gmtime(epoch))
+
+class NewsArchive:
+    """
+    Raw articles stored in one NDJSON file per UTC day
+
+    Each partition (<root>/YYYY/MM/YYYY-MM-DD.ndjson) is sorted by
+    publication time and has a binary index next to it (.idx: the sorted
+    epochs followed by the byte offset of each record). index.json lists
+    every partition with its article count and time range, so a query
+    opens only the partitions overlapping its window and seeks straight to
+    the first matching record.
+
+    Dates are parsed once, on ingest, and stored as the 'published' field.
+    Articles without a parseable date are filed under the time their link
+    was first ingested, which index.json remembers, so a later ingest
+    finds them in the same partition. Within a partition an article is
+    identified by its link; ingesting it again replaces the stored copy.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.index: Dict[str, Dict] = {}
+        # link -> first ingest time of every undated article
+        self.undated: Dict[str, int] = {}
+        path = os.path.join(root, INDEX_FILE)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.index = data['partitions']
+                self.undated = data.get('undated', {})
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.root, key[:4], key[5:7], f"{key}.{ext}")
+
+    @staticmethod
+    def _replace(path: str, data: bytes):
+        """Write a file atomically"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _save_index(self):
+        payload = {'version': INDEX_VERSION,
+                   'partitions': dict(sorted(self.index.items())),
+                   'undated': self.undated}
+        self._replace(os.path.join(self.root, INDEX_FILE),
+                      json.dumps(payload, indent=1).encode('utf-8'))
+
+    def _write_partition(self, key: str, records: List[Article]):
+        """Rewrite a partition and its time index from records sorted by time"""
+        lines = []
+        epochs = array('q')
+        offsets = array('q')
+        offset = 0
+        for record in records:
+            line = (json.dumps(record.to_dict(), ensure_ascii=False) + '\n').encode('utf-8')
+            epochs.append(record.published)
+            offsets.append(offset)
+            lines.append(line)
+            offset += len(line)
+        self._replace(self._path(key, 'ndjson'), b''.join(lines))
+        self._replace(self._path(key, 'idx'), epochs.tobytes() + offsets.tobytes())
+        self.index[key] = {'count': len(records), 'first': epochs[0], 'last': epochs[-1]}
+
+    def _read_records(self, key: str, start: int = 0, stop: Optional[int] = None,
+                      offset: int = 0) -> Iterator[Article]:
+        """Read records [start, stop) of a partition, starting at record start's byte offset"""
+        stop = self.index[key]['count'] if stop is None else stop
+        if start >= stop:
+            return
+        with open(self._path(key, 'ndjson'), 'rb') as f:
+            f.seek(offset)
+            for _ in range(stop - start):
+                yield Article(**json.loads(f.readline()))
+
+    def _read_index(self, key: str) -> Tuple[array, array]:
+        """(epochs, offsets) of a partition's records"""
+        values = array('q')
+        with open(self._path(key, 'idx'), 'rb') as f:
+            values.frombytes(f.read())
+        count = len(values) // 2
+        return values[:count], values[count:]
+
+    def ingest(self, articles: Iterable[Dict], now: Optional[float] = None) -> int:
+        """
+        Add raw articles to the archive
+
+        Args:
+            articles: Raw article dicts or records
+            now: Ingest time used for undated articles seen for the first time
+                (default: the current time)
+
+        Returns:
+            Number of articles that were not archived before
+        """
+        now = int(now if now is not None else time.time())
+        incoming: Dict[str, Dict[str, Article]] = {}
+        for article in compact(articles):
+            epoch = article_epoch(article)
+            if epoch is None:
+                epoch = self.undated.setdefault(article.get('link', ''), now)
+            record = Article(**dict(article.to_dict(), published=epoch))
+            incoming.setdefault(partition_key(epoch), {})[record.get('link', '')] = record
+
+        added = 0
+        for key, records in incoming.items():
+            stored = {}
+            if key in self.index:
+                stored = {record.get('link', ''): record for record in self._read_records(key)}
+            added += sum(1 for link in records if link not in stored)
+            stored.update(records)
+            self._write_partition(key, sorted(stored.values(),
+                                              key=lambda r: (r.published, r.get('link', ''))))
+        if incoming:
+            self._save_index()
+        return added
+
+    def query(self, since: Optional[float] = None,
+              until: Optional[float] = None) -> Iterator[Article]:
+        """
+        Stream archived articles published in [since, until), oldest first
+
+        Only partitions overlapping the window are opened; in a partition
+        that is partly outside it, the time index locates the first and
+        last matching records.
+
+        Args:
+            since: Window start, epoch seconds (default: unbounded)
+            until: Window end, epoch seconds, exclusive (default: unbounded)
+
+        Yields:
+            Article records, each with its 'published' epoch
+        """
+        low = partition_key(since) if since is not None else ''
+        high = partition_key(until) if until is not None else '~'
+        for key in sorted(k for k in self.index if low <= k <= high):
+            entry = self.index[key]
+            if ((since is None or entry['first'] >= since)
+                    and (until is None or entry['last'] < until)):
+                yield from self._read_records(key)
+                continue
+            epochs, offsets = self._read_index(key)
+            start = bisect_left(epochs, since) if since is not None else 0
+            stop = bisect_left(epochs, until) if until is not None else len(epochs)
+            if start < stop:
+                yield from self._read_records(key, start, stop, offsets[start])
+
+    def recent(self, hours: float, now: Optional[float] = None) -> Iterator[Article]:
+        """Stream articles published in the last hours, oldest first"""
+        now = now if now is not None else time.time()
+        return self.query(since=now - hours * 3600)
+
+    def stats(self) -> Dict:
+        """Partition count, article count and the archived time range"""
+        entries = self.index.values()
+        return {
+            'partitions': len(self.index),
+            'articles': sum(entry['count'] for entry in entries),
+            'first': min((entry['first'] for entry in entries), default=None),
+            'last': max((entry['last'] for entry in entries), default=None),
+        }
+
+def _parse_time(value: str) -> int:
+    """argparse type: an ISO 8601 date/time (UTC unless it has a zone) as epoch seconds"""
+    epoch = parse_pub_date(value)
+    if epoch is None:
+        raise argparse.ArgumentTypeError(f"not an ISO 8601 date: {value}")
+    return epoch
+
+def _format_epoch(epoch: Optional[int]) -> str:
+    if epoch is None:
+        return '-'
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-partitioned AI news archive")
+    parser.add_argument('archive', help="Archive directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help="Add raw news JSON/NDJSON files to the archive")
+    ingest.add_argument('files', nargs='+', help="Raw news files (e.g. raw_data/news_raw_*.json)")
+
+    query = commands.add_parser('query', help="Export the articles of a time window")
+    query.add_argument('--hours', type=float, help="Articles of the last N hours")
+    query.add_argument('--since', type=_parse_time, help="Window start (ISO 8601)")
+    query.add_argument('--until', type=_parse_time, help="Window end, exclusive (ISO 8601)")
+    query.add_argument('--output', '-o', metavar='FILE',
+                       help="Write the articles as JSON or NDJSON (default: print a count)")
+
+    commands.add_parser('stats', help="Show partition and article counts")
+    args = parser.parse_args()
+
+    archive = NewsArchive(args.archive)
+    if args.command == 'ingest':
+        for path in args.files:
+            try:
+                added = archive.ingest(iter_articles(path))
+            except (OSError, ValueError) as e:
+                print(f"Skipping {path}: {e}")
+                continue
+            print(f"{path}: {added} new articles")
+    elif args.command == 'query':
+        since = args.since
+        if args.hours is not None:
+            since = time.time() - args.hours * 3600
+        articles = archive.query(since, args.until)
+        if args.output:
+            count = write_articles(args.output, articles)
+            print(f"{count} articles saved to: {args.output}")
+        else:
+            print(f"{sum(1 for _ in articles)} articles")
+    else:
+        stats = archive.stats()
+        print(f"Partitions: {stats['partitions']}")
+        print(f"Articles: {stats['articles']}")
+        print(f"Range: {_format_epoch(stats['first'])} - {_format_epoch(stats['last'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+AI News Capture Format
+Compact raw captures: articles compressed in blocks with an offset and
+publication time index, readable one article or one time range at a time
+"""
+
+import argparse
+import bz2
+import json
+import lzma
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from article_record import Article
+from news_archive import article_epoch, parse_pub_date
+
+CAPTURE_EXT = '.capture'
+
+# File layout (integers little-endian):
+#   header   MAGIC, codec id (u8), 3 pad bytes, records per block (u32)
+#   blocks   each a compressed run of NDJSON lines
+#   index    block offsets (n_blocks + 1 int64, the last one is the end of
+#            the blocks), then one publication epoch per record (int64,
+#            NO_DATE if unknown); 8-byte aligned
+#   trailer  index offset, record count, block count (u64 each), MAGIC
+MAGIC = b'AINEWS\x00\x01'
+HEADER = struct.Struct('<8sB3xI')
+TRAILER = struct.Struct('<QQQ8s')
+NO_DATE = -(1 << 63)
+
+DEFAULT_BLOCK_RECORDS = 64
+
+# name -> (id, compress, decompress)
+CODECS: Dict[str, Tuple[int, Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    'zlib': (1, lambda data: zlib.compress(data, 9), zlib.decompress),
+    'bz2': (2, lambda data: bz2.compress(data, 9), bz2.decompress),
+    'lzma': (3, lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+_CODEC_IDS = {codec_id: name for name, (codec_id, _, _) in CODECS.items()}
+
+# Start of a record in the legacy pretty-printed dumps
+_LEGACY_RECORD_RE = re.compile(r'^  \{$', re.M)
+_decoder = json.JSONDecoder(strict=False)
+
+def is_capture(path: str) -> bool:
+    """Check whether a file is a capture, by its magic bytes"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+def _int64_bytes(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values = array('q', values)
+        values.byteswap()
+    return values.tobytes()
+
+def _int64_view(buffer: memoryview):
+    """Read-only int64 sequence over a little-endian buffer, without copying when possible"""
+    if sys.byteorder == 'little':
+        return buffer.cast('q')
+    values = array('q', bytes(buffer))
+    values.byteswap()
+    return values
+
+def write_capture(path: str, articles: Iterable[Dict], codec: str = 'zlib',
+                  block_records: int = DEFAULT_BLOCK_RECORDS) -> int:
+    """
+    Write articles as a capture, streaming one block at a time
+
+    The file is written next to its destination and renamed into place.
+
+    Args:
+        path: Output file path
+        articles: Article dicts or records, in the order to keep
+        codec: Block compression, one of CODECS
+        block_records: Articles per compressed block; smaller blocks make
+            single-article reads cheaper and compression weaker
+
+    Returns:
+        Number of articles written
+
+    Raises:
+        ValueError: If block_records is less than 1
+    """
+    if block_records < 1:
+        raise ValueError(f"block_records must be at least 1, got {block_records}")
+    codec_id, compress, _ = CODECS[codec]
+    offsets = array('q')
+    epochs = array('q')
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, codec_id, block_records))
+
+        def flush(lines: List[bytes]):
+            offsets.append(f.tell())
+            f.write(compress(b'\n'.join(lines)))
+
+        lines = []
+        for article in articles:
+            if not isinstance(article, dict):
+                article = article.to_dict()
+            lines.append(json.dumps(article, ensure_ascii=False,
+                                    separators=(',', ':')).encode('utf-8'))
+            epoch = article_epoch(article)
+            epochs.append(NO_DATE if epoch is None else epoch)
+            if len(lines) == block_records:
+                flush(lines)
+                lines = []
+        if lines:
+            flush(lines)
+        offsets.append(f.tell())
+
+        f.write(b'\0' * (-f.tell() % 8))
+        index_offset = f.tell()
+        f.write(_int64_bytes(offsets))
+        f.write(_int64_bytes(epochs))
+        f.write(TRAILER.pack(index_offset, len(epochs), len(offsets) - 1, MAGIC))
+    os.replace(tmp_path, path)
+    return len(epochs)
+
+class CaptureReader:
+    """
+    Random access to a capture through a memory map
+
+    Only the index is read on open. An article is decoded by decompressing
+    its block alone, and a time range by decompressing only the blocks
+    holding matching articles; the last decoded block is kept.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            self._file.close()
+            raise ValueError(f"Not a news capture: {path}")
+        try:
+            magic, codec_id, self.block_records = HEADER.unpack_from(self._map, 0)
+            index_offset, self._count, blocks, end_magic = TRAILER.unpack_from(
+                self._map, len(self._map) - TRAILER.size)
+            if magic != MAGIC or end_magic != MAGIC or codec_id not in _CODEC_IDS \
+                    or self.block_records < 1:
+                raise ValueError(f"Not a news capture: {path}")
+        except (struct.error, ValueError):
+            self._map.close()
+            self._file.close()
+            raise ValueError(f"Not a news capture: {path}")
+
+        self.codec = _CODEC_IDS[codec_id]
+        self._decompress = CODECS[self.codec][2]
+        view = memoryview(self._map)
+        self._views = [view]
+        epochs_offset = index_offset + 8 * (blocks + 1)
+        self._offsets = _int64_view(view[index_offset:epochs_offset])
+        self._epochs = _int64_view(view[epochs_offset:epochs_offset + 8 * self._count])
+        self._views += [self._offsets, self._epochs]
+        self._cached: Tuple[int, List[bytes]] = (-1, [])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _block(self, block: int) -> List[bytes]:
+        if self._cached[0] != block:
+            data = self._map[self._offsets[block]:self._offsets[block + 1]]
+            self._cached = (block, self._decompress(data).split(b'\n'))
+        return self._cached[1]
+
+    def __getitem__(self, index: int) -> Article:
+        """Decode one article by its position in the capture"""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        block, position = divmod(index, self.block_records)
+        return Article(**json.loads(self._block(block)[position]))
+
+    def __iter__(self) -> Iterator[Article]:
+        for index in range(self._count):
+            yield self[index]
+
+    def epoch(self, index: int) -> Optional[int]:
+        """Publication epoch of an article, from the index (None if undated)"""
+        epoch = self._epochs[index]
+        return None if epoch == NO_DATE else epoch
+
+    def between(self, since: Optional[float] = None,
+                until: Optional[float] = None) -> Iterator[Article]:
+        """
+        Decode the articles published in [since, until), in capture order
+
+        Matching articles are found from the index; undated articles never
+        match a bounded range.
+        """
+        low = NO_DATE + 1 if since is None else since
+        high = None if until is None else until
+        for index, epoch in enumerate(self._epochs):
+            if epoch != NO_DATE and epoch >= low and (high is None or epoch < high):
+                yield self[index]
+
+    def close(self):
+        self._cached = (-1, [])
+        for view in reversed(self._views):
+            if isinstance(view, memoryview):
+                view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'CaptureReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_capture(path: str) -> Iterator[Article]:
+    """Stream every article of a capture"""
+    with CaptureReader(path) as reader:
+        yield from reader
+
+def iter_legacy_dump(path: str) -> Iterator[Dict]:
+    """
+    Salvage the records of a pretty-printed raw dump that is not valid JSON
+
+    The old fetch script wrote records without separating commas and with
+    raw feed XML in string values. Each record is decoded on its own;
+    records that cannot be decoded are skipped with a warning.
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    skipped = 0
+    for match in _LEGACY_RECORD_RE.finditer(text):
+        try:
+            record, _ = _decoder.raw_decode(text, match.start() + 2)
+        except json.JSONDecodeError:
+            skipped += 1
+            continue
+        if isinstance(record, dict):
+            yield record
+    if skipped:
+        print(f"Warning: Skipped {skipped} undecodable records in {path}")
+
+def read_raw(path: str) -> List[Dict]:
+    """Read a raw JSON/NDJSON file or capture, salvaging legacy dumps if needed"""
+    from news_io import load_articles
+    try:
+        return load_articles(path)
+    except json.JSONDecodeError:
+        return list(iter_legacy_dump(path))
+
+def _parse_time(value: str) -> int:
+    epoch = parse_pub_date(value)
+    if epoch is None:
+        raise argparse.ArgumentTypeError(f"not an ISO 8601 date: {value}")
+    return epoch
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+    return number
+
+def main():
+    from news_io import write_articles
+
+    parser = argparse.ArgumentParser(description="Compressed random-access news captures")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert = commands.add_parser('convert',
+                                  help="Convert raw JSON/NDJSON dumps (the originals are kept)")
+    convert.add_argument('files', nargs='+', help="Raw news files, e.g. raw_data/news_raw_*.json")
+    convert.add_argument('--output-dir', '-d', metavar='DIR',
+                         help="Directory for the captures (default: next to each file)")
+    convert.add_argument('--codec', choices=sorted(CODECS), default='zlib',
+                         help="Block compression (default: zlib)")
+    convert.add_argument('--block-records', type=_positive_int, default=DEFAULT_BLOCK_RECORDS,
+                         help=f"Articles per block (default: {DEFAULT_BLOCK_RECORDS})")
+
+    info = commands.add_parser('info', help="Show a capture's size, codec and date range")
+    info.add_argument('capture')
+
+    get = commands.add_parser('get', help="Print one article as JSON")
+    get.add_argument('capture')
+    get.add_argument('index', type=int, help="Article position (negative counts from the end)")
+
+    export = commands.add_parser('export', help="Export a capture, or a time range of it")
+    export.add_argument('capture')
+    export.add_argument('output_file', help="JSON or NDJSON file to write")
+    export.add_argument('--hours', type=float, help="Only articles of the last N hours")
+    export.add_argument('--since', type=_parse_time, help="Range start (ISO 8601)")
+    export.add_argument('--until', type=_parse_time, help="Range end, exclusive (ISO 8601)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'convert':
+            for path in args.files:
+                stem = os.path.splitext(os.path.basename(path))[0]
+                directory = args.output_dir or os.path.dirname(path)
+                output = os.path.join(directory, stem + CAPTURE_EXT)
+                count = write_capture(output, read_raw(path), args.codec, args.block_records)
+                before, after = os.path.getsize(path), os.path.getsize(output)
+                print(f"{path} -> {output}: {count} articles, "
+                      f"{before / 1024:.0f}KB -> {after / 1024:.0f}KB")
+        elif args.command == 'info':
+            with CaptureReader(args.capture) as reader:
+                epochs = [e for e in map(reader.epoch, range(len(reader))) if e is not None]
+                print(f"Articles: {len(reader)} ({len(reader) - len(epochs)} undated)")
+                print(f"Codec: {reader.codec}, {reader.block_records} articles per block")
+                print(f"Size: {os.path.getsize(args.capture) / 1024:.0f}KB")
+                if epochs:
+                    print(f"Range: {time.strftime('%Y-%m-%d %H:%M', time.gmtime(min(epochs)))} - "
+                          f"{time.strftime('%Y-%m-%d %H:%M', time.gmtime(max(epochs)))} UTC")
+        elif args.command == 'get':
+            with CaptureReader(args.capture) as reader:
+                print(json.dumps(reader[args.index].to_dict(), ensure_ascii=False, indent=2))
+        else:
+            since = args.since
+            if args.hours is not None:
+                since = time.time() - args.hours * 3600
+            with CaptureReader(args.capture) as reader:
+                articles = (reader if since is None and args.until is None
+                            else reader.between(since, args.until))
+                count = write_articles(args.output_file, articles)
+            print(f"{count} articles saved to: {args.output_file}")
+    except (OSError, ValueError, IndexError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+AI News Daemon
+Keeps a report up to date: polls every source on its own interval and,
+when new articles arrive, processes only those and re-renders only their
+cards
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from async_http import ConnectionPool
+from batch_tagger import get_tagger
+from fetch_news import (
+    SOURCES, add_feed_cache_arguments, close_feed_cache, fetch_logged, open_feed_cache
+)
+from filter_news import filter_news
+from generate_html import render_report
+from metrics import Metrics
+from news_archive import NewsArchive, article_epoch
+from pipeline_state import PipelineState, fingerprint
+from process_news import close_cache, positive_int, process_stream
+from ranking import load_source_weights
+from search_index import SearchIndex
+from summary_backend import add_backend_arguments, close_backend, open_backend
+from summary_cache import DEFAULT_MAX_BYTES, SummaryCache
+from term_matcher import get_lexicon, get_matcher, reload_lexicon
+
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_INTERVAL = 300.0
+
+# Seconds between checks of the lexicon file for edits
+LEXICON_POLL = 5.0
+
+# A failing source is retried after interval * 2**failures, up to this factor
+MAX_BACKOFF = 8
+
+def load_polled_sources(path: Optional[str], interval: float) -> List[Tuple[str, str, float]]:
+    """
+    Load (name, url, interval) sources
+
+    Entries of the sources file may set their own "interval" in seconds;
+    the rest, and the built-in sources, use the default interval. A
+    "weight" entry is read by ranking.load_source_weights.
+    """
+    if not path:
+        return [(name, url, interval) for name, url in SOURCES]
+    with open(path, 'r', encoding='utf-8') as f:
+        return [(source['name'], source['url'], float(source.get('interval', interval)))
+                for source in json.load(f)]
+
+class NewsDaemon:
+    """
+    Long-running report updater
+
+    Raw articles of the last --hours are kept in memory together with the
+    processed record of every article in the report, so an update only
+    summarizes articles that are new or changed and the pipeline state
+    supplies the cards of the rest. Term tables are compiled once and
+    recompiled only when the lexicon file is edited, which reprocesses the
+    report without a restart.
+    """
+
+    def __init__(self, args, metrics: Metrics):
+        self.args = args
+        self.metrics = metrics
+        self.state = PipelineState(args.state)
+        self.archive = NewsArchive(args.archive) if args.archive else None
+        self.weights = load_source_weights(args.sources) if args.sources else None
+        self.search_index = SearchIndex(args.search_index) if args.search_index else None
+        self.feed_cache = open_feed_cache(args)
+        self.backend = open_backend(args)
+        self.cache = None
+        if args.cache:
+            self.cache = SummaryCache(args.cache, args.cache_max_mb * 1024 * 1024,
+                                      self.backend.name if self.backend else None)
+
+        # link -> raw article, fingerprint, time first seen
+        self.window: Dict[str, Dict] = {}
+        self.seen: Dict[str, Tuple[str, float]] = {}
+        # link -> (raw fingerprint, processed record) of reported articles
+        self.processed: Dict[str, Tuple[str, Dict]] = {}
+        self.report_key: Optional[List[Tuple[str, str]]] = None
+
+        # link -> article waiting for the next update
+        self.pending: Dict[str, Dict] = {}
+        self.updates = 0
+        # Set when the lexicon changed and every reported article needs redoing
+        self._relabel = False
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+
+        get_matcher()
+        get_tagger()
+
+    def stop(self):
+        self._stopping.set()
+        self._wakeup.set()
+
+    def accept(self, articles: List[Dict]) -> int:
+        """
+        Queue the articles that are new or changed since they were last seen
+
+        Articles already older than the report window are ignored.
+
+        Returns:
+            Number of articles queued
+        """
+        cutoff = time.time() - self.args.hours * 3600
+        fresh = 0
+        for article in articles:
+            epoch = article_epoch(article)
+            if epoch is not None and epoch < cutoff:
+                continue
+            link = article.get('link', '')
+            queued = self.pending.get(link)
+            known = fingerprint(queued) if queued else self.seen.get(link, (None,))[0]
+            if fingerprint(article) != known:
+                self.pending[link] = article
+                fresh += 1
+        if fresh:
+            self._wakeup.set()
+        return fresh
+
+    def seed(self):
+        """Start from the archive's window so a restart keeps the report complete"""
+        if self.archive is not None:
+            self.accept(list(self.archive.recent(self.args.hours)))
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleep unless stopped first; returns False once stopping"""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), seconds)
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    async def poll(self, pool: ConnectionPool, name: str, url: str, interval: float):
+        """Fetch one source every interval seconds, backing off while it fails"""
+        failures = 0
+        while not self._stopping.is_set():
+            try:
+                articles = await fetch_logged(pool, name, url, self.args.timeout, self.metrics,
+                                              self.feed_cache)
+                fresh = self.accept(articles) if articles is not None else 0
+            except Exception as e:
+                print(f"⚠️  Polling {name} failed: {e!r}")
+                articles = None
+            if articles is None:
+                failures += 1
+            else:
+                failures = 0
+                if fresh:
+                    print(f"{name}: {fresh} new or changed articles")
+            delay = interval * min(2 ** failures, MAX_BACKOFF)
+            if not await self._sleep(delay):
+                return
+
+    async def updater(self):
+        """Apply queued articles to the report, coalescing bursts"""
+        while not self._stopping.is_set():
+            await self._wakeup.wait()
+            # Sources polled at the same moment land in one update
+            if not await self._sleep(self.args.debounce):
+                return
+            self._wakeup.clear()
+            if self.pending or self._relabel:
+                batch, self.pending = list(self.pending.values()), {}
+                self._relabel = False
+                try:
+                    self.update(batch)
+                except Exception as e:
+                    print(f"⚠️  [{datetime.now():%H:%M:%S}] Update failed, retrying with the "
+                          f"next arrivals: {e!r}")
+                    # Requeue the batch (archiving is idempotent) and re-render next time
+                    for article in batch:
+                        self.pending.setdefault(article.get('link', ''), article)
+                    self.report_key = None
+                    continue
+                if self.args.updates and self.updates >= self.args.updates:
+                    self.stop()
+
+    async def watch_lexicon(self, interval: float):
+        """Pick up lexicon edits, then re-filter and reprocess the whole report"""
+        while await self._sleep(interval):
+            try:
+                changed = reload_lexicon()
+            except Exception as e:
+                print(f"⚠️  Reloading the lexicon failed: {e!r}")
+                continue
+            if not changed:
+                continue
+            print(f"[{datetime.now():%H:%M:%S}] Lexicon changed (version {get_lexicon().version}), "
+                  f"reprocessing the report")
+            try:
+                if self.cache is not None:
+                    self.cache.refresh()
+                # Rebuild the tagger's term actions now rather than inside the update
+                get_tagger()
+            except Exception as e:
+                print(f"⚠️  Switching to the new lexicon failed: {e!r}")
+            self.processed = {}
+            self.report_key = None
+            self._relabel = True
+            self._wakeup.set()
+
+    def _prune(self, now: float):
+        cutoff = now - self.args.hours * 3600
+        for link, article in list(self.window.items()):
+            epoch = article_epoch(article)
+            if (epoch if epoch is not None else self.seen[link][1]) < cutoff:
+                del self.window[link]
+                del self.seen[link]
+
+    def update(self, batch: List[Dict]):
+        """
+        Add a batch of new or changed raw articles and refresh the report
+
+        Only articles of the report that are new or changed are processed;
+        unchanged cards are reused from the pipeline state.
+        """
+        args = self.args
+        started = time.perf_counter()
+        now = time.time()
+        if self.archive is not None:
+            # Articles read back from the archive already carry 'published'
+            fetched = [article for article in batch if article.get('published') is None]
+            with self.metrics.stage('archive'):
+                self.archive.ingest(fetched)
+
+        for article in batch:
+            link = article.get('link', '')
+            first_seen = self.seen.get(link, (None, now))[1]
+            self.window[link] = article
+            self.seen[link] = (fingerprint(article), first_seen)
+        self._prune(now)
+
+        with self.metrics.stage('filter'):
+            selected = filter_news(self.window.values(), hours=args.hours,
+                                   limit=args.limit, weights=self.weights)
+        report_key = [(a['link'], self.seen[a['link']][0]) for a in selected]
+
+        stale = [a for a, (link, fp) in zip(selected, report_key)
+                 if self.processed.get(link, (None,))[0] != fp]
+        with self.metrics.stage('process'):
+            fresh = list(process_stream(stale, datetime.now().isoformat(),
+                                        chunk_size=args.chunk_size, cache=self.cache,
+                                        backend=self.backend))
+            for article, result in zip(stale, fresh):
+                self.processed[article['link']] = (self.seen[article['link']][0], result)
+        if self.search_index is not None and fresh:
+            with self.metrics.stage('index'):
+                self.search_index.add(fresh)
+        self.processed = {link: self.processed[link] for link, _ in report_key}
+
+        if report_key == self.report_key:
+            print(f"[{datetime.now():%H:%M:%S}] {len(batch)} new articles, report unchanged")
+            return
+        with self.metrics.stage('render'):
+            stats = render_report((self.processed[link][1] for link, _ in report_key),
+                                  args.output_file, self.state, args.page_size, args.inline_css)
+        self.report_key = report_key
+        self.updates += 1
+
+        self.metrics.count('window', len(self.window))
+        self.metrics.count('processed', len(stale))
+        self.metrics.count('rendered', stats.total_articles)
+        if args.metrics:
+            self.metrics.write_prometheus(args.metrics)
+        print(f"[{datetime.now():%H:%M:%S}] {len(batch)} new articles: {len(stale)} processed, "
+              f"{stats.rendered} cards rendered, {stats.total_articles} in report "
+              f"({time.perf_counter() - started:.2f}s)")
+
+    async def run(self, sources: List[Tuple[str, str, float]]):
+        pool = ConnectionPool(per_host=self.args.per_host)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.stop)
+        self.seed()
+        try:
+            watchers = [self.watch_lexicon(self.args.lexicon_poll)] \
+                if self.args.lexicon_poll else []
+            await asyncio.gather(self.updater(), *watchers,
+                                 *(self.poll(pool, name, url, interval)
+                                   for name, url, interval in sources))
+        finally:
+            pool.close()
+            close_cache(self.cache, report=False)
+            close_backend(self.backend)
+            close_feed_cache(self.feed_cache)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Poll news sources continuously and keep an HTML report up to date")
+    parser.add_argument('output_file', nargs='?',
+                        default=os.path.join(SKILL_DIR, 'output', 'ai_news_live.html'),
+                        help="Report to keep updated (default: output/ai_news_live.html)")
+    parser.add_argument('--sources', metavar='FILE',
+                        help="JSON list of {\"name\", \"url\", \"interval\", \"weight\"} sources "
+                             "(default: built-in list)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help="Default seconds between polls of a source (default: 300)")
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help="Per-source timeout in seconds (default: 30)")
+    add_feed_cache_arguments(parser)
+    parser.add_argument('--per-host', type=int, default=2,
+                        help="Maximum concurrent connections per host (default: 2)")
+    parser.add_argument('--hours', type=int, default=24,
+                        help="Report on articles from the last N hours (default: 24)")
+    parser.add_argument('--limit', type=int, default=20,
+                        help="Maximum number of articles in the report (default: 20)")
+    parser.add_argument('--debounce', type=float, default=2.0,
+                        help="Seconds to gather arrivals into one update (default: 2)")
+    parser.add_argument('--chunk-size', type=positive_int, default=256,
+                        help="Articles per processing batch (default: 256)")
+    parser.add_argument('--cache', metavar='PATH',
+                        help="SQLite summary cache to reuse results across runs")
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Evict least recently used cache entries above this size (default: 64)")
+    add_backend_arguments(parser)
+    parser.add_argument('--state', metavar='PATH',
+                        default=os.path.join(SKILL_DIR, 'cache', 'daemon_state.json'),
+                        help="Pipeline state file holding rendered cards "
+                             "(default: cache/daemon_state.json)")
+    parser.add_argument('--archive', metavar='DIR',
+                        help="Archive fetched articles here, and start from its last --hours")
+    parser.add_argument('--search-index', metavar='DIR',
+                        help="Add processed articles to this keyword search index")
+    parser.add_argument('--page-size', type=int, default=0,
+                        help="Cards per page; write lazily loaded page shards (default: single file)")
+    parser.add_argument('--inline-css', action='store_true',
+                        help="Embed the stylesheet for a self-contained file")
+    parser.add_argument('--lexicon-poll', type=float, default=LEXICON_POLL,
+                        help=f"Seconds between checks of the lexicon file for edits; "
+                             f"0 disables reloading (default: {LEXICON_POLL:g})")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="Rewrite Prometheus text-format metrics to FILE after every update")
+    parser.add_argument('--updates', type=int, default=0,
+                        help="Exit after this many report updates (default: run until stopped)")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output_file)), exist_ok=True)
+    sources = load_polled_sources(args.sources, args.interval)
+    print(f"Watching {len(sources)} sources; report: {args.output_file}")
+    daemon = NewsDaemon(args, Metrics())
+    asyncio.run(daemon.run(sources))
+    print(f"Stopped after {daemon.updates} report updates")
+
+if __name__ == "__main__":
+    main()
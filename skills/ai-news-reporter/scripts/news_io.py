@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+AI News Streaming I/O
+Incremental readers and writers for JSON-array and NDJSON article files
+"""
+
+import json
+from typing import Dict, Iterable, Iterator, TextIO
+
+CHUNK_SIZE = 64 * 1024
+
+# The fetch script writes raw newlines inside strings, so decode leniently
+_decoder = json.JSONDecoder(strict=False)
+
+def is_ndjson_path(path: str) -> bool:
+    """Check whether a path names an NDJSON file by its extension"""
+    return path.endswith(('.ndjson', '.jsonl'))
+
+def _iter_json_array(f: TextIO, buf: str) -> Iterator[Dict]:
+    """Decode the elements of a JSON array one at a time from a text stream"""
+    pos = 1  # skip '['
+    eof = False
+    while True:
+        # Skip separators between elements
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            chunk = f.read(CHUNK_SIZE)
+            buf, pos, eof = chunk, 0, not chunk
+
+        if pos >= len(buf) or buf[pos] == ']':
+            return
+
+        try:
+            item, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = f.read(CHUNK_SIZE)
+            buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+            continue
+
+        yield item
+        pos = end
+
+def iter_articles(path: str) -> Iterator[Dict]:
+    """
+    Stream articles from a JSON array, NDJSON file or compressed capture
+
+    The format is sniffed from the file's first bytes, so every layout works
+    regardless of the file extension.
+
+    Args:
+        path: Path to the input file
+
+    Yields:
+        One article dict (or, from a capture, compact record) at a time
+    """
+    # Imported here: news_capture builds on this module
+    from news_capture import is_capture, iter_capture
+    if is_capture(path):
+        yield from iter_capture(path)
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ''
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            buf += chunk
+            if buf.strip() or not chunk:
+                break
+        buf = buf.lstrip()
+
+        if buf.startswith('['):
+            yield from _iter_json_array(f, buf)
+            return
+
+        # NDJSON: one object per line
+        lines = buf.splitlines(keepends=True)
+        tail = lines.pop() if lines and not lines[-1].endswith('\n') else ''
+        for line in lines:
+            if line.strip():
+                yield _decoder.decode(line)
+        for line in f:
+            line = tail + line
+            tail = ''
+            if line.strip():
+                yield _decoder.decode(line)
+        if tail.strip():
+            yield _decoder.decode(tail)
+
+def load_articles(path: str) -> list:
+    """Read every article from a JSON array or NDJSON file into a list"""
+    return list(iter_articles(path))
+
+def write_articles(path: str, articles: Iterable[Dict]) -> int:
+    """
+    Write articles as they are produced
+
+    NDJSON paths get one compact object per line, .capture paths a
+    compressed capture (see news_capture.py); any other path gets a JSON
+    array laid out exactly like json.dump(..., indent=2).
+
+    Args:
+        path: Output file path
+        articles: Iterable of article dicts (or compact records with
+            to_dict()), consumed lazily
+
+    Returns:
+        Number of articles written
+    """
+    from news_capture import CAPTURE_EXT, write_capture
+    if path.endswith(CAPTURE_EXT):
+        return write_capture(path, articles)
+
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        articles = (article if isinstance(article, dict) else article.to_dict()
+                    for article in articles)
+        if is_ndjson_path(path):
+            for article in articles:
+                f.write(json.dumps(article, ensure_ascii=False))
+                f.write('\n')
+                count += 1
+            return count
+
+        f.write('[')
+        for article in articles:
+            f.write(',\n  ' if count else '\n  ')
+            f.write(json.dumps(article, ensure_ascii=False, indent=2).replace('\n', '\n  '))
+            count += 1
+        f.write('\n]' if count else ']')
+    return count
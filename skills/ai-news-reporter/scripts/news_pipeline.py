@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+AI News Pipeline
+Runs fetch, filter, process and render in one interpreter, handing articles
+from stage to stage in memory
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fetch_news import (
+    SOURCES, add_feed_cache_arguments, close_feed_cache, fetch_all, load_sources, open_feed_cache
+)
+from filter_news import filter_news
+from generate_html import ReportStats, render_report
+from grouped_reports import write_grouped_reports
+from metrics import Metrics
+from article_record import load_records
+from news_io import write_articles
+from news_archive import NewsArchive
+from pipeline_state import PipelineState
+from process_news import (
+    close_cache, load_previous, merge_incremental, non_negative_int, positive_int,
+    process_stream, select_changed
+)
+from ranking import load_source_weights
+from search_index import SearchIndex, write_search_page
+from summary_backend import add_backend_arguments, close_backend, open_backend
+from summary_cache import DEFAULT_MAX_BYTES, SummaryCache
+
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_DATA = os.path.join(SKILL_DIR, 'examples', 'sample_news_data.json')
+
+def collect_articles(args, metrics: Metrics) -> List[Dict]:
+    """
+    Fetch and filter raw articles, or load them from a capture
+
+    With an archive, fetched articles are added to it and the articles of
+    the last --hours are read back from it. Falls back to the bundled
+    sample data when nothing could be fetched.
+    """
+    if args.input:
+        print(f"Loading raw articles from {args.input}...")
+        with metrics.stage('load'):
+            articles = load_records(args.input)
+        metrics.count('fetched', len(articles))
+        return articles
+
+    sources = load_sources(args.sources) if args.sources else SOURCES
+    print(f"Fetching AI news from {len(sources)} sources...")
+    cache = open_feed_cache(args)
+    try:
+        with metrics.stage('fetch'):
+            articles = asyncio.run(fetch_all(sources, per_host=args.per_host,
+                                             timeout=args.timeout, metrics=metrics, cache=cache))
+    finally:
+        close_feed_cache(cache)
+    metrics.count('fetched', len(articles))
+    print(f"Fetched {len(articles)} articles")
+    if args.raw_output:
+        write_articles(args.raw_output, articles)
+        print(f"Raw data saved to: {args.raw_output}")
+
+    if args.archive:
+        archive = NewsArchive(args.archive)
+        with metrics.stage('archive'):
+            added = archive.ingest(articles)
+            # Articles of earlier runs still inside the window join the
+            # fresh ones
+            articles = list(archive.recent(args.hours))
+        print(f"Archived {added} new articles; {len(articles)} from the last {args.hours}h")
+
+    if not articles:
+        print("⚠️  未能获取到新闻数据，使用示例数据...")
+        return load_records(SAMPLE_DATA)
+
+    print("Filtering for recent AI-related news...")
+    with metrics.stage('filter'):
+        weights = load_source_weights(args.sources) if args.sources else None
+        articles = filter_news(articles, hours=args.hours, limit=args.limit, weights=weights)
+    metrics.count('filtered', len(articles))
+    print(f"Filtered to {len(articles)} unique AI-related articles")
+    return articles
+
+def process_articles(raw: List[Dict], args, state: Optional[PipelineState]) -> List[Dict]:
+    """
+    Summarize raw articles in memory
+
+    With a pipeline state and a processed output file, only new or changed
+    articles are summarized and the rest are taken from the previous run's
+    processed file.
+    """
+    timestamp = datetime.now().isoformat()
+    backend = open_backend(args)
+    cache = None
+    if args.cache:
+        cache = SummaryCache(args.cache, args.cache_max_mb * 1024 * 1024,
+                             backend.name if backend else None)
+
+    incremental = state is not None and args.processed_output
+    articles = raw
+    if incremental:
+        previous = load_previous(state)
+        articles = select_changed(raw, previous, state)
+
+    try:
+        processed = list(process_stream(articles, timestamp, args.workers, args.chunk_size,
+                                        cache, args.cache, args.cache_max_mb * 1024 * 1024,
+                                        backend))
+    finally:
+        close_backend(backend, report=args.workers == 1)
+    if incremental:
+        print(f"Incremental run: {len(processed)} new or changed articles")
+        processed = list(merge_incremental(raw, processed, previous, state))
+
+    close_cache(cache, report=args.workers == 1)
+
+    if args.processed_output:
+        write_articles(args.processed_output, processed)
+        print(f"Processed data saved to: {args.processed_output}")
+        if incremental:
+            state.save_processing(args.processed_output)
+    print(f"Processing complete! {len(processed)} articles processed.")
+    return processed
+
+def print_stats(stats: ReportStats):
+    """Print the report statistics gathered while rendering"""
+    print("📊 报告统计:")
+    print(f"   • 文章数量: {stats.total_articles} 篇")
+    print(f"   • 新闻来源: {len(stats.sources)} 个")
+    print(f"   • 关键词总数: {stats.total_keywords} 个")
+
+def run_pipeline(args, metrics: Metrics) -> ReportStats:
+    """
+    Run every stage of the pipeline
+
+    Args:
+        args: Parsed command line arguments
+        metrics: Receives stage timings, counts and per-source fetch results
+
+    Returns:
+        Statistics of the generated report
+    """
+    state = PipelineState(args.state) if args.state else None
+
+    print("步骤 1: 从新闻源获取最新AI资讯...")
+    raw = collect_articles(args, metrics)
+
+    print("步骤 2: 处理新闻并生成中文摘要...")
+    with metrics.stage('process'):
+        processed = process_articles(raw, args, state)
+    metrics.count('processed', len(processed))
+
+    if args.search_index:
+        with metrics.stage('index'):
+            index = SearchIndex(args.search_index)
+            added = index.add(processed)
+            if args.search_page:
+                write_search_page(index, args.search_page, args.inline_css)
+        print(f"Search index: {added} new or changed articles")
+
+    print("步骤 3: 生成可视化HTML报告...")
+    with metrics.stage('render'):
+        stats = render_report(processed, args.output_file, state, args.page_size,
+                              args.inline_css)
+    metrics.count('rendered', stats.total_articles)
+    print(f"Report saved to: {args.output_file}")
+
+    if args.group_dir:
+        with metrics.stage('group'):
+            write_grouped_reports(processed, args.group_dir, inline_css=args.inline_css)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fetch, filter, process and render AI news in one process")
+    parser.add_argument('output_file', nargs='?',
+                        help="Output HTML file (default: output/ai_news_report_<timestamp>.html)")
+    parser.add_argument('--input', metavar='FILE',
+                        help="Raw news JSON or NDJSON capture to use instead of fetching")
+    parser.add_argument('--raw-output', metavar='FILE',
+                        help="Also write the fetched raw articles to this file")
+    parser.add_argument('--processed-output', metavar='FILE',
+                        help="Also write the processed articles to this file")
+    parser.add_argument('--archive', metavar='DIR',
+                        help="Add fetched articles to this news archive and report on its "
+                             "last --hours")
+    parser.add_argument('--search-index', metavar='DIR',
+                        help="Add the processed articles to this keyword search index")
+    parser.add_argument('--search-page', metavar='FILE',
+                        help="Rewrite a searchable archive page over --search-index")
+    parser.add_argument('--sources', metavar='FILE',
+                        help="JSON list of {\"name\", \"url\", \"weight\"} sources "
+                             "(default: built-in list)")
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help="Per-source timeout in seconds (default: 30)")
+    add_feed_cache_arguments(parser)
+    parser.add_argument('--per-host', type=int, default=2,
+                        help="Maximum concurrent connections per host (default: 2)")
+    parser.add_argument('--hours', type=int, default=24,
+                        help="Only keep articles from the last N hours (default: 24)")
+    parser.add_argument('--limit', type=int, default=20,
+                        help="Maximum number of articles to keep (default: 20)")
+    parser.add_argument('--workers', type=non_negative_int, default=1,
+                        help="Worker processes; 0 uses every CPU (default: 1)")
+    parser.add_argument('--chunk-size', type=positive_int, default=256,
+                        help="Articles per worker task (default: 256)")
+    parser.add_argument('--cache', metavar='PATH',
+                        help="SQLite summary cache to reuse results across runs")
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Evict least recently used cache entries above this size (default: 64)")
+    parser.add_argument('--state', metavar='PATH',
+                        help="Pipeline state file; reuse cards (and, with --processed-output, "
+                             "summaries) of unchanged articles")
+    add_backend_arguments(parser)
+    parser.add_argument('--page-size', type=int, default=0,
+                        help="Cards per page; write lazily loaded page shards (default: single file)")
+    parser.add_argument('--inline-css', action='store_true',
+                        help="Embed the stylesheet for a self-contained file")
+    parser.add_argument('--group-dir', metavar='DIR',
+                        help="Also write one report per source, topic and company to DIR")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="Write Prometheus text-format metrics (stage durations, "
+                             "per-source fetch latency, article counts) to FILE")
+    parser.add_argument('--profile', metavar='DIR',
+                        help="Dump cProfile stats of every stage to DIR/<stage>.prof")
+    args = parser.parse_args()
+
+    if args.input and not os.path.exists(args.input):
+        print(f"Error: Raw data file not found: {args.input}")
+        sys.exit(1)
+
+    if not args.output_file:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        args.output_file = os.path.join(SKILL_DIR, 'output', f"ai_news_report_{timestamp}.html")
+    output_dir = os.path.dirname(os.path.abspath(args.output_file))
+    os.makedirs(output_dir, exist_ok=True)
+    if args.workers <= 0:
+        args.workers = os.cpu_count() or 1
+
+    metrics = Metrics(args.profile)
+    stats = run_pipeline(args, metrics)
+    print_stats(stats)
+    print(f"⏱️  阶段耗时: {metrics.summary()}")
+    if args.metrics:
+        metrics.write_prometheus(args.metrics)
+
+if __name__ == "__main__":
+    main()
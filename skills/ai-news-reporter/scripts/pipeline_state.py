@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+AI News Pipeline State
+Persisted high-water marks and fingerprints for incremental pipeline runs
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from news_archive import article_epoch
+
+# Processed-article fields shown on a report card
+CARD_FIELDS = ('source', 'title', 'summary', 'keywords', 'link', 'pubDate')
+
+def fingerprint(article: Dict,
+                fields=('title', 'description', 'summary', 'pubDate', 'duplicates')) -> str:
+    """Hash the fields of an article that affect downstream output"""
+    payload = json.dumps([article.get(field) for field in fields], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def _load_json(path: str, default):
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return default
+
+def _save_json(path: str, data):
+    """Write JSON atomically so a crashed run never leaves a torn state file"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+class PipelineState:
+    """
+    State carried between pipeline runs
+
+    For each source it keeps a high-water mark (newest link and pubDate
+    seen), plus a fingerprint of every article in the last input window so
+    that new and changed articles can be told apart from unchanged ones.
+    Rendered report cards are kept in a sidecar file next to the state.
+    """
+
+    def __init__(self, path: str):
+        """
+        Load state from path (an absent file means a first run)
+
+        Args:
+            path: State JSON file
+        """
+        self.path = path
+        self.cards_path = os.path.splitext(path)[0] + '_cards.json'
+
+        data = _load_json(path, {})
+        self.sources: Dict[str, Dict] = data.get('sources', {})
+        self.fingerprints: Dict[str, str] = data.get('fingerprints', {})
+        self.processed_file: Optional[str] = data.get('processed_file')
+        self.report_file: Optional[str] = data.get('report_file')
+
+        self._next_fingerprints: Dict[str, str] = {}
+        self._cards: Optional[Dict[str, list]] = None
+        self._next_cards: Dict[str, list] = {}
+
+    def is_new(self, article: Dict) -> bool:
+        """Check whether an article is past its source's high-water mark"""
+        mark = self.sources.get(article.get('source', ''))
+        if mark is None:
+            return True
+        return ((article_epoch(article) or 0) > mark['last_epoch']
+                or article.get('link') not in self.fingerprints)
+
+    def needs_processing(self, article: Dict) -> bool:
+        """Check whether an article is new or has changed since the last run"""
+        if self.is_new(article):
+            return True
+        return self.fingerprints.get(article.get('link')) != fingerprint(article)
+
+    def record(self, article: Dict):
+        """Remember a raw article as seen in this run and advance its high-water mark"""
+        link = article.get('link', '')
+        self._next_fingerprints[link] = fingerprint(article)
+
+        # Undated articles never advance the mark
+        epoch = article_epoch(article) or 0
+        source = article.get('source', '')
+        mark = self.sources.get(source)
+        if mark is None or epoch > mark['last_epoch']:
+            self.sources[source] = {
+                'last_link': link,
+                'last_pubDate': article.get('pubDate', ''),
+                'last_epoch': epoch,
+            }
+
+    def cached_card(self, article: Dict, template: str = '') -> Optional[str]:
+        """
+        Return the previously rendered card for an unchanged processed article
+
+        Args:
+            article: Processed article
+            template: Version of the card template; cards rendered with a
+                different template are not reused
+        """
+        if self._cards is None:
+            self._cards = _load_json(self.cards_path, {})
+        entry = self._cards.get(article.get('link', ''))
+        if (entry and entry[0] == fingerprint(article, CARD_FIELDS)
+                and entry[2:] == [template]):
+            return entry[1]
+        return None
+
+    def record_card(self, article: Dict, card_html: str, template: str = ''):
+        """Remember the rendered card for a processed article"""
+        self._next_cards[article.get('link', '')] = [
+            fingerprint(article, CARD_FIELDS), card_html, template]
+
+    def save_processing(self, processed_file: str):
+        """Persist the fingerprints recorded by this run's processing stage"""
+        self.fingerprints = self._next_fingerprints
+        self._next_fingerprints = {}
+        self.processed_file = os.path.abspath(processed_file)
+        self._save()
+
+    def save_report(self, report_file: str):
+        """Persist the cards rendered by this run's report stage"""
+        _save_json(self.cards_path, self._next_cards)
+        self._cards = self._next_cards
+        self._next_cards = {}
+        self.report_file = os.path.abspath(report_file)
+        self._save()
+
+    def _save(self):
+        _save_json(self.path, {
+            'sources': self.sources,
+            'fingerprints': self.fingerprints,
+            'processed_file': self.processed_file,
+            'report_file': self.report_file,
+        })
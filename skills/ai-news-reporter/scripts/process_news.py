@@ -4,14 +4,36 @@ AI News Processing Script
 Processes raw news data, generates Chinese summaries, and extracts keywords
 """
 
-import json
+import argparse
 import sys
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import islice
 import re
-from typing import List, Dict
+from typing import Iterable, Iterator, List, Dict, Optional, Set, Tuple
+
+from term_matcher import first_rule, get_lexicon, get_matcher, matched_rules
+from news_io import iter_articles, load_articles, write_articles
+from summary_cache import DEFAULT_MAX_BYTES, SummaryCache
+from summary_backend import HTTPBackend, add_backend_arguments, close_backend, open_backend
+from pipeline_state import PipelineState
+from metrics import Metrics, stage
+from article_record import Article, iter_records
+from batch_tagger import SUMMARY_SUBJECTS, get_tagger
+
+# Topic category of a summary when no topic rule matched
+DEFAULT_TOPIC = "行业动态"
+
+def clean_description(description: str) -> str:
+    """Strip HTML tags and common entities from a feed description"""
+    description = re.sub(r'<[^>]+>', '', description)  # Remove HTML tags
+    description = description.replace('&nbsp;', ' ').replace('&amp;', '&')
+    return description.strip()
 
-def generate_chinese_summary(title: str, description: str, max_chars: int = 100) -> str:
+def generate_chinese_summary(title: str, description: str, max_chars: int = 100,
+                             matches: Optional[Dict[str, Set[str]]] = None) -> str:
     """
     Generate a Chinese summary of an English news article
 
@@ -19,6 +41,7 @@ def generate_chinese_summary(title: str, description: str, max_chars: int = 100)
         title: Article title
         description: Article description/summary
         max_chars: Maximum character count for summary
+        matches: Precomputed term matches for the article text, if any
 
     Returns:
         Chinese summary string
@@ -26,132 +49,49 @@ def generate_chinese_summary(title: str, description: str, max_chars: int = 100)
     # Simple keyword-based summarization
     # In a production environment, you would use a translation and summarization API
 
-    # Common AI terms mapping
-    ai_terms = {
-        'AI': '人工智能',
-        'artificial intelligence': '人工智能',
-        'machine learning': '机器学习',
-        'deep learning': '深度学习',
-        'neural network': '神经网络',
-        'ChatGPT': 'ChatGPT',
-        'GPT': 'GPT',
-        'OpenAI': 'OpenAI',
-        'LLM': '大语言模型',
-        'language model': '语言模型',
-        'algorithm': '算法',
-        'automation': '自动化',
-        'robot': '机器人',
-        'computer vision': '计算机视觉',
-        'NLP': '自然语言处理',
-        'generative AI': '生成式AI',
-        'transformer': 'Transformer',
-        'anthropic': 'Anthropic',
-        'claude': 'Claude',
-        'Gemini': 'Gemini',
-        'Google': '谷歌',
-        'Microsoft': '微软',
-        'Apple': '苹果',
-        'Amazon': '亚马逊',
-        'Meta': 'Meta',
-        'Tesla': '特斯拉',
-        'NVIDIA': '英伟达',
-        'startup': '初创公司',
-        'funding': '融资',
-        'acquisition': '收购',
-        'partnership': '合作',
-        'research': '研究',
-        'breakthrough': '突破',
-        'launch': '发布',
-        'release': '发布',
-        'update': '更新',
-        'announce': '宣布',
-        'unveil': '推出',
-        'introduce': '介绍',
-        'develop': '开发',
-        'create': '创建',
-        'build': '构建',
-        'design': '设计',
-        'train': '训练',
-        'deploy': '部署',
-        'implement': '实施',
-        'optimize': '优化',
-        'improve': '改进',
-        'enhance': '增强',
-        'advance': '推进',
-        'innovation': '创新',
-        'technology': '技术',
-        'platform': '平台',
-        'system': '系统',
-        'model': '模型',
-        'application': '应用',
-        'tool': '工具',
-        'service': '服务',
-        'product': '产品',
-        'solution': '解决方案',
-        'framework': '框架',
-        'API': 'API',
-        'cloud': '云',
-        'data': '数据',
-        'performance': '性能',
-        'efficiency': '效率',
-        'accuracy': '准确性'
-    }
-
-    # Clean up description
-    description = re.sub(r'<[^>]+>', '', description)  # Remove HTML tags
-    description = description.replace('&nbsp;', ' ').replace('&amp;', '&')
-    description = description.strip()
-
-    # Combine title and description for context
-    full_text = f"{title} {description}".lower()
-
-    # Translate AI terms to Chinese
-    summary_parts = []
+    if matches is None:
+        # Combine title and description for context
+        description = clean_description(description)
+        matches = get_matcher().scan(f"{title} {description}")
 
     # Check for key concepts
-    if any(term in full_text for term in ['chatgpt', 'openai']):
-        summary_parts.append("OpenAI")
-    if any(term in full_text for term in ['anthropic', 'claude']):
-        summary_parts.append("Anthropic")
-    if any(term in full_text for term in ['google', 'gemini']):
-        summary_parts.append("谷歌")
-    if any(term in full_text for term in ['microsoft', 'copilot']):
-        summary_parts.append("微软")
-    if any(term in full_text for term in ['apple']):
-        summary_parts.append("苹果")
-    if any(term in full_text for term in ['meta']):
-        summary_parts.append("Meta")
-    if any(term in full_text for term in ['nvidia']):
-        summary_parts.append("英伟达")
+    summary_parts = matched_rules(matches, 'subject')
+    subject = next((s for s in SUMMARY_SUBJECTS if s in summary_parts), None)
+
+    return compose_summary(
+        title,
+        topic=first_rule(matches, 'topic') or None,
+        subject=subject,
+        action=first_rule(matches, 'action') or None,
+        domain=first_rule(matches, 'domain') or None,
+        significance=first_rule(matches, 'significance') or None,
+        max_chars=max_chars
+    )
+
+def compose_summary(title: str, topic: Optional[str], subject: Optional[str],
+                    action: Optional[str], domain: Optional[str],
+                    significance: Optional[str], max_chars: int = 100) -> str:
+    """
+    Assemble a Chinese summary from the rule labels matched for an article
 
+    Args:
+        title: Article title (its first word stands in for an unknown subject)
+        topic, subject, action, domain, significance: Matched rule labels,
+            or None where no rule matched
+        max_chars: Maximum character count for summary
+
+    Returns:
+        Chinese summary string
+    """
     # Determine topic category
-    topic_category = ""
-    if any(term in full_text for term in ['research', 'study', 'paper', 'paper']):
-        topic_category = "研究进展"
-    elif any(term in full_text for term in ['funding', 'investment', 'valuation']):
-        topic_category = "投资动态"
-    elif any(term in full_text for term in ['launch', 'release', 'update', 'product']):
-        topic_category = "产品发布"
-    elif any(term in full_text for term in ['partnership', 'collaboration', 'acquisition']):
-        topic_category = "商业合作"
-    elif any(term in full_text for term in ['regulation', 'policy', 'ethics']):
-        topic_category = "政策监管"
-    else:
-        topic_category = "行业动态"
+    topic_category = topic or DEFAULT_TOPIC
 
     # Build summary
-    if topic_category:
-        summary = f"{topic_category}："
+    summary = f"{topic_category}："
 
     # Add main subject
-    if "OpenAI" in summary_parts:
-        summary += "OpenAI"
-    elif "Anthropic" in summary_parts:
-        summary += "Anthropic"
-    elif "谷歌" in summary_parts:
-        summary += "谷歌"
-    elif "微软" in summary_parts:
-        summary += "微软"
+    if subject:
+        summary += subject
     else:
         # Try to extract company name from title
         title_words = title.split()
@@ -161,38 +101,10 @@ def generate_chinese_summary(title: str, description: str, max_chars: int = 100)
             summary += "相关企业"
 
     # Add action
-    action = ""
-    if any(term in full_text for term in ['launch', 'release']):
-        action = "发布"
-    elif any(term in full_text for term in ['announce', 'unveil']):
-        action = "宣布"
-    elif any(term in full_text for term in ['develop', 'create', 'build']):
-        action = "开发"
-    elif any(term in full_text for term in ['partner', 'collaborate']):
-        action = "合作"
-    elif any(term in full_text for term in ['acquire']):
-        action = "收购"
-    elif any(term in full_text for term in ['fund', 'invest']):
-        action = "融资"
-    elif any(term in full_text for term in ['research', 'study']):
-        action = "研究"
-    else:
-        action = "推出"
-
-    if action:
-        summary += f"{action}"
+    summary += action or "推出"
 
     # Add topic
-    if any(term in full_text for term in ['chatgpt', 'llm', 'language model']):
-        summary += "大语言模型"
-    elif any(term in full_text for term in ['image', 'visual', 'vision']):
-        summary += "视觉AI"
-    elif any(term in full_text for term in ['robot', 'automation']):
-        summary += "机器人技术"
-    elif any(term in full_text for term in ['algorithm', 'model']):
-        summary += "AI技术"
-    else:
-        summary += "AI技术"
+    summary += domain or "AI技术"
 
     # Add context if space permits
     if len(summary) < max_chars - 20:
@@ -206,12 +118,7 @@ def generate_chinese_summary(title: str, description: str, max_chars: int = 100)
             summary += "，关注"
 
         # Add a brief note about significance
-        if any(term in full_text for term in ['first', 'new', 'breakthrough']):
-            summary += "技术突破"
-        elif any(term in full_text for term in ['improve', 'better', 'enhance']):
-            summary += "性能提升"
-        else:
-            summary += "行业发展"
+        summary += significance or "行业发展"
 
     # Ensure summary is within character limit
     if len(summary) > max_chars:
@@ -219,7 +126,13 @@ def generate_chinese_summary(title: str, description: str, max_chars: int = 100)
 
     return summary
 
-def extract_keywords(title: str, description: str, max_keywords: int = 5) -> List[str]:
+def summary_topic(summary: str) -> str:
+    """Topic category a summary was composed with (its prefix before "：")"""
+    prefix = summary.split("：", 1)[0]
+    return prefix if prefix in get_lexicon().labels['topic'] else DEFAULT_TOPIC
+
+def extract_keywords(title: str, description: str, max_keywords: int = 5,
+                     matches: Optional[Dict[str, Set[str]]] = None) -> List[str]:
     """
     Extract keywords from news article
 
@@ -227,142 +140,461 @@ def extract_keywords(title: str, description: str, max_keywords: int = 5) -> Lis
         title: Article title
         description: Article description
         max_keywords: Maximum number of keywords
+        matches: Precomputed term matches for the article text, if any
 
     Returns:
         List of keywords
     """
-    # Common AI-related keywords
-    keyword_patterns = [
-        'AI', 'artificial intelligence', 'machine learning', 'deep learning',
-        'neural network', 'neural networks', 'ChatGPT', 'OpenAI', 'GPT',
-        'LLM', 'large language model', 'language model', 'NLP',
-        'computer vision', 'image recognition', 'robotics',
-        'automation', 'autonomous', 'algorithm', 'data science',
-        'generative AI', 'generative', 'transformer', 'attention',
-        'anthropic', 'claude', 'gemini', 'bard', 'copilot',
-        'tensorflow', 'pytorch', 'hugging face', 'midjourney',
-        'stable diffusion', 'diffusion model', 'reinforcement learning',
-        'supervised learning', 'unsupervised learning', 'self-supervised'
-    ]
-
-    # Technology companies
-    tech_companies = [
-        'Google', 'Microsoft', 'Apple', 'Amazon', 'Meta', 'Tesla',
-        'NVIDIA', 'IBM', 'Intel', 'AMD', 'OpenAI', 'Anthropic',
-        'Stability AI', 'Midjourney', 'Cohere', 'AI21 Labs'
-    ]
-
-    # Research institutions
-    research_institutions = [
-        'MIT', 'Stanford', 'Berkeley', 'Carnegie Mellon', 'Oxford',
-        'Cambridge', 'DeepMind', 'FAIR', 'Google AI', 'Microsoft Research'
-    ]
-
-    # Extract patterns from text
-    text_lower = (title + " " + description).lower()
+    if matches is None:
+        matches = get_matcher().scan(title + " " + description)
+    lexicon = get_lexicon()
     found_keywords = []
 
-    # Check for keyword patterns
-    for pattern in keyword_patterns:
-        if pattern.lower() in text_lower:
-            # Clean up keyword (capitalize appropriately)
-            keyword = pattern if pattern in tech_companies else pattern.lower()
-            if keyword not in found_keywords:
-                found_keywords.append(keyword)
+    # Matched keyword patterns, in table order
+    for pattern in sorted(matches.get('keyword', ()), key=lexicon.keyword_ranks.__getitem__):
+        # Clean up keyword (capitalize appropriately)
+        keyword = pattern if pattern in lexicon.company_set else pattern.lower()
+        if keyword not in found_keywords:
+            found_keywords.append(keyword)
 
-    # Check for company names
-    for company in tech_companies:
-        if company.lower() in text_lower:
-            if company not in found_keywords:
-                found_keywords.append(company)
+    # Matched company names, in table order
+    for company in sorted(matches.get('company', ()), key=lexicon.company_ranks.__getitem__):
+        if company not in found_keywords:
+            found_keywords.append(company)
 
     # Add specific terms based on content
-    if any(term in text_lower for term in ['research', 'study', 'paper']):
-        found_keywords.append('research')
-    if any(term in text_lower for term in ['funding', 'investment', 'valuation']):
-        found_keywords.append('funding')
-    if any(term in text_lower for term in ['partnership', 'collaboration']):
-        found_keywords.append('partnership')
-    if any(term in text_lower for term in ['product', 'launch', 'release']):
-        found_keywords.append('product')
+    found_keywords.extend(matched_rules(matches, 'tag'))
 
     # Return top keywords
     return found_keywords[:max_keywords]
 
-def process_news(raw_data_file: str, output_file: str):
+def summarize_article(title: str, description: str) -> Tuple[str, List[str]]:
+    """
+    Generate the summary and keywords for one article's text
+
+    Args:
+        title: Article title
+        description: Cleaned article description
+
+    Returns:
+        (summary, keywords) tuple
+    """
+    # Scan once; summary and keywords share the same matches
+    matches = get_matcher().scan(f"{title} {description}")
+
+    # Generate Chinese summary
+    summary = generate_chinese_summary(
+        title,
+        description,
+        max_chars=100,
+        matches=matches
+    )
+
+    # Extract keywords
+    keywords = extract_keywords(
+        title,
+        description,
+        max_keywords=5,
+        matches=matches
+    )
+
+    return summary, keywords
+
+def summarize_batch(texts: List[Tuple[str, str]]) -> List[Tuple[str, List[str]]]:
+    """
+    Generate summaries and keywords for a batch of articles at once
+
+    Tags are assigned for the whole batch from one term-document matrix;
+    the results equal summarize_article() applied to each text.
+
+    Args:
+        texts: (title, cleaned description) pairs
+
+    Returns:
+        (summary, keywords) tuples in input order
+    """
+    tags, _ = get_tagger().tag([f"{title} {description}" for title, description in texts])
+    return [
+        (compose_summary(title, tags.topic[i], tags.subject[i], tags.action[i],
+                         tags.domain[i], tags.significance[i]), tags.keywords[i])
+        for i, (title, _) in enumerate(texts)
+    ]
+
+def summarize_texts(texts: List[Tuple[str, str]], backend: Optional[HTTPBackend] = None
+                    ) -> Tuple[List[Tuple[str, List[str]]], Set[int]]:
+    """
+    Summarize a batch with the backend, falling back to the rules per article
+
+    Args:
+        texts: (title, cleaned description) pairs
+        backend: Optional summarization service; None uses the rules only
+
+    Returns:
+        (summary, keywords) tuples in input order, and the indices of the
+        texts the backend failed on and the rules summarized instead
+    """
+    if backend is None:
+        return summarize_batch(texts), set()
+    results = backend.summarize(texts)
+    fallbacks = {i for i, result in enumerate(results) if result is None}
+    if fallbacks:
+        order = sorted(fallbacks)
+        for i, result in zip(order, summarize_batch([texts[i] for i in order])):
+            results[i] = result
+    return results, fallbacks
+
+def article_description(article: Dict) -> str:
+    """Return the cleaned description of a raw article, with fallback"""
+    description = article.get('description', '')
+    if not description and 'summary' in article:
+        description = article.get('summary', '')
+    return clean_description(description)
+
+def build_processed_article(article: Dict, summary: str, keywords: List[str],
+                            timestamp: str) -> Article:
+    """Assemble the processed record written for a raw article"""
+    return Article(
+        source=article['source'],
+        title=article['title'],
+        link=article['link'],
+        pubDate=article['pubDate'],
+        summary=summary,
+        keywords=keywords,
+        timestamp=timestamp,
+        # Links of near-duplicate copies folded into this article by the filter
+        duplicates=article.get('duplicates') or None,
+    )
+
+def process_article(article: Dict, timestamp: str) -> Dict:
+    """
+    Generate the summary and keywords for a single raw article
+
+    Args:
+        article: Raw article dict
+        timestamp: Processing timestamp stamped on the result
+
+    Returns:
+        Processed article dict
+    """
+    summary, keywords = summarize_article(article['title'], article_description(article))
+    return build_processed_article(article, summary, keywords, timestamp)
+
+def process_chunk(chunk: List[Dict], timestamp: str,
+                  cache: Optional[SummaryCache] = None,
+                  backend: Optional[HTTPBackend] = None) -> List[Dict]:
+    """
+    Process a chunk of articles, consulting the summary cache if given
+
+    Args:
+        chunk: Raw articles
+        timestamp: Processing timestamp stamped on each result
+        cache: Optional summary cache; misses are computed and stored
+        backend: Optional summarization service for the misses
+
+    Returns:
+        Processed articles in input order
+    """
+    texts = [(article['title'], article_description(article)) for article in chunk]
+    if cache is None:
+        results, _ = summarize_texts(texts, backend)
+        return [build_processed_article(article, summary, keywords, timestamp)
+                for article, (summary, keywords) in zip(chunk, results)]
+
+    keys = [cache.key(title, description) for title, description in texts]
+    cached = cache.get_many(keys)
+
+    # Tag every miss in one batch
+    misses = {}
+    for key, text in zip(keys, texts):
+        if key not in cached:
+            misses.setdefault(key, text)
+    results, fallbacks = summarize_texts(list(misses.values()), backend)
+    fresh = dict(zip(misses, results))
+
+    processed = []
+    for article, key in zip(chunk, keys):
+        result = cached.get(key) or fresh[key]
+        processed.append(build_processed_article(article, result[0], result[1], timestamp))
+
+    # Rule-based stand-ins for failed backend requests are not cached
+    cache.put_many((key, summary, keywords)
+                   for i, (key, (summary, keywords)) in enumerate(fresh.items())
+                   if i not in fallbacks)
+    return processed
+
+# Per-worker state, set up once by _init_worker
+_worker_cache: Optional[SummaryCache] = None
+_worker_backend: Optional[HTTPBackend] = None
+
+def _init_worker(cache_path: Optional[str], cache_max_bytes: int,
+                 backend_options: Optional[Dict]):
+    """Create the batch tagger and open the cache and backend once per worker process"""
+    global _worker_cache, _worker_backend
+    get_tagger()
+    if backend_options:
+        _worker_backend = HTTPBackend(**backend_options)
+    if cache_path:
+        _worker_cache = SummaryCache(cache_path, cache_max_bytes,
+                                     _worker_backend.name if _worker_backend else None)
+
+def _process_chunk(chunk: List[Dict], timestamp: str) -> List[Dict]:
+    """Worker entry point: process one chunk of articles"""
+    return process_chunk(chunk, timestamp, _worker_cache, _worker_backend)
+
+def _iter_chunks(articles: Iterable[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+    """Split an article stream into lists of at most chunk_size articles"""
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    it = iter(articles)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def process_parallel(articles: Iterable[Dict], timestamp: str, workers: int,
+                     chunk_size: int = 256, cache_path: Optional[str] = None,
+                     cache_max_bytes: int = DEFAULT_MAX_BYTES,
+                     backend_options: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Process articles across a pool of worker processes
+
+    Each worker compiles the term matcher and opens the summary cache (and
+    backend client) once in its initializer, so tasks only carry article
+    chunks. Results are yielded in input order, and at most two chunks per
+    worker are in flight to keep memory bounded.
+
+    Args:
+        articles: Raw articles, consumed lazily
+        timestamp: Processing timestamp stamped on each result
+        workers: Number of worker processes
+        chunk_size: Articles per task
+        cache_path: Optional summary cache database shared by all workers
+        cache_max_bytes: Eviction threshold for the summary cache
+        backend_options: HTTPBackend arguments; each worker opens its own client
+
+    Yields:
+        Processed articles in input order
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cache_path, cache_max_bytes, backend_options)) as pool:
+        pending = deque()
+        for chunk in _iter_chunks(articles, chunk_size):
+            pending.append(pool.submit(_process_chunk, chunk, timestamp))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def process_stream(articles: Iterable[Dict], timestamp: str, workers: int = 1,
+                   chunk_size: int = 256, cache: Optional[SummaryCache] = None,
+                   cache_path: Optional[str] = None,
+                   cache_max_bytes: int = DEFAULT_MAX_BYTES,
+                   backend: Optional[HTTPBackend] = None) -> Iterator[Dict]:
+    """
+    Process an article stream in-process or across worker processes
+
+    Args:
+        articles: Raw articles, consumed lazily
+        timestamp: Processing timestamp stamped on each result
+        workers: Number of worker processes (1 processes in-process)
+        chunk_size: Articles per chunk (and per worker task when workers > 1)
+        cache: Open summary cache used when processing in-process
+        cache_path: Summary cache database opened by each worker process
+        cache_max_bytes: Eviction threshold for the summary cache
+        backend: Optional summarization service (workers open their own clients
+            with the same options)
+
+    Returns:
+        Iterator over processed articles in input order
+    """
+    if workers > 1:
+        return process_parallel(articles, timestamp, workers, chunk_size,
+                                cache_path, cache_max_bytes,
+                                backend.options if backend else None)
+    return (result
+            for chunk in _iter_chunks(articles, chunk_size)
+            for result in process_chunk(chunk, timestamp, cache, backend))
+
+def load_previous(state: PipelineState) -> Dict[str, Article]:
+    """Load the previous run's processed records by link, as compact records"""
+    if state.processed_file and os.path.exists(state.processed_file):
+        return {article['link']: article for article in iter_records(state.processed_file)}
+    return {}
+
+def select_changed(articles: Iterable[Dict], previous: Dict[str, Dict],
+                   state: PipelineState) -> Iterator[Dict]:
+    """Keep the articles that are new or changed since the previous run"""
+    return (article for article in articles
+            if article['link'] not in previous or state.needs_processing(article))
+
+def merge_incremental(raw_articles: Iterable[Dict], fresh: Iterable[Dict],
+                      previous: Dict[str, Dict], state: PipelineState) -> Iterator[Dict]:
+    """
+    Merge freshly processed articles with the previous run's output
+
+    Unchanged articles reuse their record from the previous processed file,
+    so the merged stream has the same content and order as a full run over
+    raw_articles.
+
+    Args:
+        raw_articles: Raw input of this run (iterated again for ordering)
+        fresh: Processed records for new and changed articles only
+        previous: Previous run's processed records by link
+        state: Pipeline state; every raw article is recorded into it
+
+    Yields:
+        Processed articles in raw input order
+    """
+    fresh_by_link = {article['link']: article for article in fresh}
+    for article in raw_articles:
+        state.record(article)
+        result = fresh_by_link.get(article['link']) or previous.get(article['link'])
+        if result is not None:
+            yield result
+
+def close_cache(cache: Optional[SummaryCache], report: bool = True):
+    """Evict down to the size limit, report hit rates and close the cache"""
+    if cache is None:
+        return
+    evicted = cache.evict()
+    if report:
+        print(f"Summary cache: {cache.hits} hits, {cache.misses} misses, {evicted} evicted")
+    cache.close()
+
+def process_news(raw_data_file: str, output_file: str, workers: int = 1,
+                 chunk_size: int = 256, cache_path: Optional[str] = None,
+                 cache_max_bytes: int = DEFAULT_MAX_BYTES,
+                 state_path: Optional[str] = None,
+                 metrics: Optional[Metrics] = None,
+                 backend: Optional[HTTPBackend] = None) -> int:
     """
     Process raw news data and generate summaries and keywords
 
+    Articles are streamed from the input and each processed article is
+    written as soon as it is ready, so memory stays flat for any input size.
+    Either file may be a JSON array or NDJSON (.ndjson/.jsonl).
+
     Args:
-        raw_data_file: Path to raw news JSON file
-        output_file: Path to output processed JSON file
+        raw_data_file: Path to raw news JSON or NDJSON file
+        output_file: Path to output processed JSON or NDJSON file
+        workers: Number of worker processes (1 processes in-process)
+        chunk_size: Articles per chunk (and per worker task when workers > 1)
+        cache_path: Optional SQLite summary cache; unchanged articles are
+            served from it instead of being summarized again
+        cache_max_bytes: Eviction threshold for the summary cache
+        state_path: Optional pipeline state file; when given, only articles
+            that are new or changed since the last run are processed and the
+            rest are merged in from the previous output
+        metrics: Optional metrics; the run is timed as the 'process' stage
+        backend: Optional summarization service; articles it fails on are
+            summarized by the rules
+
+    Returns:
+        Number of articles processed
     """
+    with stage(metrics, 'process'):
+        count = _process_news(raw_data_file, output_file, workers, chunk_size,
+                              cache_path, cache_max_bytes, state_path, backend)
+    if metrics is not None:
+        metrics.count('processed', count)
+    return count
+
+def _process_news(raw_data_file: str, output_file: str, workers: int, chunk_size: int,
+                  cache_path: Optional[str], cache_max_bytes: int,
+                  state_path: Optional[str], backend: Optional[HTTPBackend]) -> int:
     print(f"Processing news data from {raw_data_file}...")
 
-    # Read raw data
-    with open(raw_data_file, 'r', encoding='utf-8') as f:
-        raw_news = json.load(f)
-
-    print(f"Processing {len(raw_news)} articles...")
-
-    processed_news = []
-
-    for i, article in enumerate(raw_news):
-        print(f"Processing article {i+1}/{len(raw_news)}: {article['title'][:50]}...")
-
-        # Get description, with fallback
-        description = article.get('description', '')
-        if not description and 'summary' in article:
-            description = article.get('summary', '')
-
-        # Generate Chinese summary
-        summary = generate_chinese_summary(
-            article['title'],
-            description,
-            max_chars=100
-        )
-
-        # Extract keywords
-        keywords = extract_keywords(
-            article['title'],
-            description,
-            max_keywords=5
-        )
-
-        # Create processed article
-        processed_article = {
-            'source': article['source'],
-            'title': article['title'],
-            'link': article['link'],
-            'pubDate': article['pubDate'],
-            'summary': summary,
-            'keywords': keywords,
-            'timestamp': datetime.now().isoformat()
-        }
-
-        processed_news.append(processed_article)
-
-    # Save processed data
-    print(f"Saving processed data to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(processed_news, f, ensure_ascii=False, indent=2)
-
-    print(f"Processing complete! {len(processed_news)} articles processed.")
-    print(f"Output saved to: {output_file}")
+    # One timestamp for the whole run
+    timestamp = datetime.now().isoformat()
+
+    # Streaming a file that is being overwritten would read it truncated
+    in_place = os.path.exists(output_file) and os.path.samefile(raw_data_file, output_file)
+    loaded = load_articles(raw_data_file) if in_place else None
+
+    def read_raw() -> Iterable[Dict]:
+        return loaded if loaded is not None else iter_articles(raw_data_file)
+
+    articles = read_raw()
+    state = PipelineState(state_path) if state_path else None
+    if state is not None:
+        # Read the previous output up front: it may be the file we overwrite
+        previous = load_previous(state)
+        articles = select_changed(articles, previous, state)
+
+    cache = None
+    if cache_path:
+        cache = SummaryCache(cache_path, cache_max_bytes, backend.name if backend else None)
+    processed = process_stream(articles, timestamp, workers, chunk_size,
+                               cache, cache_path, cache_max_bytes, backend)
+
+    if state is not None:
+        fresh = list(processed)
+        print(f"Incremental run: {len(fresh)} new or changed articles")
+        merged = merge_incremental(read_raw(), fresh, previous, state)
+        count = write_articles(output_file, merged)
+        state.save_processing(output_file)
+    else:
+        count = write_articles(output_file, processed)
 
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: python3 process_news.py <raw_data_file> <output_file>")
-        sys.exit(1)
+    close_cache(cache, report=workers == 1)
 
-    raw_data_file = sys.argv[1]
-    output_file = sys.argv[2]
+    print(f"Processing complete! {count} articles processed.")
+    print(f"Output saved to: {output_file}")
+    return count
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+    return number
+
+def non_negative_int(value: str) -> int:
+    """argparse type for counts where 0 has a special meaning"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {value}")
+    return number
 
-    if not os.path.exists(raw_data_file):
-        print(f"Error: Raw data file not found: {raw_data_file}")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Process raw news data and generate summaries and keywords")
+    parser.add_argument('raw_data_file', help="Raw news JSON or NDJSON file")
+    parser.add_argument('output_file', help="Output JSON or NDJSON (.ndjson/.jsonl) file")
+    parser.add_argument('--workers', type=non_negative_int, default=1,
+                        help="Worker processes; 0 uses every CPU (default: 1)")
+    parser.add_argument('--chunk-size', type=positive_int, default=256,
+                        help="Articles per worker task (default: 256)")
+    parser.add_argument('--cache', metavar='PATH',
+                        help="SQLite summary cache to reuse results across runs")
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Evict least recently used cache entries above this size (default: 64)")
+    parser.add_argument('--state', metavar='PATH',
+                        help="Pipeline state file; process only new or changed articles")
+    add_backend_arguments(parser)
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="Write Prometheus text-format metrics to FILE")
+    parser.add_argument('--profile', metavar='DIR',
+                        help="Dump cProfile stats of the process stage to DIR")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.raw_data_file):
+        print(f"Error: Raw data file not found: {args.raw_data_file}")
         sys.exit(1)
 
-    process_news(raw_data_file, output_file)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    metrics = Metrics(args.profile)
+    backend = open_backend(args)
+    try:
+        process_news(args.raw_data_file, args.output_file,
+                     workers=workers, chunk_size=args.chunk_size,
+                     cache_path=args.cache, cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+                     state_path=args.state, metrics=metrics, backend=backend)
+    finally:
+        close_backend(backend, report=workers == 1)
+    if args.metrics:
+        metrics.write_prometheus(args.metrics)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+AI News Ranking
+Scores articles from recency, source weight and keyword relevance and
+keeps the best K of a stream of any size with a bounded heap
+"""
+
+import heapq
+import json
+import math
+import time
+from itertools import count, islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from batch_tagger import get_tagger
+from news_archive import article_epoch
+from term_matcher import get_lexicon
+
+# Editorial weight of each built-in source (unlisted sources weigh 1.0).
+# First-party lab blogs and long-form outlets outrank aggregators
+SOURCE_WEIGHTS = {
+    'OpenAI_Blog': 1.3,
+    'DeepMind_Blog': 1.3,
+    'MIT_Tech_Review': 1.2,
+    'Ars_Technica': 1.1,
+    'The_Verge': 1.0,
+    'Wired': 1.0,
+    'TechCrunch': 1.0,
+    'VentureBeat': 0.9,
+    'AI_News': 0.8,
+    'AI_Research': 0.8,
+}
+
+# A story loses half its recency score every this many hours
+HALF_LIFE_HOURS = 12.0
+# Recency score of an article without a usable date
+UNDATED_RECENCY = 0.5
+# Distinct keywords and companies at which relevance saturates
+RELEVANCE_TERMS = 5
+RECENCY_SHARE = 0.5
+
+def load_source_weights(path: str) -> Dict[str, float]:
+    """Source weights from a sources JSON file whose entries may set "weight" """
+    weights = dict(SOURCE_WEIGHTS)
+    with open(path, 'r', encoding='utf-8') as f:
+        for source in json.load(f):
+            if 'weight' in source:
+                weights[source['name']] = float(source['weight'])
+    return weights
+
+def recency(epoch: Optional[float], now: float, half_life_hours: float = HALF_LIFE_HOURS) -> float:
+    """Exponential decay by age: 1.0 now, 0.5 after one half-life"""
+    if epoch is None:
+        return UNDATED_RECENCY
+    age_hours = max(now - epoch, 0.0) / 3600
+    return math.exp(-math.log(2) * age_hours / half_life_hours)
+
+def score_batch(articles: List[Dict], now: float,
+                weights: Optional[Dict[str, float]] = None) -> List[float]:
+    """
+    Score a batch of articles
+
+    score = source weight * (RECENCY_SHARE * recency + (1 - RECENCY_SHARE) * relevance)
+
+    Relevance is the number of distinct AI keywords and companies in the
+    title and description, saturating at RELEVANCE_TERMS; the terms of the
+    whole batch come from one term-document matrix.
+
+    Args:
+        articles: Raw articles
+        now: Reference time (epoch seconds) for recency
+        weights: Source weights (default: SOURCE_WEIGHTS)
+
+    Returns:
+        Scores in input order
+    """
+    weights = SOURCE_WEIGHTS if weights is None else weights
+    matrix = get_tagger().matrix([f"{article.get('title', '')} {article.get('description', '')}"
+                                  for article in articles])
+    relevant = get_lexicon().relevance_terms
+    terms = [0] * len(articles)
+    for term, docs in matrix.columns.items():
+        if term in relevant:
+            for doc in docs:
+                terms[doc] += 1
+
+    scores = []
+    for article, found in zip(articles, terms):
+        relevance = min(found, RELEVANCE_TERMS) / RELEVANCE_TERMS
+        blended = (RECENCY_SHARE * recency(article_epoch(article), now)
+                   + (1 - RECENCY_SHARE) * relevance)
+        scores.append(weights.get(article.get('source', ''), 1.0) * blended)
+    return scores
+
+class TopK:
+    """
+    The k highest-scoring items seen so far, in O(k) memory
+
+    A min-heap holds the current best k; a new item only enters by
+    displacing the weakest. Ties keep the item seen first.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[Tuple[float, int, object]] = []
+        # Negated arrival order: among equal scores the earlier item is larger
+        self._order = count(0, -1)
+
+    def push(self, score: float, item) -> bool:
+        """Offer an item; returns whether it is (for now) among the best k"""
+        if self.k <= 0:
+            return False
+        entry = (score, next(self._order), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def ranked(self) -> List[Tuple[float, object]]:
+        """(score, item) pairs, best first"""
+        return [(score, item) for score, _, item in sorted(self._heap, reverse=True)]
+
+def top_k(articles: Iterable[Dict], k: int, now: Optional[float] = None,
+          weights: Optional[Dict[str, float]] = None,
+          chunk_size: int = 256) -> List[Tuple[float, Dict]]:
+    """
+    Stream articles and keep the k best by score
+
+    Args:
+        articles: Raw articles, consumed lazily in chunks
+        k: Number of articles to keep
+        now: Reference time for recency (default: the current time)
+        weights: Source weights (default: SOURCE_WEIGHTS)
+        chunk_size: Articles scored per batch
+
+    Returns:
+        (score, article) pairs, best first
+    """
+    now = time.time() if now is None else now
+    best = TopK(k)
+    it = iter(articles)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            break
+        for score, article in zip(score_batch(chunk, now, weights), chunk):
+            best.push(score, article)
+    return best.ranked()
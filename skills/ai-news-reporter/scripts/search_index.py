@@ -0,0 +1,606 @@
+#!/usr/bin/env python3
+"""
+AI News Search Index
+On-disk inverted index from keywords, sources and title words to processed
+articles, updated incrementally after each run
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from article_record import Article
+from generate_html import (
+    generate_html_footer, generate_html_header, open_replacing, write_stylesheet
+)
+from news_archive import article_epoch, parse_pub_date
+from news_io import iter_articles, write_articles
+from pipeline_state import CARD_FIELDS, fingerprint
+
+MANIFEST_FILE = 'index.json'
+INDEX_VERSION = 1
+# Article store: one JSON line per document id, and per id its byte offset
+# and publication epoch (int64 each, UNDATED if unknown)
+DOCS_FILE = 'docs.ndjson'
+DOC_TABLE_FILE = 'docs.bin'
+# link -> [document id, card fingerprint] of the live copy of each article
+LINKS_FILE = 'links.json'
+UNDATED = -(1 << 63)
+
+# Segments are merged into one once there are more than this many
+MAX_SEGMENTS = 8
+
+# Fields kept per document: what a card shows, plus the parsed date
+DOC_FIELDS = CARD_FIELDS + ('published',)
+
+# Query field prefixes -> index term prefixes
+FIELD_PREFIXES = {'keyword': 'kw:', 'source': 'src:', 'title': 'title:'}
+
+_TOKEN_RE = re.compile(r'\w+')
+
+def title_tokens(title: str) -> Set[str]:
+    """Lowercased word tokens of a title"""
+    return set(_TOKEN_RE.findall(title.lower()))
+
+def document_terms(article: Dict) -> Set[str]:
+    """Index terms of a processed article: its keywords, source and title words"""
+    terms = {'kw:' + keyword.lower() for keyword in article.get('keywords') or ()}
+    terms.add('src:' + article.get('source', '').lower())
+    terms.update('title:' + token for token in title_tokens(article.get('title', '')))
+    return terms
+
+def parse_query(query: Iterable[str]) -> List[List[List[str]]]:
+    """
+    Parse query terms into clauses
+
+    Every query term must match (AND). "keyword:X", "source:X" and
+    "title:X" match one field; a bare term matches articles tagged with it
+    or whose title contains all of its words.
+
+    Returns:
+        One list of alternatives per query term; an alternative is a list
+        of index terms that must all be present
+    """
+    clauses = []
+    for raw in query:
+        field, sep, value = raw.partition(':')
+        if sep and field.lower() in FIELD_PREFIXES:
+            value = value.strip().lower()
+            if field.lower() == 'title':
+                clauses.append([['title:' + token for token in sorted(title_tokens(value))]])
+            else:
+                clauses.append([[FIELD_PREFIXES[field.lower()] + value]])
+            continue
+        value = raw.strip().lower()
+        alternatives = [['kw:' + value]]
+        tokens = sorted(title_tokens(value))
+        if tokens:
+            alternatives.append(['title:' + token for token in tokens])
+        clauses.append(alternatives)
+    return clauses
+
+def _intersect(postings: List[List[int]]) -> List[int]:
+    """Ids present in every sorted list, ascending"""
+    if not postings:
+        return []
+    postings = sorted(postings, key=len)
+    result = set(postings[0])
+    for ids in postings[1:]:
+        result.intersection_update(ids)
+        if not result:
+            break
+    return sorted(result)
+
+class SearchIndex:
+    """
+    Inverted index over processed articles
+
+    Layout of the index directory:
+      docs.ndjson / docs.bin   every indexed copy of an article, by document
+                               id, with a fixed-size table of byte offsets and
+                               publication epochs for seeking and time filters
+      seg-NNNNNN.terms.json    a segment's terms -> [offset, count] of their
+      seg-NNNNNN.post          postings: ascending document ids (uint32)
+      links.json               the live document id of each link
+      index.json               manifest: documents, segments, superseded ids
+
+    Each update appends its new documents and writes one new segment over
+    them, so earlier segments are never rewritten; a query reads only the
+    postings of its terms from each segment. An article that changes gets a
+    new document id and its old id is superseded. Past MAX_SEGMENTS the
+    segments are merged into one, dropping superseded ids. The manifest is
+    replaced last, so an interrupted update leaves the previous index intact.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        manifest = {}
+        path = os.path.join(root, MANIFEST_FILE)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != INDEX_VERSION:
+                manifest = {}
+        self.doc_count: int = manifest.get('docs', 0)
+        self.docs_bytes: int = manifest.get('docs_bytes', 0)
+        self.segments: List[str] = manifest.get('segments', [])
+        self.next_segment: int = manifest.get('next_segment', 1)
+        self.superseded: Set[int] = set(manifest.get('superseded', []))
+
+        self._table: Optional[array] = None
+        self._terms: Dict[str, Dict[str, List[int]]] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def _replace(self, name: str, data: bytes):
+        """Write an index file atomically"""
+        path = self._path(name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _save_manifest(self):
+        manifest = {
+            'version': INDEX_VERSION,
+            'docs': self.doc_count,
+            'docs_bytes': self.docs_bytes,
+            'segments': self.segments,
+            'next_segment': self.next_segment,
+            'superseded': sorted(self.superseded),
+        }
+        self._replace(MANIFEST_FILE, json.dumps(manifest).encode('utf-8'))
+
+    def _doc_table(self) -> array:
+        """(offset, epoch) pairs of every document, flattened"""
+        if self._table is None:
+            self._table = array('q')
+            if self.doc_count:
+                with open(self._path(DOC_TABLE_FILE), 'rb') as f:
+                    self._table.frombytes(f.read(16 * self.doc_count))
+        return self._table
+
+    def _segment_terms(self, segment: str) -> Dict[str, List[int]]:
+        if segment not in self._terms:
+            with open(self._path(f"{segment}.terms.json"), 'r', encoding='utf-8') as f:
+                self._terms[segment] = json.load(f)
+        return self._terms[segment]
+
+    def _load_links(self) -> Dict[str, List]:
+        path = self._path(LINKS_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            links = json.load(f)
+        # Ids past the manifest belong to an update that never completed
+        return {link: entry for link, entry in links.items() if entry[0] < self.doc_count}
+
+    def _write_segment(self, postings: Dict[str, List[int]]) -> str:
+        """Write postings (term -> ascending ids) as a new segment"""
+        segment = f"seg-{self.next_segment:06d}"
+        self.next_segment += 1
+        terms = {}
+        data = array('I')
+        for term in sorted(postings):
+            terms[term] = [len(data), len(postings[term])]
+            data.extend(postings[term])
+        self._replace(f"{segment}.post", data.tobytes())
+        self._replace(f"{segment}.terms.json",
+                      json.dumps(terms, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        return segment
+
+    def _read_postings(self, segment: str, start: int = 0, count: Optional[int] = None) -> array:
+        """Ids start..start+count of a segment's postings file (all by default)"""
+        values = array('I')
+        with open(self._path(f"{segment}.post"), 'rb') as f:
+            f.seek(start * values.itemsize)
+            values.frombytes(f.read(-1 if count is None else count * values.itemsize))
+        return values
+
+    def postings(self, term: str) -> List[int]:
+        """Live document ids indexed under an index term, ascending"""
+        ids = []
+        for segment in self.segments:
+            entry = self._segment_terms(segment).get(term)
+            if entry is not None:
+                ids.extend(self._read_postings(segment, *entry))
+        if self.superseded:
+            ids = [doc for doc in ids if doc not in self.superseded]
+        return ids
+
+    def all_postings(self) -> Dict[str, List[int]]:
+        """Every term with its live document ids, reading each segment once"""
+        merged: Dict[str, List[int]] = {}
+        for segment in self.segments:
+            values = self._read_postings(segment)
+            for term, (start, count) in self._segment_terms(segment).items():
+                ids = [doc for doc in values[start:start + count] if doc not in self.superseded]
+                if ids:
+                    merged.setdefault(term, []).extend(ids)
+        return merged
+
+    def add(self, articles: Iterable[Dict]) -> int:
+        """
+        Index processed articles
+
+        Articles already indexed with the same card fields are skipped; a
+        changed article replaces its earlier copy.
+
+        Args:
+            articles: Processed article dicts or records
+
+        Returns:
+            Number of articles that were new or changed
+        """
+        os.makedirs(self.root, exist_ok=True)
+        links = self._load_links()
+        table = self._doc_table()
+        first_new = self.doc_count
+        postings: Dict[str, List[int]] = {}
+        added = 0
+
+        with open(self._path(DOCS_FILE), 'ab') as docs:
+            # Drop anything an interrupted update appended
+            docs.truncate(self.docs_bytes)
+            for article in articles:
+                link = article.get('link', '')
+                fp = fingerprint(article, CARD_FIELDS)
+                known = links.get(link)
+                if known is not None and known[1] == fp:
+                    continue
+                if known is not None:
+                    self.superseded.add(known[0])
+                doc_id = self.doc_count
+                record = {field: article.get(field) for field in DOC_FIELDS}
+                record['keywords'] = list(record['keywords'] or ())
+                record['published'] = article_epoch(article)
+                line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+                docs.write(line)
+                epoch = record['published']
+                table.extend((self.docs_bytes, UNDATED if epoch is None else epoch))
+                self.docs_bytes += len(line)
+                self.doc_count += 1
+                for term in document_terms(record):
+                    postings.setdefault(term, []).append(doc_id)
+                links[link] = [doc_id, fp]
+                added += 1
+
+        if not added:
+            return 0
+        with open(self._path(DOC_TABLE_FILE), 'ab') as f:
+            f.truncate(16 * first_new)
+            f.write(table[2 * first_new:].tobytes())
+        self.segments.append(self._write_segment(postings))
+        self._replace(LINKS_FILE, json.dumps(links, ensure_ascii=False).encode('utf-8'))
+        if len(self.segments) > MAX_SEGMENTS:
+            self._merge()
+        self._save_manifest()
+        return added
+
+    def _merge(self):
+        """Merge every segment into one, dropping superseded ids"""
+        merged = self.all_postings()
+        old = self.segments
+        self.segments = [self._write_segment(merged)]
+        self._save_manifest()
+        for segment in old:
+            self._terms.pop(segment, None)
+            for ext in ('terms.json', 'post'):
+                os.remove(self._path(f"{segment}.{ext}"))
+
+    def compact(self):
+        """Merge all segments now"""
+        if len(self.segments) > 1:
+            self._merge()
+
+    def terms(self) -> Set[str]:
+        """Every index term"""
+        terms = set()
+        for segment in self.segments:
+            terms.update(self._segment_terms(segment))
+        return terms
+
+    def epoch(self, doc_id: int) -> Optional[int]:
+        """Publication epoch of a document (None if undated)"""
+        epoch = self._doc_table()[2 * doc_id + 1]
+        return None if epoch == UNDATED else epoch
+
+    def documents(self, doc_ids: Iterable[int]) -> List[Article]:
+        """Read documents by id"""
+        table = self._doc_table()
+        records = []
+        with open(self._path(DOCS_FILE), 'rb') as f:
+            for doc_id in doc_ids:
+                f.seek(table[2 * doc_id])
+                records.append(Article(**json.loads(f.readline())))
+        return records
+
+    def live_ids(self) -> List[int]:
+        """Ids of the current copy of every indexed article"""
+        return [doc for doc in range(self.doc_count) if doc not in self.superseded]
+
+    def search(self, query: Iterable[str], since: Optional[float] = None,
+               until: Optional[float] = None, limit: Optional[int] = None) -> List[Article]:
+        """
+        Find articles matching every query term (see parse_query)
+
+        Args:
+            query: Query terms; none matches every article
+            since: Only articles published at or after this epoch
+            until: Only articles published before this epoch
+            limit: Maximum number of results
+
+        Returns:
+            Matching articles, newest first (undated last)
+        """
+        clauses = parse_query(query)
+        if clauses:
+            matches = None
+            for alternatives in clauses:
+                ids: Set[int] = set()
+                for terms in alternatives:
+                    ids.update(_intersect([self.postings(term) for term in terms]))
+                matches = ids if matches is None else matches & ids
+                if not matches:
+                    return []
+        else:
+            matches = self.live_ids()
+
+        dated = since is not None or until is not None
+        ranked: List[Tuple[int, int]] = []
+        for doc in matches:
+            epoch = self._doc_table()[2 * doc + 1]
+            if dated and (epoch == UNDATED or (since is not None and epoch < since)
+                          or (until is not None and epoch >= until)):
+                continue
+            ranked.append((epoch, doc))
+        ranked.sort(reverse=True)
+        if limit is not None:
+            ranked = ranked[:limit]
+        return self.documents(doc for _, doc in ranked)
+
+    def stats(self) -> Dict:
+        """Document, segment and term counts"""
+        return {
+            'articles': self.doc_count - len(self.superseded),
+            'documents': self.doc_count,
+            'segments': len(self.segments),
+            'terms': len(self.terms()),
+        }
+
+def write_search_page(index: SearchIndex, output_file: str, inline_css: bool = False) -> int:
+    """
+    Write a searchable archive page over the index
+
+    The page loads a companion script (<page>_index.js) holding every live
+    article, newest first, and its terms; queries use the same syntax as
+    the command line and are answered in the browser.
+
+    Args:
+        index: Search index to export
+        output_file: Path to the HTML page
+        inline_css: Embed the stylesheet instead of linking the shared asset
+
+    Returns:
+        Number of articles on the page
+    """
+    def newest_first(doc: int):
+        epoch = index.epoch(doc)
+        return (epoch if epoch is not None else UNDATED, doc)
+
+    live = sorted(index.live_ids(), key=newest_first, reverse=True)
+    position = {doc: i for i, doc in enumerate(live)}
+    docs = [[article.get('source', ''), article.get('title', ''), article.get('summary', ''),
+             list(article.get('keywords') or ()), article.get('link', ''),
+             article.get('pubDate', '')]
+            for article in index.documents(live)]
+    terms = {term: sorted(position[doc] for doc in ids)
+             for term, ids in index.all_postings().items()}
+
+    data_file = os.path.splitext(output_file)[0] + '_index.js'
+    with open_replacing(data_file) as f:
+        f.write("window.loadNewsIndex(")
+        f.write(json.dumps({'docs': docs, 'terms': terms}, ensure_ascii=False,
+                           separators=(',', ':')))
+        f.write(");\n")
+
+    timestamp = datetime.now().strftime('%Y年%m月%d日 %H:%M')
+    stylesheet = None if inline_css else write_stylesheet(output_file)
+    with open_replacing(output_file) as f:
+        f.write(generate_html_header("AI新闻归档检索", timestamp, stylesheet))
+        f.write(SEARCH_BODY.replace('{data_file}', os.path.basename(data_file)))
+        f.write(generate_html_footer())
+    return len(docs)
+
+SEARCH_BODY = """
+        <div class="stats">
+            <input id="search-box" type="search" placeholder="anthropic  source:TechCrunch  keyword:大模型"
+                   style="flex: 1; padding: 12px 16px; font-size: 1.1em; border: 1px solid #dee2e6; border-radius: 8px;">
+            <div class="stat-item">
+                <div class="stat-value" id="search-count">0</div>
+                <div class="stat-label">篇文章</div>
+            </div>
+        </div>
+        <div class="news-list">
+        <div class="news-grid" id="search-results"></div>
+        </div>
+        <script>
+        (function () {
+            var PREFIXES = {keyword: 'kw:', source: 'src:', title: 'title:'};
+            var SHOWN = 100;
+            var index = null;
+            var box = document.getElementById('search-box');
+            var results = document.getElementById('search-results');
+            var counter = document.getElementById('search-count');
+
+            function escape(text) {
+                return String(text).replace(/[&<>"']/g, function (c) {
+                    return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'}[c];
+                });
+            }
+
+            function tokens(text) {
+                return text.toLowerCase().match(/[\\p{L}\\p{N}_]+/gu) || [];
+            }
+
+            function postings(term) {
+                return index.terms[term] || [];
+            }
+
+            function intersect(lists) {
+                if (!lists.length) {
+                    return [];
+                }
+                var result = new Set(lists[0]);
+                lists.slice(1).forEach(function (ids) {
+                    var keep = new Set(ids);
+                    result.forEach(function (id) {
+                        if (!keep.has(id)) {
+                            result.delete(id);
+                        }
+                    });
+                });
+                return Array.from(result);
+            }
+
+            function clause(raw) {
+                var colon = raw.indexOf(':');
+                var field = colon > 0 ? raw.slice(0, colon).toLowerCase() : '';
+                if (PREFIXES[field]) {
+                    var value = raw.slice(colon + 1).toLowerCase();
+                    if (field === 'title') {
+                        return intersect(tokens(value).map(function (t) { return postings('title:' + t); }));
+                    }
+                    return postings(PREFIXES[field] + value);
+                }
+                var words = tokens(raw);
+                var ids = new Set(postings('kw:' + raw.toLowerCase()));
+                if (words.length) {
+                    intersect(words.map(function (t) { return postings('title:' + t); }))
+                        .forEach(function (id) { ids.add(id); });
+                }
+                return Array.from(ids);
+            }
+
+            function search(query) {
+                var terms = query.match(/\\S+:"[^"]*"|"[^"]*"|\\S+/g) || [];
+                if (!terms.length) {
+                    return index.docs.map(function (_, i) { return i; });
+                }
+                var lists = terms.map(function (term) { return clause(term.replace(/"/g, '')); });
+                return intersect(lists).sort(function (a, b) { return a - b; });
+            }
+
+            function card(doc) {
+                var keywords = doc[3].map(function (k) {
+                    return '<span class="keyword-tag">' + escape(k) + '</span>';
+                }).join('');
+                return '<div class="news-card"><div class="card-header"><span class="source-badge">' +
+                    escape(doc[0]) + '</span></div><div class="card-body"><div class="news-title">' +
+                    escape(doc[1]) + '</div><div class="news-summary">' + escape(doc[2]) +
+                    '</div><div class="keywords">' + keywords + '</div></div>' +
+                    '<div class="card-footer"><span class="pub-date">' + escape(doc[5]) +
+                    '</span><a href="' + escape(doc[4]) + '" class="read-btn" target="_blank" ' +
+                    'rel="noopener">查看原文 →</a></div></div>';
+            }
+
+            function render() {
+                var ids = search(box.value.trim());
+                counter.textContent = ids.length;
+                results.innerHTML = ids.slice(0, SHOWN).map(function (id) {
+                    return card(index.docs[id]);
+                }).join('');
+            }
+
+            window.loadNewsIndex = function (data) {
+                index = data;
+                box.addEventListener('input', render);
+                render();
+            };
+        })();
+        </script>
+        <script src="{data_file}"></script>
+"""
+
+def _parse_time(value: str) -> int:
+    epoch = parse_pub_date(value)
+    if epoch is None:
+        raise argparse.ArgumentTypeError(f"not an ISO 8601 date: {value}")
+    return epoch
+
+def main():
+    parser = argparse.ArgumentParser(description="Inverted keyword index over processed AI news")
+    parser.add_argument('index', help="Index directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="Index processed news files "
+                                          "(e.g. output/processed_news_*.json)")
+    add.add_argument('files', nargs='+')
+
+    search = commands.add_parser('search', help="Find articles matching every term")
+    search.add_argument('terms', nargs='*',
+                        help="Terms: WORD (keyword or title), keyword:X, source:X, title:X")
+    search.add_argument('--days', type=float, help="Only articles of the last N days")
+    search.add_argument('--since', type=_parse_time, help="Range start (ISO 8601)")
+    search.add_argument('--until', type=_parse_time, help="Range end, exclusive (ISO 8601)")
+    search.add_argument('--limit', type=int, default=20,
+                        help="Maximum number of results (default: 20, 0 for all)")
+    search.add_argument('--output', '-o', metavar='FILE',
+                        help="Write the matches as JSON or NDJSON instead of listing them")
+
+    page = commands.add_parser('page', help="Write a searchable HTML archive page")
+    page.add_argument('output_file', help="HTML page to write")
+    page.add_argument('--inline-css', action='store_true',
+                      help="Embed the stylesheet for a self-contained file")
+
+    commands.add_parser('compact', help="Merge all segments into one")
+    commands.add_parser('stats', help="Show article, segment and term counts")
+    args = parser.parse_args()
+
+    index = SearchIndex(args.index)
+    if args.command == 'add':
+        for path in args.files:
+            try:
+                added = index.add(iter_articles(path))
+            except (OSError, ValueError) as e:
+                print(f"Skipping {path}: {e}")
+                continue
+            print(f"{path}: {added} new or changed articles")
+    elif args.command == 'search':
+        since = args.since
+        if args.days is not None:
+            since = time.time() - args.days * 86400
+        started = time.perf_counter()
+        matches = index.search(args.terms, since, args.until, args.limit or None)
+        elapsed = (time.perf_counter() - started) * 1000
+        if args.output:
+            count = write_articles(args.output, matches)
+            print(f"{count} articles saved to: {args.output}")
+            return
+        for article in matches:
+            epoch = article.get('published')
+            date = (datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%d %H:%M')
+                    if epoch is not None else '-')
+            print(f"{date}  [{article.get('source', '')}] {article.get('title', '')}")
+            print(f"    {article.get('link', '')}")
+        print(f"{len(matches)} articles ({elapsed:.1f}ms)")
+    elif args.command == 'page':
+        count = write_search_page(index, args.output_file, args.inline_css)
+        print(f"Archive page with {count} articles saved to: {args.output_file}")
+    elif args.command == 'compact':
+        index.compact()
+        print(f"Merged into {len(index.segments)} segment")
+    else:
+        stats = index.stats()
+        print(f"Articles: {stats['articles']} ({stats['documents']} documents)")
+        print(f"Segments: {stats['segments']}")
+        print(f"Terms: {stats['terms']}")
+
+if __name__ == "__main__":
+    main()
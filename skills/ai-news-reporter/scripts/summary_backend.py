@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+AI News Summary Backend
+Batched, concurrent client for a remote summarization service, with
+in-flight coalescing, retries with backoff and per-text fallback
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from async_http import ConnectionPool, HTTPError
+
+DEFAULT_BATCH_SIZE = 16
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+DEFAULT_TIMEOUT = 30.0
+
+# Statuses worth another attempt; any other error status fails the batch at once
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+Summary = Tuple[str, List[str]]
+
+class BackendError(Exception):
+    """Raised when the service answers with an error or a malformed response"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+def text_key(title: str, description: str) -> str:
+    """Identity of an article text, used to merge duplicate in-flight requests"""
+    return hashlib.sha1(f"{title}\0{description}".encode('utf-8')).hexdigest()
+
+def parse_results(payload: bytes, expected: int) -> List[Summary]:
+    """
+    Decode a service response of the form {"results": [{"summary", "keywords"}]}
+
+    Raises:
+        BackendError: If the body is not a result list of the expected length
+    """
+    try:
+        results = json.loads(payload)['results']
+        if len(results) != expected:
+            raise ValueError(f"{len(results)} results for {expected} articles")
+        return [(str(result['summary']), [str(keyword) for keyword in result.get('keywords') or ()])
+                for result in results]
+    except (ValueError, KeyError, TypeError) as e:
+        raise BackendError(f"Malformed response: {e}") from e
+
+class HTTPBackend:
+    """
+    Summarize articles with a remote service, many articles per request
+
+    Texts are split into batches of batch_size and the batches are posted
+    concurrently, at most `concurrency` at a time (the connection pool's
+    per-host limit). A text already in flight, from this call or another,
+    waits for that request instead of being sent again. Failed requests are
+    retried with exponential backoff; texts whose batch still fails come
+    back as None so the caller can fall back to the rule-based summarizer.
+
+    The client runs its own event loop on a background thread, so
+    summarize() can be called from plain code and from inside a running
+    event loop alike.
+    """
+
+    def __init__(self, url: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Start the client
+
+        Args:
+            url: Endpoint accepting POST {"articles": [{"title", "description"}]}
+            batch_size: Articles per request
+            concurrency: Maximum requests in flight
+            retries: Extra attempts per batch after a failure
+            backoff: Seconds before the first retry; doubled for every further one
+            timeout: Seconds allowed per request
+        """
+        # Constructor arguments, for opening the same backend in worker processes
+        self.options = dict(url=url, batch_size=batch_size, concurrency=concurrency,
+                            retries=retries, backoff=backoff, timeout=timeout)
+        self.name = url
+        self.url = url
+        self.batch_size = max(batch_size, 1)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.requests = 0
+        self.retried = 0
+        self.coalesced = 0
+        self.failed = 0
+
+        self._pool = ConnectionPool(per_host=max(concurrency, 1))
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name='summary-backend', daemon=True)
+        self._thread.start()
+
+    def summarize(self, texts: List[Tuple[str, str]]) -> List[Optional[Summary]]:
+        """
+        Summarize texts, blocking until every result is in
+
+        Args:
+            texts: (title, cleaned description) pairs
+
+        Returns:
+            (summary, keywords) tuples in input order; None where the service failed
+        """
+        if not texts:
+            return []
+        future = asyncio.run_coroutine_threadsafe(self.summarize_async(texts), self._loop)
+        return future.result()
+
+    async def summarize_async(self, texts: List[Tuple[str, str]]) -> List[Optional[Summary]]:
+        """Coroutine behind summarize(); must run on the backend's loop"""
+        keys = [text_key(title, description) for title, description in texts]
+        waiting: Dict[str, asyncio.Future] = {}
+        outgoing: List[Tuple[str, Tuple[str, str]]] = []
+        for key, text in zip(keys, texts):
+            if key in waiting:
+                continue
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._loop.create_future()
+                self._inflight[key] = future
+                outgoing.append((key, text))
+            else:
+                self.coalesced += 1
+            waiting[key] = future
+
+        batches = [outgoing[i:i + self.batch_size]
+                   for i in range(0, len(outgoing), self.batch_size)]
+        await asyncio.gather(*(self._run_batch(batch) for batch in batches))
+        await asyncio.gather(*waiting.values())
+        return [waiting[key].result() for key in keys]
+
+    async def _run_batch(self, batch: List[Tuple[str, Tuple[str, str]]]):
+        """Send one batch and resolve the in-flight futures of its texts"""
+        results: List[Optional[Summary]] = [None] * len(batch)
+        try:
+            results = await self._post_with_retries([text for _, text in batch])
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"⚠️  Summary backend failed for {len(batch)} articles: {e}")
+        finally:
+            for (key, _), result in zip(batch, results):
+                future = self._inflight.pop(key)
+                if not future.done():
+                    future.set_result(result)
+
+    async def _post_with_retries(self, texts: List[Tuple[str, str]]) -> List[Summary]:
+        attempt = 0
+        while True:
+            try:
+                return await asyncio.wait_for(self._post(texts), self.timeout)
+            except BackendError as e:
+                if not e.retryable or attempt >= self.retries:
+                    raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HTTPError):
+                if attempt >= self.retries:
+                    raise
+            attempt += 1
+            self.retried += 1
+            # Exponential backoff with jitter, so failed batches do not retry in lockstep
+            await asyncio.sleep(self.backoff * 2 ** (attempt - 1) * (0.5 + random.random()))
+
+    async def _post(self, texts: List[Tuple[str, str]]) -> List[Summary]:
+        body = json.dumps({'articles': [{'title': title, 'description': description}
+                                        for title, description in texts]},
+                          ensure_ascii=False).encode('utf-8')
+        self.requests += 1
+        response = await self._pool.request(
+            'POST', self.url, headers={'Content-Type': 'application/json'}, body=body)
+        payload = await response.read()
+        if response.status != 200:
+            raise BackendError(f"HTTP {response.status}",
+                               retryable=response.status in RETRYABLE_STATUSES)
+        return parse_results(payload, len(texts))
+
+    def summary(self) -> str:
+        """One line of request statistics for this session"""
+        return (f"{self.requests} requests, {self.retried} retried, "
+                f"{self.coalesced} coalesced, {self.failed} fell back")
+
+    def close(self):
+        """Close pooled connections and stop the client's event loop"""
+        self._loop.call_soon_threadsafe(self._pool.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+def open_backend(args) -> Optional[HTTPBackend]:
+    """Open the backend configured by --summary-backend and its tuning options"""
+    if not args.summary_backend:
+        return None
+    return HTTPBackend(args.summary_backend, batch_size=args.summary_batch,
+                       concurrency=args.summary_concurrency, retries=args.summary_retries)
+
+def close_backend(backend: Optional[HTTPBackend], report: bool = True):
+    """Report request statistics and stop the backend"""
+    if backend is None:
+        return
+    if report:
+        print(f"Summary backend: {backend.summary()}")
+    backend.close()
+
+def add_backend_arguments(parser: argparse.ArgumentParser):
+    """Add the summary backend options shared by the processing scripts"""
+    parser.add_argument('--summary-backend', metavar='URL',
+                        help="Summarization service endpoint (default: built-in rules); "
+                             "failed articles fall back to the rules")
+    parser.add_argument('--summary-batch', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Articles per backend request (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument('--summary-concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Backend requests in flight (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--summary-retries', type=int, default=DEFAULT_RETRIES,
+                        help=f"Retries per failed backend request (default: {DEFAULT_RETRIES})")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+AI News Summary Cache
+Persistent, content-addressed SQLite cache for generated summaries and keywords
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from term_matcher import lexicon_version
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+def content_key(title: str, description: str, version: str) -> str:
+    """Hash an article's text together with the rule set version"""
+    payload = f"{version}\0{title}\0{description}".encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+class SummaryCache:
+    """
+    SQLite-backed cache of (summary, keywords) keyed by article content
+
+    Entries written under a different rule set version are dropped when the
+    cache is opened, and the least recently used entries are evicted once
+    the stored payload exceeds max_bytes. Results of a summarization
+    backend are keyed apart from the rule-based ones.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 backend: Optional[str] = None):
+        """
+        Open (or create) the cache
+
+        Args:
+            path: SQLite database file
+            max_bytes: Payload size above which old entries are evicted
+            backend: Name of the summarization backend, None for the rules
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self.version = lexicon_version()
+        self.namespace = self.version if backend is None else f"{self.version}\0{backend}"
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                keywords TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS summaries_last_used ON summaries (last_used);
+        """)
+        with self._conn:
+            # Term tables changed: everything cached under the old rules is stale
+            self._conn.execute("DELETE FROM summaries WHERE version != ?", (self.version,))
+
+    def refresh(self) -> bool:
+        """
+        Follow a reloaded lexicon: key new entries under its version and drop
+        the entries of the old one
+
+        Returns:
+            True if the rule set version changed
+        """
+        version = lexicon_version()
+        if version == self.version:
+            return False
+        self.version = version
+        self.namespace = version if self.backend is None else f"{version}\0{self.backend}"
+        with self._conn:
+            self._conn.execute("DELETE FROM summaries WHERE version != ?", (version,))
+        return True
+
+    def key(self, title: str, description: str) -> str:
+        """Return the cache key for an article under the current rule set and backend"""
+        return content_key(title, description, self.namespace)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[str, List[str]]]:
+        """
+        Look up several keys at once
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of key to (summary, keywords) for every key that was found
+        """
+        found: Dict[str, Tuple[str, List[str]]] = {}
+        unique = list(dict.fromkeys(keys))
+        # Stay well below SQLite's host parameter limit
+        for i in range(0, len(unique), 500):
+            batch = unique[i:i + 500]
+            marks = ','.join('?' * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, summary, keywords FROM summaries WHERE key IN ({marks})",
+                batch)
+            for key, summary, keywords in rows:
+                found[key] = (summary, json.loads(keywords))
+
+        if found:
+            now = time.time()
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE summaries SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found])
+
+        self.hits += sum(1 for key in keys if key in found)
+        self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, entries: Iterable[Tuple[str, str, List[str]]]):
+        """
+        Store several results in one transaction
+
+        Args:
+            entries: (key, summary, keywords) tuples
+        """
+        now = time.time()
+        rows = []
+        for key, summary, keywords in entries:
+            keywords_json = json.dumps(keywords, ensure_ascii=False)
+            size = len(key) + len(summary.encode('utf-8')) + len(keywords_json.encode('utf-8'))
+            rows.append((key, self.version, summary, keywords_json, size, now))
+        if rows:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def total_bytes(self) -> int:
+        """Return the payload size currently stored"""
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()
+        return row[0]
+
+    def evict(self) -> int:
+        """
+        Drop least recently used entries until the cache fits in max_bytes
+
+        Returns:
+            Number of entries removed
+        """
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return 0
+
+        # Trim to 90% of the budget so eviction does not run on every write
+        excess += self.max_bytes // 10
+        doomed = []
+        for key, size in self._conn.execute(
+                "SELECT key, size FROM summaries ORDER BY last_used"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        with self._conn:
+            self._conn.executemany("DELETE FROM summaries WHERE key = ?", doomed)
+        return len(doomed)
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
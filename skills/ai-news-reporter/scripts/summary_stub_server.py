@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+AI News Summary Stub Server
+Local HTTP stand-in for a summarization service, for testing and
+benchmarking the summary backend without touching the network
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+from batch_tagger import get_tagger
+from process_news import summarize_batch
+
+class SummaryHandler(BaseHTTPRequestHandler):
+    """
+    Answer POST {"articles": [{"title", "description"}]} with
+    {"results": [{"summary", "keywords"}]} over keep-alive HTTP/1.1
+
+    Results come from the rule-based summarizer, so a run through the stub
+    produces the same output as a run without a backend. A fail_rate share
+    of requests is answered with 503 to exercise retries and fallback, and
+    GET /stats reports the request counters.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle's
+    # algorithm and delayed ACKs add ~40ms to every keep-alive response
+    disable_nagle_algorithm = True
+    delay = 0.0
+    fail_rate = 0.0
+    stats: Dict[str, int] = {}
+    lock = threading.Lock()
+    rng = random.Random(0)
+
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != '/stats':
+            self._send_json(404, {'error': 'not found'})
+            return
+        with self.lock:
+            self._send_json(200, dict(self.stats))
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.delay:
+            time.sleep(self.delay)
+        with self.lock:
+            self.stats['requests'] += 1
+            failing = self.rng.random() < self.fail_rate
+            if failing:
+                self.stats['failures'] += 1
+        if failing:
+            self._send_json(503, {'error': 'overloaded'})
+            return
+
+        try:
+            articles = json.loads(body)['articles']
+            texts = [(article['title'], article.get('description', '')) for article in articles]
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        results = summarize_batch(texts)
+        with self.lock:
+            self.stats['articles'] += len(texts)
+        self._send_json(200, {'results': [{'summary': summary, 'keywords': keywords}
+                                          for summary, keywords in results]})
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_summaries(port: int = 0, delay: float = 0.0, fail_rate: float = 0.0,
+                    seed: int = 0) -> ThreadingHTTPServer:
+    """
+    Start the stub server on a background thread
+
+    Args:
+        port: Port to bind on localhost (0 picks a free port)
+        delay: Seconds to wait before answering each request
+        fail_rate: Share of requests answered with 503 Service Unavailable
+        seed: Seed of the failure pattern
+
+    Returns:
+        The running server; call shutdown() to stop it
+    """
+    # Build the tagger before request threads race to do it
+    get_tagger()
+    handler = type('BoundSummaryHandler', (SummaryHandler,), {
+        'delay': delay, 'fail_rate': fail_rate, 'rng': random.Random(seed),
+        'lock': threading.Lock(), 'stats': {'requests': 0, 'failures': 0, 'articles': 0}})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a stand-in summarization API on localhost")
+    parser.add_argument('--port', type=int, default=8766, help="Port (default: 8766)")
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help="Seconds to wait before each response (default: 0)")
+    parser.add_argument('--fail-rate', type=float, default=0.0,
+                        help="Share of requests answered with 503 (default: 0)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Random seed of the failure pattern (default: 0)")
+    args = parser.parse_args()
+
+    server = serve_summaries(args.port, args.delay, args.fail_rate, args.seed)
+    port = server.server_address[1]
+    print(f"Serving summaries on http://127.0.0.1:{port}/summarize (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
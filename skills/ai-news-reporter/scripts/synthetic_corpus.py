@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+AI News Synthetic Corpus
+Generates realistic synthetic article corpora and RSS/Atom feeds, seeded
+from the bundled sample data and raw_data captures, for benchmarking
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import re
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict, Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+from feed_parser import clean_text
+from news_io import write_articles
+
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CDATA_RE = re.compile(r'<!\[CDATA\[(.*?)\]\]>', re.S)
+# Element text is either CDATA or plain text; the captures contain truncated
+# elements, so a match never runs across a '<'
+_TITLE_RE = re.compile(r'<title>(<!\[CDATA\[[^\]]*\]\]>|[^<]*)</title>')
+_DESCRIPTION_RE = re.compile(r'<description>(<!\[CDATA\[[^\]]*\]\]>|[^<]*)</description>')
+_LINK_HOST_RE = re.compile(r'<link>https?://([^/<\s]+)')
+_SOURCE_RE = re.compile(r'"source":\s*"(\w+)"')
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# Used only when no seed files can be read
+FALLBACK_TITLES = [
+    "OpenAI Announces GPT-5 with Enhanced Reasoning Capabilities",
+    "Google DeepMind Releases New Robotics Foundation Model",
+    "Anthropic Raises New Funding Round to Scale Claude",
+    "Meta Open-Sources Llama Model for Enterprise Developers",
+    "NVIDIA Unveils Next-Generation AI Training Chips",
+]
+FALLBACK_DESCRIPTIONS = [
+    "The new model improves reasoning and coding benchmarks while cutting inference cost.",
+    "Researchers say the system generalizes across tasks with far less training data.",
+    "The funding will be used to expand compute capacity and hire safety researchers.",
+]
+
+class Seeds:
+    """Text pools that synthetic articles are assembled from"""
+
+    def __init__(self, titles: List[str], descriptions: List[str],
+                 sources: List[str], hosts: List[str]):
+        self.titles = titles or list(FALLBACK_TITLES)
+        self.descriptions = descriptions or list(FALLBACK_DESCRIPTIONS)
+        self.sources = sources or ['TechCrunch']
+        self.hosts = hosts or ['techcrunch.com']
+        self.vocabulary = sorted({word for title in self.titles
+                                  for word in title.split() if word.isalpha()})
+
+def default_seed_files() -> List[str]:
+    """The bundled sample data plus every raw_data capture"""
+    return ([os.path.join(SKILL_DIR, 'examples', 'sample_news_data.json')]
+            + sorted(glob.glob(os.path.join(SKILL_DIR, 'raw_data', '*.json'))))
+
+def _unwrap(text: str) -> str:
+    return clean_text(_CDATA_RE.sub(r'\1', text))
+
+def load_seeds(paths: Optional[List[str]] = None) -> Seeds:
+    """
+    Collect titles, descriptions, sources and hosts from seed files
+
+    The raw_data captures are not valid JSON (they embed raw feed XML), so
+    every file is scanned as text for feed elements and source names.
+
+    Args:
+        paths: Seed files (default: default_seed_files())
+
+    Returns:
+        Deduplicated seed pools
+    """
+    titles, descriptions, sources, hosts = {}, {}, {}, {}
+    for path in paths or default_seed_files():
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        for match in _TITLE_RE.findall(text):
+            titles.setdefault(_unwrap(match), None)
+        for match in _DESCRIPTION_RE.findall(text):
+            descriptions.setdefault(_unwrap(match), None)
+        for match in _LINK_HOST_RE.findall(text):
+            hosts.setdefault(match, None)
+        for match in _SOURCE_RE.findall(text):
+            sources.setdefault(match, None)
+        try:
+            for article in json.loads(text):
+                titles.setdefault(article.get('title', ''), None)
+        except (ValueError, AttributeError):
+            pass
+
+    # Site-level titles ("AI News | TechCrunch") and blurbs are not articles;
+    # multi-line matches come from the captures' mangled records
+    return Seeds([t for t in titles if len(t.split()) >= 4 and '|' not in t and '\n' not in t],
+                 [d for d in descriptions if len(d.split()) >= 8 and '\n' not in d],
+                 list(sources), list(hosts))
+
+def _reword(text: str, rng: random.Random, vocabulary: List[str], edits: int) -> str:
+    """Replace or insert a few words so generated text is not a verbatim copy"""
+    words = text.split()
+    for _ in range(edits):
+        position = rng.randrange(len(words) + 1)
+        word = rng.choice(vocabulary) if vocabulary else 'AI'
+        if position < len(words) and rng.random() < 0.5:
+            words[position] = word
+        else:
+            words.insert(position, word)
+    return ' '.join(words)
+
+def iter_synthetic_articles(count: int, seed: int = 0, seeds: Optional[Seeds] = None,
+                            duplicate_rate: float = 0.1, hours: float = 48.0,
+                            now: Optional[datetime] = None) -> Iterator[Dict]:
+    """
+    Generate raw articles in the fetcher's record format
+
+    Every article recombines seed titles and descriptions with a few
+    reworded words; a duplicate_rate fraction are lightly reworded copies of
+    a recent article under another source, as happens with syndicated news.
+    The output depends only on the arguments.
+
+    Args:
+        count: Number of articles
+        seed: Random seed
+        seeds: Seed pools (default: load_seeds())
+        duplicate_rate: Fraction of near-duplicate articles
+        hours: Publication dates are spread over this many hours before now
+        now: Reference time (default: the current time)
+
+    Yields:
+        Raw article dicts
+    """
+    seeds = seeds or load_seeds()
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    recent = deque(maxlen=256)
+
+    for i in range(count):
+        if recent and rng.random() < duplicate_rate:
+            original = rng.choice(recent)
+            title = _reword(original['title'], rng, seeds.vocabulary, 1)
+            description = original['description']
+        else:
+            title = _reword(rng.choice(seeds.titles), rng, seeds.vocabulary, 2)
+            description = _reword(rng.choice(seeds.descriptions), rng, seeds.vocabulary, 3)
+
+        published = now - timedelta(seconds=rng.uniform(0, hours * 3600))
+        slug = _SLUG_RE.sub('-', title.lower()).strip('-')[:60]
+        article = {
+            'source': rng.choice(seeds.sources),
+            'title': title,
+            'link': f"https://{rng.choice(seeds.hosts)}/{published:%Y/%m/%d}/{slug}-{i}/",
+            'pubDate': format_datetime(published),
+            'description': description,
+        }
+        recent.append(article)
+        yield article
+
+def render_rss(source: str, articles: List[Dict]) -> bytes:
+    """Render articles as an RSS 2.0 document"""
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>',
+             f"<title>{escape(source)}</title>"]
+    for article in articles:
+        parts.append(
+            f"<item><title>{escape(article['title'])}</title>"
+            f"<link>{escape(article['link'])}</link>"
+            f"<pubDate>{article['pubDate']}</pubDate>"
+            f"<description><![CDATA[<p>{article['description']}</p>]]></description></item>")
+    parts.append('</channel></rss>\n')
+    return ''.join(parts).encode('utf-8')
+
+def render_atom(source: str, articles: List[Dict]) -> bytes:
+    """Render articles as an Atom document"""
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<feed xmlns="http://www.w3.org/2005/Atom">',
+             f"<title>{escape(source)}</title>"]
+    for article in articles:
+        parts.append(
+            f"<entry><title>{escape(article['title'])}</title>"
+            f"<link rel=\"alternate\" href=\"{escape(article['link'])}\"/>"
+            f"<published>{article['pubDate']}</published>"
+            f"<summary type=\"html\">{escape(article['description'])}</summary></entry>")
+    parts.append('</feed>\n')
+    return ''.join(parts).encode('utf-8')
+
+def render_feeds(articles: List[Dict]) -> Dict[str, bytes]:
+    """
+    Group articles by source into feed documents
+
+    Sources alternate between RSS 2.0 and Atom so both parser paths are
+    exercised.
+
+    Returns:
+        Feed file name -> document bytes
+    """
+    by_source: Dict[str, List[Dict]] = {}
+    for article in articles:
+        by_source.setdefault(article['source'], []).append(article)
+    feeds = {}
+    for index, (source, items) in enumerate(sorted(by_source.items())):
+        if index % 2:
+            feeds[f"{source}.atom"] = render_atom(source, items)
+        else:
+            feeds[f"{source}.xml"] = render_rss(source, items)
+    return feeds
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic raw news corpus (and optionally feeds)")
+    parser.add_argument('output_file', help="Raw news JSON or NDJSON file to write")
+    parser.add_argument('--count', type=int, default=1000, help="Articles (default: 1000)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument('--duplicate-rate', type=float, default=0.1,
+                        help="Fraction of near-duplicate articles (default: 0.1)")
+    parser.add_argument('--hours', type=float, default=48.0,
+                        help="Spread publication dates over this many hours (default: 48)")
+    parser.add_argument('--feeds-dir', metavar='DIR',
+                        help="Also write one RSS/Atom feed per source (servable by feed_stub_server.py)")
+    args = parser.parse_args()
+
+    articles = iter_synthetic_articles(args.count, args.seed,
+                                       duplicate_rate=args.duplicate_rate, hours=args.hours)
+    if args.feeds_dir:
+        articles = list(articles)
+        os.makedirs(args.feeds_dir, exist_ok=True)
+        for filename, data in render_feeds(articles).items():
+            with open(os.path.join(args.feeds_dir, filename), 'wb') as f:
+                f.write(data)
+        print(f"Feeds saved to: {args.feeds_dir}")
+
+    count = write_articles(args.output_file, articles)
+    print(f"Generated {count} synthetic articles in {args.output_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+AI News Term Matcher
+Loads the term tables from the lexicon file and compiles them into one
+Aho-Corasick automaton so filtering, summarization and keyword extraction
+share a single pass over the text. Compiled lexicons are cached on disk and
+reloaded when the lexicon file changes
+"""
+
+import argparse
+import hashlib
+import json
+import marshal
+import os
+import sys
+import time
+from collections import deque
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LEXICON = os.path.join(SKILL_DIR, 'references', 'lexicon.json')
+# Environment variable naming another lexicon file
+LEXICON_ENV = 'AI_NEWS_LEXICON'
+# Compiled lexicons are cached here, one file per lexicon file
+COMPILED_DIR = os.path.join(SKILL_DIR, 'cache')
+
+# Bump when summary/keyword logic changes without a term table change
+RULESET_REVISION = 1
+# Bump when the compiled structures change
+COMPILED_FORMAT = 2
+
+# Term lists of a lexicon file, by key, and the matcher category of each
+TERM_TABLES = {
+    'ai_filter': 'ai_filter',     # AI-related keywords used by the fetch filter
+    'ai_terms': 'ai_term',        # Common AI terms mapping (English -> Chinese)
+    'keywords': 'keyword',        # Common AI-related keywords
+    'companies': 'company',       # Technology companies
+    'institutions': 'institution',  # Research institutions
+}
+
+# States this close to the root keep full transition tables; there are at
+# most (alphabet size)^depth of them whatever the lexicon size, and scanning
+# spends most of its time there
+DENSE_DEPTH = 2
+
+# Rule tables: (label, trigger terms), evaluated in order. 'tag' rules add
+# topic tags to the keywords (every matching rule applies)
+RULE_TABLE_NAMES = ('subject', 'topic', 'action', 'domain', 'significance', 'tag')
+
+
+class LexiconError(ValueError):
+    """Raised when a lexicon file cannot be parsed or lacks a table"""
+
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton over (category, term) pairs
+
+    Terms are matched case-insensitively as plain substrings, which is
+    exactly what the `term in text.lower()` checks it replaces did.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        """
+        Build the automaton
+
+        Args:
+            entries: (category, term) pairs; a term may appear in several
+                categories and is reported for each of them
+        """
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[str, str]]] = [[]]
+
+        for category, term in entries:
+            state = 0
+            for ch in term.lower():
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            if (category, term) not in outputs[state]:
+                outputs[state].append((category, term))
+
+        # Breadth-first pass: resolve failure links and fold them into the
+        # transition tables so scanning never has to backtrack. Deep states
+        # only keep the transitions that differ from the root's, so memory
+        # stays linear in the lexicon size; any other character leads where
+        # it would from the root. The root and shallow states list every
+        # character of the lexicon, returning to the root included, so the
+        # common case is a single lookup
+        alphabet = {ch for table in goto for ch in table}
+        root = {ch: goto[0].get(ch, 0) for ch in sorted(alphabet)}
+        fail = [0] * len(goto)
+        depth = [0] * len(goto)
+        delta: List[Dict[str, int]] = [root]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        for state in queue:
+            depth[state] = 1
+        while queue:
+            state = queue.popleft()
+            inherited = delta[fail[state]]
+            if depth[state] <= DENSE_DEPTH:
+                table = dict(root, **inherited) if fail[state] else dict(root)
+            elif depth[fail[state]] <= DENSE_DEPTH:
+                table = {ch: nxt for ch, nxt in inherited.items() if root.get(ch) != nxt}
+            else:
+                table = dict(inherited)
+            for ch, nxt in goto[state].items():
+                fallback = inherited.get(ch)
+                fail[nxt] = root[ch] if fallback is None else fallback
+                depth[nxt] = depth[state] + 1
+                outputs[nxt] = outputs[nxt] + [
+                    o for o in outputs[fail[nxt]] if o not in outputs[nxt]
+                ]
+                table[ch] = nxt
+                queue.append(nxt)
+            delta[state] = table
+
+        self._delta = delta
+        self._outputs = [tuple(o) for o in outputs]
+
+    @property
+    def states(self) -> int:
+        """Number of automaton states"""
+        return len(self._delta)
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        """
+        Find every term occurring in text in a single pass
+
+        Args:
+            text: Text to scan (lowercased internally)
+
+        Returns:
+            Mapping of category to the set of terms found for it
+        """
+        delta = self._delta
+        root = delta[0]
+        outputs = self._outputs
+        hit_states = set()
+        state = 0
+        for ch in text.lower():
+            nxt = delta[state].get(ch)
+            state = root.get(ch, 0) if nxt is None else nxt
+            if outputs[state]:
+                hit_states.add(state)
+
+        matches: Dict[str, Set[str]] = {}
+        for hit in hit_states:
+            for category, term in outputs[hit]:
+                matches.setdefault(category, set()).add(term)
+        return matches
+
+
+class Lexicon:
+    """
+    The term tables of one lexicon file, compiled for matching
+
+    Besides the automaton, every term and rule gets its rank in its table,
+    so lookups walk the handful of matched terms in table order instead of
+    walking whole tables.
+    """
+
+    def __init__(self, tables: Dict):
+        """
+        Compile parsed lexicon tables
+
+        Args:
+            tables: Lexicon file content: the TERM_TABLES lists ('ai_terms'
+                maps each term to its Chinese translation) and 'rules', a
+                mapping of RULE_TABLE_NAMES to [label, [terms]] lists
+
+        Raises:
+            LexiconError: If a table is missing or malformed
+        """
+        try:
+            self.ai_filter: List[str] = [str(term) for term in tables['ai_filter']]
+            self.ai_terms: Dict[str, str] = {str(term): str(chinese)
+                                             for term, chinese in tables['ai_terms'].items()}
+            self.keywords: List[str] = [str(term) for term in tables['keywords']]
+            self.companies: List[str] = [str(term) for term in tables['companies']]
+            self.institutions: List[str] = [str(term) for term in tables['institutions']]
+            self.rules: Dict[str, List[Tuple[str, List[str]]]] = {
+                table: [(str(label), [str(term) for term in terms])
+                        for label, terms in tables['rules'].get(table, ())]
+                for table in RULE_TABLE_NAMES
+            }
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise LexiconError(f"Malformed lexicon: {e!r}") from e
+
+        entries = self.entries()
+        payload = json.dumps([RULESET_REVISION, entries], ensure_ascii=False)
+        self.version = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+        self.matcher = TermMatcher(entries)
+
+        self.company_set: FrozenSet[str] = frozenset(self.companies)
+        # Lowercased keywords and companies, the terms counted for relevance
+        self.relevance_terms: FrozenSet[str] = frozenset(
+            term.lower() for term in self.keywords + self.companies)
+        self.keyword_ranks = _ranks(self.keywords)
+        self.company_ranks = _ranks(self.companies)
+        # table -> matcher category of each rule -> (rank, label)
+        self.rule_ranks: Dict[str, Dict[str, Tuple[int, str]]] = {
+            table: {f'{table}:{label}': (rank, label)
+                    for rank, (label, _) in reversed(list(enumerate(rules)))}
+            for table, rules in self.rules.items()
+        }
+        self.labels: Dict[str, FrozenSet[str]] = {
+            table: frozenset(label for label, _ in rules) for table, rules in self.rules.items()
+        }
+
+        # Where the lexicon was loaded from: file path and (mtime_ns, size)
+        self.source: Optional[str] = None
+        self.stamp: Optional[Tuple[int, int]] = None
+
+    def entries(self) -> List[Tuple[str, str]]:
+        """Flatten all term tables into (category, term) pairs"""
+        entries = []
+        for key, category in TERM_TABLES.items():
+            entries += [(category, term) for term in getattr(self, key)]
+        for table, rules in self.rules.items():
+            for label, terms in rules:
+                entries += [(f'{table}:{label}', term) for term in terms]
+        return entries
+
+
+def _ranks(terms: List[str]) -> Dict[str, int]:
+    """Position of each term's first occurrence"""
+    ranks: Dict[str, int] = {}
+    for rank, term in enumerate(terms):
+        ranks.setdefault(term, rank)
+    return ranks
+
+
+def lexicon_path() -> str:
+    """The lexicon file in use: $AI_NEWS_LEXICON or references/lexicon.json"""
+    return os.path.abspath(os.environ.get(LEXICON_ENV) or DEFAULT_LEXICON)
+
+
+def compiled_path(path: str) -> str:
+    """Compiled cache file of a lexicon file"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:8]
+    return os.path.join(COMPILED_DIR, f"{name}-{digest}.bin")
+
+
+def _stamp(path: str) -> Tuple[int, int]:
+    info = os.stat(path)
+    return info.st_mtime_ns, info.st_size
+
+
+# Compiled files are only read back by the same marshal format
+_FORMAT = (COMPILED_FORMAT, RULESET_REVISION, marshal.version)
+
+
+def _read_compiled(cache_file: str, stamp: Tuple[int, int],
+                   digest: Callable[[], str]) -> Optional[Lexicon]:
+    """
+    Load a compiled lexicon if it was built from the current file
+
+    A matching mtime and size are trusted, otherwise the content hash
+    decides.
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            # One read: marshal.load() on a file object reads piece by piece
+            compiled_format, compiled_stamp, sha256, state = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if compiled_format != _FORMAT or (compiled_stamp != stamp and sha256 != digest()):
+        return None
+
+    # Plain containers only, so the file does not depend on where the
+    # classes were imported from
+    matcher = TermMatcher.__new__(TermMatcher)
+    matcher.__dict__.update(state.pop('matcher'))
+    lexicon = Lexicon.__new__(Lexicon)
+    lexicon.__dict__.update(state)
+    lexicon.matcher = matcher
+    return lexicon
+
+
+def _write_compiled(cache_file: str, lexicon: Lexicon, stamp: Tuple[int, int], sha256: str):
+    """Save a compiled lexicon with the header it is validated by (best effort)"""
+    state = dict(vars(lexicon), matcher=vars(lexicon.matcher), source=None, stamp=None)
+    tmp_path = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            marshal.dump((_FORMAT, stamp, sha256, state), f)
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        # A read-only cache directory only costs recompiling next time
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_lexicon(path: Optional[str] = None, use_cache: bool = True) -> Lexicon:
+    """
+    Load a lexicon file, from its compiled cache when the file is unchanged
+
+    The cache is rebuilt only when the file's mtime or size changed and
+    its content hash did too; a file that was merely touched keeps its
+    compiled form.
+
+    Args:
+        path: Lexicon JSON file (default: lexicon_path())
+        use_cache: Read and write the compiled cache in COMPILED_DIR
+
+    Returns:
+        Compiled lexicon
+
+    Raises:
+        OSError: If the file cannot be read
+        LexiconError: If the file is not a valid lexicon
+    """
+    path = os.path.abspath(path or lexicon_path())
+    stamp = _stamp(path)
+    cache_file = compiled_path(path)
+    data: List[bytes] = []
+
+    def digest() -> str:
+        if not data:
+            with open(path, 'rb') as f:
+                data.append(f.read())
+        return hashlib.sha256(data[0]).hexdigest()
+
+    lexicon = _read_compiled(cache_file, stamp, digest) if use_cache else None
+    if lexicon is None:
+        sha256 = digest()
+        try:
+            tables = json.loads(data[0].decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise LexiconError(f"{path}: {e}") from e
+        if not isinstance(tables, dict):
+            raise LexiconError(f"{path}: expected a JSON object")
+        lexicon = Lexicon(tables)
+        if use_cache:
+            _write_compiled(cache_file, lexicon, stamp, sha256)
+    elif data:
+        # Same content under a new mtime: refresh the header for next time
+        _write_compiled(cache_file, lexicon, stamp, digest())
+
+    lexicon.source = path
+    lexicon.stamp = stamp
+    return lexicon
+
+
+_lexicon: Optional[Lexicon] = None
+# (path, stamp) of the last file revision that failed to load
+_rejected: Optional[Tuple[str, Tuple[int, int]]] = None
+
+
+def get_lexicon() -> Lexicon:
+    """Return the process-wide lexicon, loading it on first use"""
+    global _lexicon
+    if _lexicon is None:
+        _lexicon = load_lexicon()
+    return _lexicon
+
+
+def reload_lexicon() -> bool:
+    """
+    Switch to the lexicon file's current content if it changed since loading
+
+    Only a stat() is paid while the file is unchanged. A file that fails to
+    load is reported and the current lexicon stays in use.
+
+    Returns:
+        True when the term tables in use changed
+    """
+    global _lexicon, _rejected
+    current = get_lexicon()
+    path = os.path.abspath(lexicon_path())
+    try:
+        stamp = _stamp(path)
+        if (path, stamp) in ((current.source, current.stamp), _rejected):
+            return False
+        lexicon = load_lexicon(path)
+    except OSError as e:
+        print(f"⚠️  Keeping the current lexicon: {e}")
+        return False
+    except LexiconError as e:
+        # Warn once per broken revision of the file, not on every poll
+        _rejected = (path, stamp)
+        print(f"⚠️  Keeping the current lexicon: {e}")
+        return False
+    _lexicon = lexicon
+    return lexicon.version != current.version
+
+
+def get_matcher() -> TermMatcher:
+    """Return the matcher of the process-wide lexicon"""
+    return get_lexicon().matcher
+
+
+def first_rule(matches: Dict[str, Set[str]], table: str, default: str = '') -> str:
+    """Return the label of the first rule in a rule table that matched"""
+    ranks = get_lexicon().rule_ranks[table]
+    found = [ranks[category] for category in matches if category in ranks]
+    return min(found)[1] if found else default
+
+
+def matched_rules(matches: Dict[str, Set[str]], table: str) -> List[str]:
+    """Return the labels of every rule in a rule table that matched, in order"""
+    ranks = get_lexicon().rule_ranks[table]
+    return [label for _, label in sorted(ranks[category] for category in matches
+                                         if category in ranks)]
+
+
+def lexicon_entries() -> List[Tuple[str, str]]:
+    """Flatten all term tables of the current lexicon into (category, term) pairs"""
+    return get_lexicon().entries()
+
+
+def lexicon_version() -> str:
+    """Return a short hash identifying the current term tables and rule logic"""
+    return get_lexicon().version
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile a lexicon file into its cached binary form and report on it")
+    parser.add_argument('lexicon', nargs='?',
+                        help=f"Lexicon JSON file (default: ${LEXICON_ENV} or references/lexicon.json)")
+    parser.add_argument('--force', action='store_true',
+                        help="Recompile even if the cached binary is current")
+    args = parser.parse_args()
+
+    path = os.path.abspath(args.lexicon or lexicon_path())
+    started = time.perf_counter()
+    try:
+        if args.force and os.path.exists(compiled_path(path)):
+            os.remove(compiled_path(path))
+        lexicon = load_lexicon(path)
+    except (OSError, LexiconError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+
+    print(f"Lexicon {path} (version {lexicon.version})")
+    print(f"  {len(lexicon.entries())} entries, {lexicon.matcher.states} matcher states, "
+          f"{sum(len(rules) for rules in lexicon.rules.values())} rules")
+    print(f"  Compiled cache: {compiled_path(path)}")
+    print(f"  Loaded in {elapsed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
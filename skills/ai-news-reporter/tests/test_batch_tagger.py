@@ -0,0 +1,62 @@
+import sys
+import threading
+
+import batch_tagger
+from batch_tagger import BatchTagger
+from term_matcher import get_lexicon
+
+BATCHES = [
+    ['openai funding news zz yy', 'Google releases a new machine learning model'],
+    ['Anthropic research on neural network safety', 'openai funding news zz yy'],
+    ['Microsoft invests in robotics startup', 'openai funding news zz yy',
+     'Meta open-sources a large language model'],
+]
+
+def _tags(tagger, texts):
+    tags, _ = tagger.tag(texts)
+    return tags.keywords, tags.topic, tags.subject, tags.action
+
+def test_repeated_words_survive_vocabulary_reset(monkeypatch):
+    uncapped = [_tags(BatchTagger(), batch) for batch in BATCHES]
+
+    monkeypatch.setattr(batch_tagger, 'VOCABULARY_LIMIT', 5)
+    tagger = BatchTagger()
+    capped = [_tags(tagger, batch) for batch in BATCHES]
+
+    assert capped == uncapped
+    assert capped[1][0][1] == ['ai', 'OpenAI', 'funding']
+
+def test_concurrent_batches_share_one_tagger(monkeypatch):
+    # Every batch brings its own terms, and the tiny vocabulary limit makes
+    # each call reset the tables another thread is reading
+    terms = sorted(term for _, term in get_lexicon().entries() if term.isalpha())
+    texts = [f"{terms[i % len(terms)]} word{i} news about {terms[i * 7 % len(terms)]}"
+             for i in range(400)]
+    batches = [texts[i:i + 5] for i in range(0, len(texts), 5)]
+    expected = [_tags(BatchTagger(), batch) for batch in batches]
+
+    monkeypatch.setattr(batch_tagger, 'VOCABULARY_LIMIT', 20)
+    tagger = BatchTagger()
+    results = [None] * len(batches)
+    errors = []
+
+    def run(start):
+        try:
+            for i in range(start, len(batches), 8):
+                results[i] = _tags(tagger, batches[i])
+        except Exception as e:
+            errors.append(e)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(3):
+            threads = [threading.Thread(target=run, args=(start,)) for start in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert not errors
+            assert results == expected
+    finally:
+        sys.setswitchinterval(interval)
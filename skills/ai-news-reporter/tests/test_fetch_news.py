@@ -0,0 +1,104 @@
+import asyncio
+import os
+import shutil
+import socket
+import threading
+
+import pytest
+
+from feed_cache import FETCHED, NOT_MODIFIED, FeedCache
+from feed_parser import parse_feed
+from feed_stub_server import serve_feeds, stub_sources
+from fetch_news import fetch_all
+
+FEEDS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'examples', 'feeds')
+
+@pytest.fixture
+def feeds(tmp_path):
+    """Serve a copy of the recorded feeds; yields (directory, start) where start(delay) serves it"""
+    directory = tmp_path / 'feeds'
+    shutil.copytree(FEEDS_DIR, directory)
+    servers = []
+
+    def start(delay: float = 0.0):
+        server = serve_feeds(str(directory), delay=delay)
+        servers.append(server)
+        return stub_sources(str(directory), server.server_address[1])
+
+    yield directory, start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def _expected(directory, sources):
+    articles = []
+    for name, url in sources:
+        with open(os.path.join(directory, url.rsplit('/', 1)[1]), 'rb') as f:
+            articles += parse_feed(name, f.read())
+    return articles
+
+def _raw_server(response: bytes) -> str:
+    """Answer every connection with a fixed byte string, then hang up"""
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen()
+
+    def serve():
+        while True:
+            connection, _ = listener.accept()
+            with connection:
+                connection.recv(65536)
+                connection.sendall(response)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return f"http://127.0.0.1:{listener.getsockname()[1]}/feed.xml"
+
+def test_fetches_every_source(feeds):
+    directory, start = feeds
+    sources = start()
+    articles = asyncio.run(fetch_all(sources, timeout=5))
+    assert articles == _expected(directory, sources)
+    assert len(articles) > 0
+
+@pytest.mark.parametrize('validator', ['etag', 'last_modified'])
+def test_unchanged_feeds_are_revalidated(feeds, tmp_path, validator):
+    directory, start = feeds
+    sources = start()
+    cache = FeedCache(str(tmp_path / 'feeds.sqlite'), ttl=0)
+    try:
+        first = asyncio.run(fetch_all(sources, timeout=5, cache=cache))
+        assert set(cache.outcomes.values()) == {FETCHED}
+        # Revalidate with one kind of validator only
+        other = 'last_modified' if validator == 'etag' else 'etag'
+        with cache._conn:
+            cache._conn.execute(f"UPDATE feeds SET {other} = NULL")
+        assert all(getattr(cache.get(url), validator) for _, url in sources)
+
+        second = asyncio.run(fetch_all(sources, timeout=5, cache=cache))
+    finally:
+        cache.close()
+    assert set(cache.outcomes.values()) == {NOT_MODIFIED}
+    assert second == first == _expected(directory, sources)
+
+def test_slow_source_times_out_alone(feeds):
+    directory, start = feeds
+    fast = start()
+    slow = [(f"slow_{name}", url) for name, url in start(delay=2.0)][:1]
+    articles = asyncio.run(fetch_all(slow + fast, timeout=0.5))
+    assert articles == _expected(directory, fast)
+
+def test_broken_responses_fail_only_their_source(feeds):
+    directory, start = feeds
+    with open(directory / 'Broken.xml', 'w', encoding='utf-8') as f:
+        f.write('<rss><channel><item><title>Cut off')
+    sources = start()
+    good = [source for source in sources if source[0] != 'Broken']
+    broken = [
+        ('Truncated_chunked', _raw_server(
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n400\r\n<rss><channel>")),
+        ('Bad_status', _raw_server(b"garbage\r\n\r\n")),
+    ]
+    articles = asyncio.run(fetch_all(broken + sources, timeout=5))
+    assert articles == _expected(directory, good)
+    assert len(sources) == len(good) + 1
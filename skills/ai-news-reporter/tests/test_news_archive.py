@@ -0,0 +1,22 @@
+from news_archive import NewsArchive
+
+DAY = 86400
+NOW = 1_790_000_000
+
+def _undated(title):
+    return {'source': 'Blog', 'title': title, 'link': 'https://example.com/undated',
+            'pubDate': 'sometime last week', 'description': 'No usable date'}
+
+def test_undated_article_is_archived_once_across_days(tmp_path):
+    root = str(tmp_path / 'archive')
+    dated = {'source': 'Blog', 'title': 'Dated', 'link': 'https://example.com/dated',
+             'pubDate': 'Mon, 12 Oct 2026 08:00:00 GMT', 'description': ''}
+    assert NewsArchive(root).ingest([_undated('First copy'), dated], now=NOW) == 2
+
+    # A later run, on another day, sees the same undated article again
+    archive = NewsArchive(root)
+    assert archive.ingest([_undated('Second copy')], now=NOW + 3 * DAY) == 0
+
+    records = list(NewsArchive(root).query())
+    assert sorted(record['title'] for record in records) == ['Dated', 'Second copy']
+    assert [r.published for r in records if r['title'] == 'Second copy'] == [NOW]
@@ -0,0 +1,28 @@
+import pytest
+
+from news_io import load_articles, write_articles
+from process_news import process_news
+
+RAW = [{'source': 'TechCrunch', 'title': f"OpenAI announces model {i}",
+        'link': f"https://example.com/{i}", 'pubDate': 'Mon, 12 Oct 2026 08:00:00 GMT',
+        'description': f"<p>The new machine learning model {i} raises funding.</p>"}
+       for i in range(600)]
+
+def _without_timestamps(articles):
+    return [{key: value for key, value in article.items() if key != 'timestamp'}
+            for article in articles]
+
+@pytest.mark.parametrize('name', ['news.json', 'news.ndjson'])
+@pytest.mark.parametrize('incremental', [False, True])
+def test_output_may_overwrite_input(tmp_path, name, incremental):
+    source, in_place = tmp_path / f"source_{name}", tmp_path / name
+    write_articles(str(source), RAW)
+    write_articles(str(in_place), RAW)
+    state = str(tmp_path / 'state.json') if incremental else None
+    expected_path = str(tmp_path / f"expected_{name}")
+
+    assert process_news(str(source), expected_path, chunk_size=64) == len(RAW)
+    assert process_news(str(in_place), str(in_place), chunk_size=64,
+                        state_path=state) == len(RAW)
+    assert _without_timestamps(load_articles(str(in_place))) == \
+        _without_timestamps(load_articles(expected_path))
@@ -0,0 +1,90 @@
+import socket
+import threading
+
+import pytest
+
+from process_news import summarize_batch, summarize_texts
+from summary_backend import HTTPBackend
+from summary_stub_server import serve_summaries
+
+TEXTS = [(f"OpenAI releases model {i}", f"A new language model for task {i} with funding news")
+         for i in range(10)]
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**options):
+        server = serve_summaries(**options)
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}/summarize"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def _stats(server):
+    return server.RequestHandlerClass.stats
+
+def test_texts_are_sent_in_batches(stub):
+    server, url = stub()
+    backend = HTTPBackend(url, batch_size=4, concurrency=2)
+    try:
+        results = backend.summarize(TEXTS)
+    finally:
+        backend.close()
+    assert results == summarize_batch(TEXTS)
+    assert backend.requests == 3
+    assert _stats(server) == {'requests': 3, 'failures': 0, 'articles': 10}
+
+def test_duplicate_texts_are_sent_once(stub):
+    server, url = stub(delay=0.2)
+    backend = HTTPBackend(url, batch_size=4)
+    texts = TEXTS[:4] + TEXTS[:4]
+    results = [None, None]
+
+    def run(slot):
+        results[slot] = backend.summarize(texts)
+
+    try:
+        threads = [threading.Thread(target=run, args=(slot,)) for slot in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        backend.close()
+    assert results[0] == results[1] == summarize_batch(texts)
+    # Duplicates within a call are merged before sending; the second call
+    # waits for the first call's request
+    assert _stats(server)['articles'] == 4
+    assert backend.coalesced == 4
+
+def test_failed_requests_are_retried(stub):
+    # With seed 1 the first request draws below the fail rate
+    server, url = stub(fail_rate=0.5, seed=1)
+    backend = HTTPBackend(url, batch_size=16, retries=10, backoff=0.01)
+    try:
+        results = backend.summarize(TEXTS)
+    finally:
+        backend.close()
+    assert results == summarize_batch(TEXTS)
+    assert backend.retried >= 1
+    assert backend.failed == 0
+    assert _stats(server)['failures'] == backend.retried
+
+def test_unreachable_service_falls_back_to_rules():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    backend = HTTPBackend(f"http://127.0.0.1:{port}/summarize", batch_size=4,
+                          retries=1, backoff=0.01, timeout=2)
+    try:
+        assert backend.summarize(TEXTS[:3]) == [None, None, None]
+        results, fallbacks = summarize_texts(TEXTS, backend)
+    finally:
+        backend.close()
+    assert results == summarize_batch(TEXTS)
+    assert fallbacks == set(range(len(TEXTS)))
+    assert backend.failed == 3 + len(TEXTS)